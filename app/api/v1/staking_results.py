@@ -0,0 +1,115 @@
+"""
+Sentiment staking results API endpoints.
+"""
+
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Annotated, Any, AsyncIterator, Dict, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from ...clients.mongodb import MongoDBClient
+from ...middleware.auth import get_api_key
+from ...models.dividend import ErrorResponse
+from ...models.sentiment_staking_result import SentimentStakingResultsResponse
+from ...services.pagination import InvalidCursor
+from ...services.staking_results import InvalidFields, StakingResults
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["staking_results"])
+mongodb_client = MongoDBClient()
+staking_results = StakingResults(mongodb_client)
+
+
+async def _ndjson_lines(results: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+    """Yield one JSON object per result as it is read from MongoDB, then the next cursor if any."""
+    async for result in results:
+        yield json.dumps(jsonable_encoder(result)) + "\n"
+
+
+@router.get(
+    "/staking_results",
+    response_model=SentimentStakingResultsResponse,
+    responses={
+        status.HTTP_400_BAD_REQUEST: {"model": ErrorResponse},
+        status.HTTP_401_UNAUTHORIZED: {"model": ErrorResponse},
+        status.HTTP_429_TOO_MANY_REQUESTS: {"model": ErrorResponse},
+        status.HTTP_500_INTERNAL_SERVER_ERROR: {"model": ErrorResponse},
+    },
+    description="List sentiment staking results, newest first.",
+)
+async def list_staking_results(
+    request: Request,  # Required by slowapi
+    netuid: Annotated[Optional[int], Query(ge=0)] = None,
+    hotkey: Optional[str] = None,
+    status_: Annotated[
+        Optional[Literal["pending", "queued", "batching", "submitting", "success", "failed"]],
+        Query(alias="status"),
+    ] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    limit: Annotated[Optional[int], Query(ge=1, le=1000)] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    format: Literal["json", "ndjson"] = "json",
+    api_key: str = Depends(get_api_key),
+):
+    """
+    List sentiment staking results, newest first.
+
+    Args:
+        request: FastAPI request object (required by slowapi)
+        netuid: Optional subnet ID
+        hotkey: Optional hotkey
+        status_: Optional task status
+        start: Optional inclusive lower bound of the creation time
+        end: Optional exclusive upper bound of the creation time
+        limit: Page size, defaults to 100 for JSON and to every result for NDJSON
+        cursor: `next_cursor` of the previous page
+        fields: Optional comma-separated result fields to return
+        format: "json" (default) or "ndjson" to stream one result per line, followed by
+            a `{"next_cursor": ...}` line when `limit` leaves more pages
+        api_key: API key for authentication
+
+    Returns:
+        SentimentStakingResultsResponse or a streamed NDJSON response
+
+    Raises:
+        HTTPException: If the range, cursor or fields are invalid
+    """
+    try:
+        # Timestamps without an offset are taken as UTC
+        start = start.replace(tzinfo=start.tzinfo or timezone.utc) if start else None
+        end = end.replace(tzinfo=end.tzinfo or timezone.utc) if end else None
+        if start and end and start >= end:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="start must be before end"
+            )
+        query = staking_results.build_query(netuid, hotkey, status_, start, end)
+        projected = (
+            [field.strip() for field in fields.split(",") if field.strip()] if fields else None
+        )
+        try:
+            if format == "ndjson":
+                return StreamingResponse(
+                    _ndjson_lines(
+                        staking_results.stream(query, limit=limit, cursor=cursor, fields=projected)
+                    ),
+                    media_type="application/x-ndjson",
+                )
+            results, next_cursor = await staking_results.list(
+                query, limit=limit or 100, cursor=cursor, fields=projected
+            )
+        except (InvalidCursor, InvalidFields) as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        return SentimentStakingResultsResponse(results=results, next_cursor=next_cursor)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error in list_staking_results: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Internal server error: {str(e)}",
+        )
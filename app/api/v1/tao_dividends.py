@@ -2,30 +2,70 @@
 Tao dividends API endpoints.
 """
 
-from typing import Annotated
-from fastapi import APIRouter, Depends, HTTPException, Request, status
-from ...models.dividend import DividendResponse, ErrorResponse
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Annotated, AsyncIterator, List, Literal, Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from ...models.dividend import (
+    BatchDividendError,
+    BatchDividendRequest,
+    BatchDividendResponse,
+    DividendHistoryBucket,
+    DividendHistoryPoint,
+    DividendHistoryResponse,
+    DividendResponse,
+    ErrorResponse,
+    HotkeyDividend,
+    SubnetDividendsResponse,
+)
 from ...middleware.auth import get_api_key
 from ...config import settings
 from ...clients.bittensor import BitTensorClient
 from ...clients.cache import CacheClient
+from ...clients.mongodb import MongoDBClient
+from ...services.dividends import BlockMismatch, DividendService, UnknownBlock
+from ...services.history import DividendHistory
+from ...services.pagination import InvalidCursor
+from ...services.triggers import StakingTriggers
 from ...tasks.sentiment_staking_task import sentiment_staking_task
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Lines buffered per chunk of a streamed NDJSON listing
+NDJSON_CHUNK_SIZE = 100
+
 router = APIRouter(tags=["tao_dividends"])
 bittensor_client = BitTensorClient()
 cache_client = CacheClient()
+dividend_service = DividendService(bittensor_client, cache_client)
+mongodb_client = MongoDBClient()
+dividend_history = DividendHistory(mongodb_client, redis=cache_client.redis)
 
 
-def _trigger_sentiment_staking_task(netuid: int, hotkey: str, logger: logging.Logger) -> None:
-    """Helper to trigger the sentiment staking task and log errors."""
-    try:
+def _enqueue_sentiment_staking_task(
+    netuid: int, hotkey: str, countdown: Optional[float] = None
+) -> None:
+    """Enqueue the sentiment staking task, after `countdown` seconds if given."""
+    if countdown:
+        sentiment_staking_task.apply_async((netuid, hotkey), countdown=countdown)
+    else:
         sentiment_staking_task.delay(netuid, hotkey)
-        logger.info(f"Sentiment staking task enqueued for netuid={netuid}, hotkey={hotkey}")
-    except Exception as e:
-        logger.error(f"Failed to enqueue sentiment-staking task: {str(e)}")
+    logger.info(f"Sentiment staking task enqueued for netuid={netuid}, hotkey={hotkey}")
+
+
+staking_triggers = StakingTriggers(cache_client.redis, _enqueue_sentiment_staking_task)
+
+
+async def _trigger_sentiment_staking_task(
+    netuid: int, hotkey: str, logger: logging.Logger
+) -> Optional[str]:
+    """Helper to trigger the sentiment staking task, debounced per (netuid, hotkey)."""
+    outcome = await staking_triggers.trigger(netuid, hotkey)
+    if outcome is not None and outcome != "accepted":
+        logger.info(f"Sentiment staking trigger {outcome} for netuid={netuid}, hotkey={hotkey}")
+    return outcome
 
 
 @router.get(
@@ -33,6 +73,7 @@ def _trigger_sentiment_staking_task(netuid: int, hotkey: str, logger: logging.Lo
     response_model=DividendResponse,
     responses={
         status.HTTP_401_UNAUTHORIZED: {"model": ErrorResponse},
+        status.HTTP_404_NOT_FOUND: {"model": ErrorResponse},
         status.HTTP_429_TOO_MANY_REQUESTS: {"model": ErrorResponse},
         status.HTTP_500_INTERNAL_SERVER_ERROR: {"model": ErrorResponse},
     },
@@ -43,6 +84,8 @@ async def get_tao_dividends(
     netuid: Annotated[int | None, None] = None,
     hotkey: Annotated[str | None, None] = None,
     trade: Annotated[bool | None, None] = False,
+    block: Annotated[int | None, Query(ge=0)] = None,
+    block_hash: Annotated[str | None, None] = None,
     api_key: str = Depends(get_api_key),
 ) -> DividendResponse:
     """
@@ -52,11 +95,15 @@ async def get_tao_dividends(
         request: FastAPI request object (required by slowapi)
         netuid: Optional subnet ID, defaults to settings.DEFAULT_NETUID
         hotkey: Optional hotkey, defaults to settings.DEFAULT_HOTKEY
-        trade: Optional boolean, defaults to False
+        trade: Optional boolean, defaults to False; triggers sentiment staking,
+            debounced per (netuid, hotkey), with the outcome in `stake_tx_status`
+        block: Optional block number to read the dividends at, defaults to the chain head
+        block_hash: Optional block hash to read the dividends at; if block is also given,
+            it must be the number of this block
         api_key: API key for authentication
 
     Returns:
-        DividendResponse: Dividend information including amount and cache status
+        DividendResponse: Dividend information including amount, cache status and age
 
     Raises:
         HTTPException: If there's an error querying the blockchain or cache
@@ -66,46 +113,40 @@ async def get_tao_dividends(
         hotkey = hotkey if hotkey else settings.DEFAULT_HOTKEY
         logger.info(f"Processing dividend request for netuid={netuid}, hotkey={hotkey}")
 
-        dividend = None
-        cached = False
-        # Try cached dividend first
+        # Serve from cache, reading the chain only on a cache miss
         try:
-            cache_key = cache_client.build_cache_key(netuid, hotkey, prefix="api:get_tao_dividends")
-            dividend = await cache_client.get(cache_key)
-        except Exception as cache_error:
-            logger.warning(f"Cache error: {str(cache_error)}")
-            dividend = None
-
-        if dividend is None:
-            # cache miss
-            logger.debug(f"Cache miss for netuid={netuid}, hotkey={hotkey}")
-            try:
-                dividend = await bittensor_client.get_dividend(netuid, hotkey)
-            except Exception as blockchain_error:
-                logger.error(f"Blockchain query error: {str(blockchain_error)}")
-                raise HTTPException(
-                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                    detail=f"Failed to query blockchain: {str(blockchain_error)}",
+            if block is not None or block_hash:
+                snapshot, cached = await dividend_service.get_block_snapshot(
+                    netuid, block=block, block_hash=block_hash
                 )
-        else:
-            cached = True
-
-        # cache the dividend response
-        try:
-            await cache_client.set(cache_key, dividend)
-        except Exception as cache_error:
-            logger.warning(f"Failed to cache result: {str(cache_error)}")
+            else:
+                snapshot, cached = await dividend_service.get_hotkey_snapshot(netuid, hotkey)
+        except UnknownBlock as e:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+        except BlockMismatch as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        except Exception as blockchain_error:
+            logger.error(f"Blockchain query error: {str(blockchain_error)}")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"Failed to query blockchain: {str(blockchain_error)}",
+            )
 
         # trigger sentiment staking task if trade is true
+        stake_tx_status = None
         if trade:
-            _trigger_sentiment_staking_task(netuid, hotkey, logger)
+            stake_tx_status = await _trigger_sentiment_staking_task(netuid, hotkey, logger)
 
         return DividendResponse(
             netuid=netuid,
             hotkey=hotkey,
-            dividend=dividend,
+            dividend=snapshot.dividends.get(hotkey, 0.0),
             cached=cached,
-            stake_tx_triggered=trade,
+            age=snapshot.age,
+            block=snapshot.block,
+            block_hash=snapshot.block_hash,
+            stake_tx_triggered=stake_tx_status in ("accepted", "merged"),
+            stake_tx_status=stake_tx_status,
         )
     except HTTPException:
         raise
@@ -115,3 +156,266 @@ async def get_tao_dividends(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Internal server error: {str(e)}",
         )
+
+
+@router.post(
+    "/tao_dividends/batch",
+    response_model=BatchDividendResponse,
+    responses={
+        status.HTTP_401_UNAUTHORIZED: {"model": ErrorResponse},
+        status.HTTP_429_TOO_MANY_REQUESTS: {"model": ErrorResponse},
+        status.HTTP_500_INTERNAL_SERVER_ERROR: {"model": ErrorResponse},
+        status.HTTP_503_SERVICE_UNAVAILABLE: {"model": ErrorResponse},
+    },
+    description="Get Tao dividends for many (netuid, hotkey) pairs in one call.",
+)
+async def get_tao_dividends_batch(
+    request: Request,  # Required by slowapi
+    batch: BatchDividendRequest,
+    api_key: str = Depends(get_api_key),
+) -> BatchDividendResponse:
+    """
+    Get Tao dividends for many (netuid, hotkey) pairs in one call.
+
+    Pairs are grouped by netuid so every subnet is resolved from one snapshot
+    lookup, and the subnets are looked up concurrently. Subnets that cannot be
+    read are reported in `errors` while the others are still returned.
+
+    Args:
+        request: FastAPI request object (required by slowapi)
+        batch: The (netuid, hotkey) pairs to look up
+        api_key: API key for authentication
+
+    Returns:
+        BatchDividendResponse: One result per resolved pair, in request order
+
+    Raises:
+        HTTPException: If no subnet of the batch could be read
+    """
+    try:
+        netuids = [item.netuid for item in batch.items]
+        logger.info(
+            f"Processing batch dividend request for {len(batch.items)} pair(s) "
+            f"across {len(set(netuids))} subnet(s)"
+        )
+        snapshots = await dividend_service.get_snapshots(netuids)
+
+        results = []
+        errors = []
+        for netuid, snapshot in snapshots.items():
+            if isinstance(snapshot, Exception):
+                logger.error(f"Blockchain query error for netuid={netuid}: {str(snapshot)}")
+                errors.append(
+                    BatchDividendError(
+                        netuid=netuid, detail=f"Failed to query blockchain: {str(snapshot)}"
+                    )
+                )
+        if len(errors) == len(snapshots):
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=errors[0].detail,
+            )
+
+        for item in batch.items:
+            snapshot = snapshots[item.netuid]
+            if isinstance(snapshot, Exception):
+                continue
+            snapshot, cached = snapshot
+            results.append(
+                DividendResponse(
+                    netuid=item.netuid,
+                    hotkey=item.hotkey,
+                    dividend=snapshot.dividends.get(item.hotkey, 0.0),
+                    cached=cached,
+                    age=snapshot.age,
+                    block=snapshot.block,
+                    block_hash=snapshot.block_hash,
+                )
+            )
+        return BatchDividendResponse(results=results, errors=errors)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error in get_tao_dividends_batch: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Internal server error: {str(e)}",
+        )
+
+
+async def _ndjson_lines(
+    netuid: int, dividends: List[Tuple[str, float]], next_cursor: Optional[str]
+) -> AsyncIterator[str]:
+    """Yield one JSON object per hotkey, a chunk of lines at a time."""
+    for start in range(0, len(dividends), NDJSON_CHUNK_SIZE):
+        chunk = dividends[start : start + NDJSON_CHUNK_SIZE]
+        yield "".join(
+            json.dumps({"netuid": netuid, "hotkey": hotkey, "dividend": dividend}) + "\n"
+            for hotkey, dividend in chunk
+        )
+    if next_cursor is not None:
+        yield json.dumps({"next_cursor": next_cursor}) + "\n"
+
+
+@router.get(
+    "/subnets/{netuid}/dividends",
+    response_model=SubnetDividendsResponse,
+    responses={
+        status.HTTP_400_BAD_REQUEST: {"model": ErrorResponse},
+        status.HTTP_401_UNAUTHORIZED: {"model": ErrorResponse},
+        status.HTTP_429_TOO_MANY_REQUESTS: {"model": ErrorResponse},
+        status.HTTP_500_INTERNAL_SERVER_ERROR: {"model": ErrorResponse},
+        status.HTTP_503_SERVICE_UNAVAILABLE: {"model": ErrorResponse},
+    },
+    description="List the Tao dividends of every hotkey of a subnet, sorted by amount.",
+)
+async def list_subnet_dividends(
+    request: Request,  # Required by slowapi
+    netuid: int,
+    order: Literal["desc", "asc"] = "desc",
+    limit: Annotated[Optional[int], Query(ge=1, le=1000)] = None,
+    cursor: Optional[str] = None,
+    format: Literal["json", "ndjson"] = "json",
+    api_key: str = Depends(get_api_key),
+):
+    """
+    List the Tao dividends of every hotkey of a subnet.
+
+    Args:
+        request: FastAPI request object (required by slowapi)
+        netuid: The subnet ID to list
+        order: Sort by dividend, "desc" (default) or "asc"; ties are broken by hotkey
+        limit: Page size, defaults to 100 for JSON and to the whole subnet for NDJSON
+        cursor: `next_cursor` of the previous page
+        format: "json" (default) or "ndjson" to stream one hotkey per line, followed by
+            a `{"next_cursor": ...}` line when more pages remain
+        api_key: API key for authentication
+
+    Returns:
+        SubnetDividendsResponse or a streamed NDJSON response
+
+    Raises:
+        HTTPException: If the cursor is invalid or the blockchain cannot be queried
+    """
+    try:
+        try:
+            snapshot, cached = await dividend_service.get_snapshot(netuid)
+        except Exception as blockchain_error:
+            logger.error(f"Blockchain query error: {str(blockchain_error)}")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"Failed to query blockchain: {str(blockchain_error)}",
+            )
+
+        if limit is None and format == "json":
+            limit = 100
+        try:
+            dividends, next_cursor = dividend_service.list_dividends(
+                snapshot, order=order, limit=limit, cursor=cursor
+            )
+        except InvalidCursor as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+        if format == "ndjson":
+            return StreamingResponse(
+                _ndjson_lines(netuid, dividends, next_cursor),
+                media_type="application/x-ndjson",
+                headers={"X-Cached": str(cached).lower(), "X-Snapshot-Age": f"{snapshot.age:.3f}"},
+            )
+        return SubnetDividendsResponse(
+            netuid=netuid,
+            block=snapshot.block,
+            block_hash=snapshot.block_hash,
+            cached=cached,
+            age=snapshot.age,
+            dividends=[
+                HotkeyDividend(hotkey=hotkey, dividend=dividend) for hotkey, dividend in dividends
+            ],
+            next_cursor=next_cursor,
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error in list_subnet_dividends: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Internal server error: {str(e)}",
+        )
+
+
+@router.get(
+    "/subnets/{netuid}/dividends/history",
+    response_model=DividendHistoryResponse,
+    responses={
+        status.HTTP_400_BAD_REQUEST: {"model": ErrorResponse},
+        status.HTTP_401_UNAUTHORIZED: {"model": ErrorResponse},
+        status.HTTP_429_TOO_MANY_REQUESTS: {"model": ErrorResponse},
+        status.HTTP_500_INTERNAL_SERVER_ERROR: {"model": ErrorResponse},
+    },
+    description="Get the recorded dividend history of a subnet or one of its hotkeys.",
+)
+async def get_dividend_history(
+    request: Request,  # Required by slowapi
+    netuid: int,
+    hotkey: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    bucket: Optional[Literal["minute", "hour", "day", "week", "month"]] = None,
+    bin_size: Annotated[int, Query(ge=1, le=1000)] = 1,
+    limit: Annotated[int, Query(ge=1, le=10000)] = 1000,
+    api_key: str = Depends(get_api_key),
+) -> DividendHistoryResponse:
+    """
+    Get the recorded dividend history of a subnet or one of its hotkeys.
+
+    History is read from MongoDB only and never queries the chain.
+
+    Args:
+        request: FastAPI request object (required by slowapi)
+        netuid: The subnet ID
+        hotkey: Optional hotkey, the whole subnet if omitted
+        start: Inclusive start of the range, defaults to 24 hours before `end`
+        end: Exclusive end of the range, defaults to now
+        bucket: Optional bucket unit; when set, min/max/avg per bucket are returned
+            instead of raw points (subnet buckets aggregate the subnet total)
+        bin_size: Number of units per bucket
+        limit: Maximum number of raw points
+        api_key: API key for authentication
+
+    Returns:
+        DividendHistoryResponse: Raw points or downsampled buckets, oldest first
+
+    Raises:
+        HTTPException: If the range is empty
+    """
+    try:
+        # Timestamps without an offset are taken as UTC
+        end = end.replace(tzinfo=end.tzinfo or timezone.utc) if end else datetime.now(timezone.utc)
+        start = (
+            start.replace(tzinfo=start.tzinfo or timezone.utc) if start else end - timedelta(days=1)
+        )
+        if start >= end:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="start must be before end"
+            )
+
+        response = DividendHistoryResponse(netuid=netuid, hotkey=hotkey, start=start, end=end)
+        if bucket is not None:
+            buckets = await dividend_history.get_downsampled(
+                netuid, start, end, unit=bucket, bin_size=bin_size, hotkey=hotkey
+            )
+            response.buckets = [DividendHistoryBucket(**b) for b in buckets]
+        else:
+            points = await dividend_history.get_range(
+                netuid, start, end, hotkey=hotkey, limit=limit
+            )
+            response.points = [DividendHistoryPoint(**p) for p in points]
+        return response
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error in get_dividend_history: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Internal server error: {str(e)}",
+        )
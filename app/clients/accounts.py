@@ -0,0 +1,140 @@
+"""
+Process-wide cache of SS58 encodings of raw account ids.
+"""
+
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from bittensor.core.settings import SS58_FORMAT
+from prometheus_client import Counter
+from scalecodec.utils.ss58 import ss58_decode, ss58_encode
+from ..config import settings
+
+ACCOUNT_ID_CACHE_REQUESTS = Counter(
+    "account_id_cache_requests_total",
+    "Total count of account id <-> SS58 conversions by result (hit or miss).",
+    ["result"],
+)
+_HITS = ACCOUNT_ID_CACHE_REQUESTS.labels(result="hit")
+_MISSES = ACCOUNT_ID_CACHE_REQUESTS.labels(result="miss")
+
+
+def account_id_bytes(key: Union[bytes, Sequence]) -> bytes:
+    """Normalize an account id decoded by substrate (bytes or nested int tuples) to bytes."""
+    if isinstance(key, tuple) and key and isinstance(key[0], tuple):
+        key = key[0]
+    return bytes(key)
+
+
+class AccountIdCache:
+    """
+    Bounded two-way LRU mapping between raw 32-byte account ids and SS58 addresses.
+
+    Shared across subnets, so a hotkey registered on several subnets is
+    encoded once. The hotkeys of the last scan of each subnet are also kept
+    as a per-subnet index, which LRU churn from other subnets cannot evict,
+    and which encodings of a known subnet's account ids look up first.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._ss58: "OrderedDict[bytes, str]" = OrderedDict()
+        self._account_ids: "OrderedDict[str, bytes]" = OrderedDict()
+        self._subnets: Dict[int, Dict[bytes, str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._ss58)
+
+    def _remember(self, account_id: bytes, ss58: str) -> None:
+        self._ss58[account_id] = ss58
+        self._account_ids[ss58] = account_id
+        while len(self._ss58) > self.max_entries:
+            _, evicted = self._ss58.popitem(last=False)
+            self._account_ids.pop(evicted, None)
+        while len(self._account_ids) > self.max_entries:
+            self._account_ids.popitem(last=False)
+
+    def _encode(self, account_id: bytes) -> Tuple[str, bool]:
+        ss58 = self._ss58.get(account_id)
+        if ss58 is not None:
+            self._ss58.move_to_end(account_id)
+            return ss58, True
+        ss58 = ss58_encode(account_id, SS58_FORMAT)
+        self._remember(account_id, ss58)
+        return ss58, False
+
+    def _decode(self, ss58: str) -> Tuple[bytes, bool]:
+        account_id = self._account_ids.get(ss58)
+        if account_id is not None:
+            self._account_ids.move_to_end(ss58)
+            return account_id, True
+        account_id = bytes.fromhex(ss58_decode(ss58, SS58_FORMAT))
+        self._remember(account_id, ss58)
+        return account_id, False
+
+    @staticmethod
+    def _count(total: int, hits: int) -> None:
+        # Counted once per batch, the increment costs as much as a cache hit
+        if hits:
+            _HITS.inc(hits)
+        if total > hits:
+            _MISSES.inc(total - hits)
+
+    def to_ss58(self, account_id: bytes) -> str:
+        """Encode a raw account id as an SS58 address."""
+        return self.to_ss58_many([account_id])[0]
+
+    def to_ss58_many(self, account_ids: Iterable[bytes], netuid: Optional[int] = None) -> List[str]:
+        """
+        Encode raw account ids as SS58 addresses, in order.
+
+        Args:
+            netuid: Subnet the account ids are hotkeys of, whose index is looked up first
+        """
+        index = self._subnets.get(netuid, {}) if netuid is not None else {}
+        encoded = []
+        for account_id in account_ids:
+            ss58 = index.get(account_id)
+            encoded.append((ss58, True) if ss58 is not None else self._encode(account_id))
+        self._count(len(encoded), sum(hit for _, hit in encoded))
+        return [ss58 for ss58, _ in encoded]
+
+    def to_account_ids(self, addresses: Iterable[str]) -> List[bytes]:
+        """
+        Decode SS58 addresses to raw account ids, in order.
+
+        Raises:
+            ValueError: If an address is not valid SS58
+        """
+        decoded = [self._decode(ss58) for ss58 in addresses]
+        self._count(len(decoded), sum(hit for _, hit in decoded))
+        return [account_id for account_id, _ in decoded]
+
+    def index_subnet(self, netuid: int, account_ids: Iterable[bytes]) -> Dict[bytes, str]:
+        """
+        Encode the hotkeys of a subnet scan and keep them as the subnet's index.
+
+        Returns:
+            Dict[bytes, str]: SS58 address by raw account id
+        """
+        previous = self._subnets.get(netuid, {})
+        index = {}
+        hits = 0
+        for account_id in account_ids:
+            ss58 = previous.get(account_id)
+            if ss58 is None:
+                ss58, hit = self._encode(account_id)
+                hits += hit
+            else:
+                hits += 1
+            index[account_id] = ss58
+        self._count(len(index), hits)
+        self._subnets[netuid] = index
+        return index
+
+    def clear(self) -> None:
+        self._ss58.clear()
+        self._account_ids.clear()
+        self._subnets.clear()
+
+
+account_ids = AccountIdCache(settings.ACCOUNT_ID_CACHE_SIZE)
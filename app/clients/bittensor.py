@@ -1,46 +1,384 @@
+from async_substrate_interface.errors import BlockNotFound, SubstrateRequestException
 from bittensor import AsyncSubtensor
-from bittensor.core.chain_data import decode_account_id
 from ..config import settings
-from typing import Optional
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
 from bittensor import Wallet
+import asyncio
 import logging
+from bittensor.utils import unlock_key
 from bittensor.utils.balance import tao
+from prometheus_client import Gauge
+from websockets.exceptions import ConnectionClosed
+from .accounts import account_id_bytes, account_ids
+from .nonce import NonceManager
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Errors after which a pooled connection is considered broken
+CONNECTION_ERRORS = (OSError, ConnectionClosed)
+# Rejections of an extrinsic whose nonce was already taken, by another process or wallet user
+NONCE_COLLISION_ERRORS = ("priority is too low", "transaction is outdated", "stale")
+
+# Left in a closed pool, so callers waiting for a connection fail instead of hanging
+_CLOSED = object()
+
+BITTENSOR_POOL_CONNECTIONS = Gauge(
+    "bittensor_pool_connections",
+    "Gauge of pooled AsyncSubtensor connections by state (idle or in_use).",
+    ["state"],
+)
+
 
 class BitTensorClient:
-    def __init__(self):
+    def __init__(self, pool_size: Optional[int] = None):
         """Initialize the BitTensor service with network configuration."""
         try:
             self.network = settings.BITTENSOR_NETWORK
+            self.pool_size = pool_size or settings.BITTENSOR_POOL_SIZE
             self.subtensor = AsyncSubtensor(network=self.network)
+            self._pool: asyncio.Queue = asyncio.Queue()
+            self._connections: List[AsyncSubtensor] = []
+            # Pool slots, including the empty ones of connections that could not be reopened
+            self._size = 0
+            # Bumped by close(), so connections taken before it are not put back
+            self._generation = 0
+            self._connect_lock = asyncio.Lock()
+            self._health_task: Optional[asyncio.Task] = None
+            # Shared by all pooled connections, which would otherwise count nonces separately
+            self.nonces = NonceManager()
             logger.info(f"Initialized BitTensorService with network: {self.network}")
         except Exception as e:
             logger.error(f"Failed to initialize BitTensorService: {str(e)}")
             raise
 
-    async def get_dividends_for_subnet(self, netuid: int) -> dict:
-        async with self.subtensor as async_subtensor:
-            result = await async_subtensor.substrate.query_map(
-                module="SubtensorModule", storage_function="TaoDividendsPerSubnet", params=[netuid]
+    @property
+    def connected(self) -> bool:
+        return self._size > 0
+
+    def _update_pool_metrics(self) -> None:
+        # Empty slots and a closed pool's marker wait in the pool too but are not connections
+        idle = min(
+            max(self._pool.qsize() - (self._size - len(self._connections)), 0),
+            len(self._connections),
+        )
+        BITTENSOR_POOL_CONNECTIONS.labels(state="idle").set(idle)
+        BITTENSOR_POOL_CONNECTIONS.labels(state="in_use").set(len(self._connections) - idle)
+
+    async def _open_connection(self, subtensor: Optional[AsyncSubtensor] = None) -> AsyncSubtensor:
+        subtensor = subtensor or AsyncSubtensor(network=self.network)
+        await subtensor.initialize()
+        return subtensor
+
+    async def connect(self) -> None:
+        """
+        Open the pool of long-lived AsyncSubtensor connections.
+
+        Safe to call repeatedly; the pool is only opened once. It is opened
+        lazily on first use if this is never called.
+        """
+        async with self._connect_lock:
+            if self.connected:
+                return
+            connections = [await self._open_connection(self.subtensor)]
+            for _ in range(self.pool_size - 1):
+                connections.append(await self._open_connection())
+            # Drop the marker of an earlier close()
+            while not self._pool.empty():
+                self._pool.get_nowait()
+            for subtensor in connections:
+                self._pool.put_nowait(subtensor)
+            self._connections = connections
+            self._size = len(connections)
+            self._update_pool_metrics()
+            logger.info(f"Opened {len(connections)} subtensor connection(s) to {self.network}")
+
+    async def close(self) -> None:
+        """
+        Stop health checks and close all pooled connections.
+
+        Calls waiting for a connection fail with a ConnectionError, and the
+        connections of calls in progress are not put back into the pool.
+        """
+        if self._health_task is not None:
+            self._health_task.cancel()
+            self._health_task = None
+        connections, self._connections = self._connections, []
+        self._size = 0
+        self._generation += 1
+        while not self._pool.empty():
+            self._pool.get_nowait()
+        self._pool.put_nowait(_CLOSED)
+        for subtensor in connections:
+            try:
+                await subtensor.close()
+            except Exception as e:
+                logger.warning(f"Failed to close subtensor connection: {str(e)}")
+        self._update_pool_metrics()
+
+    async def _reconnect(self, subtensor: AsyncSubtensor) -> Optional[AsyncSubtensor]:
+        """
+        Replace a broken pooled connection with a freshly opened one.
+
+        Returns None if it cannot be reopened. The caller then puts None back
+        into the pool as an empty slot, reopened by the next call taking it.
+        """
+        try:
+            await subtensor.close()
+        except Exception:
+            pass
+        self._connections = [s for s in self._connections if s is not subtensor]
+        try:
+            fresh = await self._open_connection()
+        except Exception as e:
+            logger.error(f"Failed to reconnect subtensor: {str(e)}")
+            return None
+        self._connections.append(fresh)
+        return fresh
+
+    async def _take(self) -> Tuple[AsyncSubtensor, int]:
+        """
+        Take a connection from the pool, opening one in an empty slot.
+
+        Returns:
+            Tuple[AsyncSubtensor, int]: The connection, and the pool generation to
+            give it back to
+
+        Raises:
+            ConnectionError: If the pool was closed
+        """
+        subtensor = await self._pool.get()
+        generation = self._generation
+        if subtensor is _CLOSED:
+            # Left for the next waiter
+            self._pool.put_nowait(_CLOSED)
+            raise ConnectionError("Subtensor connection pool closed")
+        if subtensor is None:
+            try:
+                subtensor = await self._open_connection()
+            except Exception:
+                await self._give_back(None, generation)
+                raise
+            if generation != self._generation:
+                await subtensor.close()
+                raise ConnectionError("Subtensor connection pool closed")
+            self._connections.append(subtensor)
+        self._update_pool_metrics()
+        return subtensor, generation
+
+    async def _give_back(self, subtensor: Optional[AsyncSubtensor], generation: int) -> None:
+        """Put a connection, or an empty slot, back into the pool it was taken from."""
+        if generation == self._generation:
+            self._pool.put_nowait(subtensor)
+        elif subtensor is not None and subtensor in self._connections:
+            # Taken before close() and reopened since, the pool no longer has its slot
+            self._connections.remove(subtensor)
+            try:
+                await subtensor.close()
+            except Exception as e:
+                logger.warning(f"Failed to close subtensor connection: {str(e)}")
+        self._update_pool_metrics()
+
+    async def _call(self, fn: Callable[[AsyncSubtensor], Awaitable[T]], retry: bool = True) -> T:
+        """
+        Run `fn` on a pooled connection.
+
+        A connection failing with a connection error is reopened before it goes
+        back to the pool, or leaves an empty slot if it cannot be. Only
+        idempotent calls (`retry=True`) are re-run on the new connection;
+        extrinsic submissions are not.
+        """
+        if not self.connected:
+            await self.connect()
+        subtensor, generation = await self._take()
+        try:
+            try:
+                return await fn(subtensor)
+            except CONNECTION_ERRORS as e:
+                logger.warning(f"Subtensor connection failed, reconnecting: {str(e)}")
+                subtensor = await self._reconnect(subtensor)
+                if not retry or subtensor is None:
+                    raise
+                return await fn(subtensor)
+        finally:
+            await self._give_back(subtensor, generation)
+
+    async def health_check(self, timeout: float = 10) -> int:
+        """
+        Ping every pooled connection, reopening empty slots and connections that do not answer.
+
+        Returns:
+            int: Number of connections that answered
+        """
+        healthy = 0
+        for _ in range(self._size):
+            try:
+                subtensor, generation = await self._take()
+            except Exception as e:
+                logger.warning(f"Failed to reopen subtensor connection: {str(e)}")
+                continue
+            try:
+                await asyncio.wait_for(subtensor.substrate.get_chain_head(), timeout)
+                healthy += 1
+            except Exception as e:
+                logger.warning(f"Subtensor health check failed, reconnecting: {str(e)}")
+                subtensor = await self._reconnect(subtensor)
+            finally:
+                await self._give_back(subtensor, generation)
+        return healthy
+
+    async def _health_check_loop(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            await self.health_check()
+
+    def start_health_checks(self, interval: float) -> None:
+        """Periodically health-check the pool in the background."""
+        if self._health_task is None:
+            self._health_task = asyncio.create_task(self._health_check_loop(interval))
+
+    async def get_current_block(self) -> int:
+        """Get the current chain head block number."""
+        return await self._call(lambda async_subtensor: async_subtensor.get_current_block())
+
+    async def get_block_hash(self, block: Optional[int] = None) -> str:
+        """Get the hash of a block, or of the chain head if no block is given."""
+        if block is None:
+            return await self._call(
+                lambda async_subtensor: async_subtensor.substrate.get_chain_head()
             )
-            result_dict = {}
-            async for k, v in result:
-                decoded_key = decode_account_id(k)
-                result_dict[decoded_key] = v.value
-            return result_dict
+        return await self._call(
+            lambda async_subtensor: async_subtensor.substrate.get_block_hash(block)
+        )
 
-    async def get_dividend(self, netuid: int, hotkey: str) -> float:
+    async def get_block_number(self, block_hash: str) -> Optional[int]:
+        """Get the number of the block with the given hash, None if there is no such block."""
+        try:
+            return await self._call(
+                lambda async_subtensor: async_subtensor.substrate.get_block_number(block_hash)
+            )
+        except (BlockNotFound, SubstrateRequestException) as e:
+            # The node rejects hashes it cannot decode as a request error
+            logger.warning(f"Block hash {block_hash} not found: {str(e)}")
+            return None
+
+    @staticmethod
+    async def _query_dividends(
+        async_subtensor: AsyncSubtensor, netuid: int, block_hash: Optional[str] = None
+    ) -> dict:
+        result = await async_subtensor.substrate.query_map(
+            module="SubtensorModule",
+            storage_function="TaoDividendsPerSubnet",
+            params=[netuid],
+            block_hash=block_hash,
+        )
+        values = {}
+        async for k, v in result:
+            values[account_id_bytes(k)] = v.value
+        # Hotkeys seen in earlier scans skip SS58 encoding
+        index = account_ids.index_subnet(netuid, values)
+        return {index[account_id]: value for account_id, value in values.items()}
+
+    async def get_dividends_for_subnet(self, netuid: int, block_hash: Optional[str] = None) -> dict:
+        """Get the dividends of every hotkey of a subnet, at the chain head or a given block."""
+        return await self._call(
+            lambda async_subtensor: self._query_dividends(async_subtensor, netuid, block_hash)
+        )
+
+    async def get_dividends_for_subnets(
+        self,
+        netuids: Iterable[int],
+        concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        block_hash: Optional[str] = None,
+    ) -> Tuple[Dict[int, dict], Dict[int, Exception]]:
+        """
+        Query the Tao dividends of several subnets concurrently.
+
+        All queries share one pooled connection, whose websocket multiplexes
+        them, with at most `concurrency` in flight. A subnet whose query fails
+        or exceeds `timeout` is reported in the errors without failing the
+        others. On a connection error the connection is reopened once and only
+        the subnets still missing are queried again.
+
+        Args:
+            netuids: The subnet IDs to query
+            concurrency: Maximum concurrent queries, defaults to settings.BITTENSOR_FANOUT_CONCURRENCY
+            timeout: Timeout in seconds of each query, defaults to settings.BITTENSOR_QUERY_TIMEOUT
+            block_hash: Optional block to read every subnet at, the chain head if None
+
+        Returns:
+            Tuple[Dict[int, dict], Dict[int, Exception]]: Dividends by netuid of the
+            subnets that were read, and the error of each subnet that was not
+        """
+        netuids = list(dict.fromkeys(netuids))
+        semaphore = asyncio.Semaphore(concurrency or settings.BITTENSOR_FANOUT_CONCURRENCY)
+        timeout = timeout or settings.BITTENSOR_QUERY_TIMEOUT
+        results: Dict[int, dict] = {}
+        errors: Dict[int, Exception] = {}
+
+        async def query(async_subtensor: AsyncSubtensor, netuid: int) -> dict:
+            async with semaphore:
+                return await asyncio.wait_for(
+                    self._query_dividends(async_subtensor, netuid, block_hash), timeout
+                )
+
+        async def fan_out(async_subtensor: AsyncSubtensor) -> None:
+            pending = [netuid for netuid in netuids if netuid not in results]
+            outcomes = await asyncio.gather(
+                *(query(async_subtensor, netuid) for netuid in pending), return_exceptions=True
+            )
+            connection_error = None
+            for netuid, outcome in zip(pending, outcomes):
+                if not isinstance(outcome, BaseException):
+                    results[netuid] = outcome
+                    errors.pop(netuid, None)
+                    continue
+                errors[netuid] = outcome
+                # A slow subnet is not a broken connection
+                if isinstance(outcome, CONNECTION_ERRORS) and not isinstance(outcome, TimeoutError):
+                    connection_error = connection_error or outcome
+            if connection_error is not None:
+                raise connection_error
+
+        try:
+            await self._call(fan_out)
+        except Exception as e:
+            logger.error(f"Subnet dividend fan-out failed: {str(e)}")
+            for netuid in netuids:
+                if netuid not in results:
+                    errors.setdefault(netuid, e)
+        return results, errors
+
+    @staticmethod
+    async def _query_dividend(
+        async_subtensor: AsyncSubtensor, netuid: int, hotkey: str, block_hash: Optional[str] = None
+    ) -> float:
+        result = await async_subtensor.substrate.query(
+            module="SubtensorModule",
+            storage_function="TaoDividendsPerSubnet",
+            params=[netuid, hotkey],
+            block_hash=block_hash,
+        )
+        return result.value if result is not None else 0
+
+    async def get_dividend(
+        self, netuid: int, hotkey: str, block_hash: Optional[str] = None
+    ) -> float:
         """
         Query the Tao dividends for a given subnet and hotkey.
 
+        Reads the single (netuid, hotkey) storage entry instead of scanning
+        the whole subnet map.
+
         Args:
             netuid: The subnet ID to query
             hotkey: The hotkey address to query
+            block_hash: Optional block to read at, the chain head if None
 
         Returns:
-            float: The dividend amount
+            float: The dividend amount, 0 if the hotkey has none
 
         Raises:
             Exception: If the query fails
@@ -48,10 +386,70 @@ class BitTensorClient:
         print(f"Querying dividends for netuid={netuid}, hotkey={hotkey}")
         logger.info(f"Querying dividends for netuid={netuid}, hotkey={hotkey}")
 
-        dividends_for_subnet = await self.get_dividends_for_subnet(netuid)
-        # filter for hotkey
-        hotkey_dividends = dividends_for_subnet.get(hotkey, 0.0)
-        return hotkey_dividends
+        return await self._call(
+            lambda async_subtensor: self._query_dividend(
+                async_subtensor, netuid, hotkey, block_hash
+            )
+        )
+
+    async def _sign_and_submit(self, async_subtensor: AsyncSubtensor, wallet: Wallet, call) -> bool:
+        """
+        Sign a call with the wallet coldkey and submit it, waiting for inclusion.
+
+        The nonce comes from the client's NonceManager, so extrinsics of
+        concurrent tasks can be in flight at once without colliding. Other
+        worker processes allocate nonces of their own: an extrinsic rejected
+        because its nonce was taken is resubmitted once, with the nonce re-read
+        from chain, which counts extrinsics still in the transaction pool.
+        """
+        if not unlock_key(wallet).success:
+            raise Exception("Failed to unlock wallet coldkey")
+        keypair = wallet.coldkey
+        address = keypair.ss58_address
+
+        async def fetch_nonce() -> int:
+            # Read from chain, the substrate interface caches nonces per connection
+            response = await async_subtensor.substrate.rpc_request("account_nextIndex", [address])
+            return response["result"]
+
+        try:
+            return await self._submit_with_nonce(async_subtensor, keypair, call, fetch_nonce)
+        except Exception as e:
+            if not self._is_nonce_collision(e):
+                raise
+            logger.warning(f"Nonce of {address} was taken, resubmitting: {str(e)}")
+        return await self._submit_with_nonce(async_subtensor, keypair, call, fetch_nonce)
+
+    async def _submit_with_nonce(
+        self,
+        async_subtensor: AsyncSubtensor,
+        keypair,
+        call,
+        fetch_nonce: Callable[[], Awaitable[int]],
+    ) -> bool:
+        address = keypair.ss58_address
+        nonce = await self.nonces.acquire(address, fetch_nonce)
+        included = False
+        try:
+            extrinsic = await async_subtensor.substrate.create_signed_extrinsic(
+                call=call, keypair=keypair, nonce=nonce
+            )
+            response = await async_subtensor.substrate.submit_extrinsic(
+                extrinsic, wait_for_inclusion=True
+            )
+            included = True
+            # An included extrinsic uses its nonce even if its dispatch failed
+            if not await response.is_success:
+                logger.error(f"Extrinsic failed: {await response.error_message}")
+                return False
+            return True
+        finally:
+            self.nonces.release(address, nonce, resync=not included)
+
+    @staticmethod
+    def _is_nonce_collision(error: Exception) -> bool:
+        message = str(error).lower()
+        return any(reason in message for reason in NONCE_COLLISION_ERRORS)
 
     async def stake(self, wallet: Wallet, netuid: int, hotkey: str, amount: float) -> bool:
         """
@@ -61,10 +459,12 @@ class BitTensorClient:
         print(f"Staking {amount} TAO for netuid={netuid}, hotkey={hotkey}")
         try:
             # Submit stake transaction
-            async with self.subtensor as async_subtensor:
-                stake_success = await async_subtensor.add_stake(
-                    netuid=netuid, hotkey_ss58=hotkey, amount=tao(amount, netuid), wallet=wallet
-                )
+            stake_success = await self._call(
+                lambda async_subtensor: self._submit_stake_move(
+                    async_subtensor, wallet, netuid, hotkey, tao(amount, netuid).rao
+                ),
+                retry=False,
+            )
             return stake_success
         except Exception as e:
             raise Exception(f"Failed to add stake: {str(e)}")
@@ -77,10 +477,82 @@ class BitTensorClient:
         print(f"Unstaking {amount} TAO for netuid={netuid}, hotkey={hotkey}")
         try:
             # Submit unstake transaction
-            async with self.subtensor as async_subtensor:
-                unstake_success = await async_subtensor.unstake(
-                    netuid=netuid, hotkey_ss58=hotkey, amount=tao(amount, netuid), wallet=wallet
-                )
+            unstake_success = await self._call(
+                lambda async_subtensor: self._submit_stake_move(
+                    async_subtensor, wallet, netuid, hotkey, -tao(amount, netuid).rao
+                ),
+                retry=False,
+            )
             return unstake_success
         except Exception as e:
             raise Exception(f"Failed to unstake: {str(e)}")
+
+    async def _submit_stake_move(
+        self,
+        async_subtensor: AsyncSubtensor,
+        wallet: Wallet,
+        netuid: int,
+        hotkey: str,
+        amount: int,
+    ) -> bool:
+        call = await self._compose_stake_call(async_subtensor, netuid, hotkey, amount)
+        return await self._sign_and_submit(async_subtensor, wallet, call)
+
+    @staticmethod
+    async def _compose_stake_call(
+        async_subtensor: AsyncSubtensor, netuid: int, hotkey: str, amount: int
+    ):
+        """Compose an add_stake call for a positive amount of rao, a remove_stake call otherwise."""
+        if amount > 0:
+            call_function = "add_stake"
+            call_params = {"hotkey": hotkey, "netuid": netuid, "amount_staked": amount}
+        else:
+            call_function = "remove_stake"
+            call_params = {"hotkey": hotkey, "netuid": netuid, "amount_unstaked": -amount}
+        return await async_subtensor.substrate.compose_call(
+            call_module="SubtensorModule", call_function=call_function, call_params=call_params
+        )
+
+    async def _submit_stake_batch(
+        self, async_subtensor: AsyncSubtensor, wallet: Wallet, moves: List[Tuple[int, str, int]]
+    ) -> bool:
+        calls = [
+            await self._compose_stake_call(async_subtensor, netuid, hotkey, amount)
+            for netuid, hotkey, amount in moves
+        ]
+        if len(calls) == 1:
+            return await self._sign_and_submit(async_subtensor, wallet, calls[0])
+        batch = await async_subtensor.substrate.compose_call(
+            call_module="Utility", call_function="batch_all", call_params={"calls": calls}
+        )
+        return await self._sign_and_submit(async_subtensor, wallet, batch)
+
+    async def submit_stake_batch(
+        self, wallet: Wallet, moves: Iterable[Tuple[int, str, int]]
+    ) -> bool:
+        """
+        Stake or unstake for several (netuid, hotkey) pairs in one extrinsic.
+
+        Moves are submitted as a single `Utility.batch_all` call, so they are
+        applied all together or not at all. A lone move is submitted as a
+        plain stake or unstake.
+
+        Args:
+            wallet: The wallet whose coldkey signs the extrinsic
+            moves: (netuid, hotkey, amount) moves in rao, staking positive amounts
+                and unstaking negative ones; zero amounts are skipped
+
+        Returns:
+            bool: True if every move was applied
+        """
+        moves = [(netuid, hotkey, amount) for netuid, hotkey, amount in moves if amount != 0]
+        if not moves:
+            return True
+        logger.info(f"Submitting a batch of {len(moves)} stake move(s)")
+        try:
+            return await self._call(
+                lambda async_subtensor: self._submit_stake_batch(async_subtensor, wallet, moves),
+                retry=False,
+            )
+        except Exception as e:
+            raise Exception(f"Failed to submit stake batch: {str(e)}")
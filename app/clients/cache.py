@@ -1,16 +1,98 @@
 import redis.asyncio as redis
 from ..config import settings
-import json
-from typing import Optional, Any
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from typing import Optional, Any, Callable, Dict, List, Tuple
 import logging
+from prometheus_client import Counter
+from .serializers import Serializer, get_serializer
 
 logger = logging.getLogger(__name__)
 
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Total count of cache lookups by tier (local or redis) and result (hit or miss).",
+    ["tier", "result"],
+)
+CACHE_EVICTIONS = Counter(
+    "cache_evictions_total",
+    "Total count of in-process cache evictions by tier and reason.",
+    ["tier", "reason"],
+)
+
+
+class LocalCache:
+    """
+    Bounded in-process LRU cache with per-entry expiry.
+
+    Capped both by entry count and by the total size of the cached payloads.
+    Cached values are shared between callers and must not be mutated.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: "OrderedDict[str, Tuple[Any, float, int]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: str, reason: str) -> None:
+        _, _, size = self._entries.pop(key)
+        self.size -= size
+        CACHE_EVICTIONS.labels(tier="local", reason=reason).inc()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Return whether the key was found and its value."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        value, expires_at, _ = entry
+        if expires_at <= time.monotonic():
+            self._remove(key, "expired")
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def set(self, key: str, value: Any, ttl: float, size: int) -> None:
+        if key in self._entries:
+            _, _, old_size = self._entries.pop(key)
+            self.size -= old_size
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (value, time.monotonic() + ttl, size)
+        self.size += size
+        while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+            self._remove(next(iter(self._entries)), "capacity")
+
+    def delete(self, key: str) -> None:
+        if key in self._entries:
+            self._remove(key, "invalidated")
+
+    def clear(self) -> None:
+        for key in list(self._entries):
+            self._remove(key, "invalidated")
+
 
 class CacheClient:
-    def __init__(self):
+    def __init__(self, serializer: Optional[Serializer] = None):
         self.redis = redis.from_url(settings.REDIS_URL)
         self.default_ttl = settings.REDIS_CACHE_TTL
+        self.serializer = serializer or get_serializer(settings.CACHE_SERIALIZER)
+        # Optional in-process tier in front of Redis
+        self.local: Optional[LocalCache] = None
+        if settings.CACHE_LOCAL_ENABLED:
+            self.local = LocalCache(
+                settings.CACHE_LOCAL_MAX_ENTRIES, settings.CACHE_LOCAL_MAX_BYTES
+            )
+        self.local_ttl = settings.CACHE_LOCAL_TTL
+        self.invalidation_channel = settings.CACHE_INVALIDATION_CHANNEL
+        self.instance_id = uuid.uuid4().hex
+        self._invalidation_listeners: List[Callable[[str], None]] = []
+        self._invalidation_task: Optional[asyncio.Task] = None
 
     def build_cache_key(self, *args, prefix: Optional[str] = None) -> str:
         """Build a cache key from prefix and args."""
@@ -18,11 +100,50 @@ class CacheClient:
         key_parts += [str(arg) for arg in args]
         return ":".join(key_parts)
 
+    def _get_local(self, key: str) -> Tuple[bool, Any]:
+        if self.local is None:
+            return False, None
+        found, value = self.local.get(key)
+        CACHE_REQUESTS.labels(tier="local", result="hit" if found else "miss").inc()
+        return found, value
+
+    async def _read(self, key: str, command: Callable[[Any], Any]) -> Tuple[Any, float]:
+        """
+        Run a read `command` of a key, and tell how long a local copy may be kept.
+
+        With a local tier the key's remaining TTL is read in the same round-trip,
+        so the local copy never outlives the Redis key.
+        """
+        if self.local is None:
+            return await command(self.redis), self.local_ttl
+        async with self.redis.pipeline(transaction=False) as pipe:
+            command(pipe)
+            pipe.pttl(key)
+            data, remaining = await pipe.execute()
+        # A key without expiry has a PTTL of -1
+        return data, min(self.local_ttl, remaining / 1000) if remaining >= 0 else self.local_ttl
+
+    async def _publish_invalidation(self, key: str) -> None:
+        """Tell other workers to drop their in-process copy of a key."""
+        if self.local is None:
+            return
+        try:
+            await self.redis.publish(self.invalidation_channel, f"{self.instance_id}:{key}")
+        except Exception as e:
+            logger.error(f"Cache invalidation publish error: {str(e)}")
+
     async def get(self, key: str) -> Optional[Any]:
         """Get cached data by key."""
+        found, value = self._get_local(key)
+        if found:
+            return value
         try:
-            data = await self.redis.get(key)
-            return json.loads(data) if data else None
+            data, local_ttl = await self._read(key, lambda client: client.get(key))
+            CACHE_REQUESTS.labels(tier="redis", result="hit" if data else "miss").inc()
+            value = self.serializer.loads(data) if data else None
+            if value is not None and self.local is not None:
+                self.local.set(key, value, local_ttl, len(data))
+            return value
         except Exception as e:
             logger.error(f"Cache get error: {str(e)}")
             return None
@@ -30,7 +151,144 @@ class CacheClient:
     async def set(self, key: str, data: Any, ttl: Optional[int] = None) -> None:
         """Set cached data by key with TTL."""
         try:
-            await self.redis.setex(key, ttl or self.default_ttl, json.dumps(data))
+            payload = self.serializer.dumps(data)
+            await self.redis.setex(key, ttl or self.default_ttl, payload)
+            if self.local is not None:
+                self.local.set(
+                    key, data, min(self.local_ttl, ttl or self.default_ttl), len(payload)
+                )
+            await self._publish_invalidation(key)
         except Exception as e:
             logger.error(f"Cache set error: {str(e)}")
             pass
+
+    async def get_bytes(self, key: str) -> Optional[bytes]:
+        """Get cached raw bytes by key, for values with their own encoding."""
+        found, value = self._get_local(key)
+        if found:
+            return value
+        try:
+            data, local_ttl = await self._read(key, lambda client: client.get(key))
+            CACHE_REQUESTS.labels(tier="redis", result="hit" if data else "miss").inc()
+            if data and self.local is not None:
+                self.local.set(key, data, local_ttl, len(data))
+            return data
+        except Exception as e:
+            logger.error(f"Cache get_bytes error: {str(e)}")
+            return None
+
+    async def set_bytes(self, key: str, data: bytes, ttl: Optional[int] = None) -> None:
+        """Set cached raw bytes by key with TTL."""
+        try:
+            await self.redis.setex(key, ttl or self.default_ttl, data)
+            if self.local is not None:
+                self.local.set(key, data, min(self.local_ttl, ttl or self.default_ttl), len(data))
+            await self._publish_invalidation(key)
+        except Exception as e:
+            logger.error(f"Cache set_bytes error: {str(e)}")
+
+    async def delete(self, key: str) -> None:
+        """Delete cached data by key from every tier."""
+        try:
+            if self.local is not None:
+                self.local.delete(key)
+            await self.redis.delete(key)
+            await self._publish_invalidation(key)
+        except Exception as e:
+            logger.error(f"Cache delete error: {str(e)}")
+
+    async def touch(self, key: str, ttl: Optional[int] = None) -> None:
+        """Reset the TTL of a cached key without rewriting its data."""
+        try:
+            await self.redis.expire(key, ttl or self.default_ttl)
+        except Exception as e:
+            logger.error(f"Cache touch error: {str(e)}")
+
+    async def get_hash(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get all fields of a cached hash by key."""
+        found, value = self._get_local(key)
+        if found:
+            return value
+        try:
+            data, local_ttl = await self._read(key, lambda client: client.hgetall(key))
+            CACHE_REQUESTS.labels(tier="redis", result="hit" if data else "miss").inc()
+            value = {
+                field.decode(): self.serializer.loads(raw) for field, raw in data.items()
+            } or None
+            if value is not None and self.local is not None:
+                size = sum(len(field) + len(raw) for field, raw in data.items())
+                self.local.set(key, value, local_ttl, size)
+            return value
+        except Exception as e:
+            logger.error(f"Cache get_hash error: {str(e)}")
+            return None
+
+    async def set_hash(self, key: str, mapping: Dict[str, Any], ttl: Optional[int] = None) -> None:
+        """Atomically replace a cached hash by key with TTL."""
+        try:
+            encoded = {field: self.serializer.dumps(value) for field, value in mapping.items()}
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.delete(key)
+                if mapping:
+                    pipe.hset(key, mapping=encoded)
+                pipe.expire(key, ttl or self.default_ttl)
+                await pipe.execute()
+            if self.local is not None:
+                size = sum(len(field) + len(raw) for field, raw in encoded.items())
+                self.local.set(
+                    key, dict(mapping), min(self.local_ttl, ttl or self.default_ttl), size
+                )
+            await self._publish_invalidation(key)
+        except Exception as e:
+            logger.error(f"Cache set_hash error: {str(e)}")
+
+    def add_invalidation_listener(self, listener: Callable[[str], None]) -> None:
+        """Register a callback run with the key whenever another worker invalidates it."""
+        self._invalidation_listeners.append(listener)
+
+    def _handle_invalidation(self, message: bytes) -> None:
+        origin, _, key = message.decode().partition(":")
+        if origin == self.instance_id:
+            return
+        if self.local is not None:
+            self.local.delete(key)
+        for listener in self._invalidation_listeners:
+            listener(key)
+
+    async def _listen_for_invalidations(self) -> None:
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.subscribe(self.invalidation_channel)
+                # Invalidations may have been missed while unsubscribed
+                if self.local is not None:
+                    self.local.clear()
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self._handle_invalidation(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Cache invalidation listener error: {str(e)}")
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
+    def start_invalidation_listener(self) -> None:
+        """Drop in-process entries invalidated by other workers, in the background."""
+        if self.local is not None and self._invalidation_task is None:
+            self._invalidation_task = asyncio.create_task(self._listen_for_invalidations())
+
+    async def stop_invalidation_listener(self) -> None:
+        if self._invalidation_task is not None:
+            self._invalidation_task.cancel()
+            try:
+                await self._invalidation_task
+            except asyncio.CancelledError:
+                pass
+            self._invalidation_task = None
+
+    async def close(self) -> None:
+        """Stop the invalidation listener and close the Redis connection pool."""
+        await self.stop_invalidation_listener()
+        await self.redis.aclose()
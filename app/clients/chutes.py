@@ -1,10 +1,37 @@
 from typing import List, Optional
 import httpx
 from app.config import settings
+from .http import build_async_client, request_with_retries
 
 CHUTES_API_URL = "https://llm.chutes.ai/v1/chat/completions"
 
 
+def build_sentiment_prompt(tweets: List[str]) -> str:
+    """Build the LLM prompt scoring the overall sentiment of tweets."""
+    tweets_text = "\n".join(tweets)
+    return (
+        "You are a sentiment analysis expert. Given the following tweets about a blockchain subnet, "
+        "analyze the overall sentiment and respond with a single integer between -100 (extremely negative) "
+        "and +100 (extremely positive). Do not explain your answer. Only output the integer.\n\n"
+        f"Tweets:\n{tweets_text}\n\nSentiment score:"
+    )
+
+
+def parse_sentiment_score(content: str) -> int:
+    """
+    Parse the sentiment score answered by the LLM.
+    Raises:
+        ValueError: If the response is not an integer or is out of range.
+    """
+    try:
+        score = int(content)
+    except ValueError:
+        raise ValueError(f"Unexpected response from Chutes LLM: {content}")
+    if not -100 <= score <= 100:
+        raise ValueError(f"Score out of range: {score}")
+    return score
+
+
 class ChutesClient:
     """
     Synchronous client for interacting with the Chutes LLM API.
@@ -83,18 +110,80 @@ class ChutesClient:
         Raises:
             ValueError: If the LLM response is not an integer or is out of range.
         """
-        tweets_text = "\n".join(tweets)
-        prompt = (
-            "You are a sentiment analysis expert. Given the following tweets about a blockchain subnet, "
-            "analyze the overall sentiment and respond with a single integer between -100 (extremely negative) "
-            "and +100 (extremely positive). Do not explain your answer. Only output the integer.\n\n"
-            f"Tweets:\n{tweets_text}\n\nSentiment score:"
+        content = self._chat_completions(build_sentiment_prompt(tweets))
+        return parse_sentiment_score(content)
+
+
+class AsyncChutesClient:
+    """
+    Non-blocking client for the Chutes LLM API.
+
+    Requests share one pooled httpx.AsyncClient and are retried on transport
+    errors and transient server responses.
+    """
+
+    def __init__(self, api_token: Optional[str] = None, client: Optional[httpx.AsyncClient] = None):
+        """
+        Initialize the AsyncChutesClient.
+        Args:
+            api_token: Optional API key for Chutes LLM. If not provided, uses settings.CHUTES_API_KEY.
+            client: Optional AsyncClient to share, a pooled one is built if not provided.
+        Raises:
+            ValueError: If no API key is provided or found in config.
+        """
+        self.api_token = api_token or settings.CHUTES_API_KEY
+        if not self.api_token:
+            raise ValueError(
+                "Chutes API key must be provided or set in CHUTES_API_KEY env var/.env."
+            )
+        self.client = client or build_async_client()
+
+    async def aclose(self) -> None:
+        """
+        Close the underlying HTTP client.
+        """
+        await self.client.aclose()
+
+    async def _chat_completions(
+        self,
+        prompt: str,
+        model: str = "unsloth/Llama-3.2-3B-Instruct",
+        max_tokens: int = 1024,
+        temperature: float = 0.7,
+    ) -> str:
+        """
+        Call the Chutes LLM chat completions API.
+        Returns:
+            str: The LLM's response content.
+        Raises:
+            httpx.HTTPError: If the request fails after retries.
+        """
+        payload = {
+            "model": model,
+            "messages": [{"role": "user", "content": prompt}],
+            "stream": False,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+        }
+        response = await request_with_retries(
+            self.client,
+            "POST",
+            CHUTES_API_URL,
+            headers={"Authorization": f"Bearer {self.api_token}"},
+            json=payload,
         )
-        content = self._chat_completions(prompt)
-        try:
-            score = int(content)
-        except ValueError:
-            raise ValueError(f"Unexpected response from Chutes LLM: {content}")
-        if not -100 <= score <= 100:
-            raise ValueError(f"Score out of range: {score}")
-        return score
+        data = response.json()
+        return data["choices"][0]["message"]["content"].strip()
+
+    async def get_sentiment_score(self, tweets: List[str]) -> int:
+        """
+        Analyze the sentiment of a list of tweets using the Chutes LLM API.
+        Args:
+            tweets: List of tweet strings to analyze.
+        Returns:
+            int: Sentiment score between -100 (extremely negative) and +100 (extremely positive).
+        Raises:
+            ValueError: If the LLM response is not an integer or is out of range.
+        """
+        content = await self._chat_completions(build_sentiment_prompt(tweets))
+        return parse_sentiment_score(content)
@@ -1,10 +1,14 @@
-from typing import List
+from typing import List, Optional
+import httpx
 from desearch_py import Desearch
 from ..config import settings
+from .http import build_async_client, request_with_retries
 import logging
 
 logger = logging.getLogger(__name__)
 
+DESEARCH_API_URL = "https://api.desearch.ai"
+
 
 class DesearchClient:
     def __init__(self):
@@ -13,3 +17,34 @@ class DesearchClient:
     def search_tweets(self, query: str, count: int = 10) -> List[str]:
         result = self.client.basic_twitter_search(query=query)
         return [tweet["text"] for tweet in result]
+
+
+class AsyncDesearchClient:
+    """
+    Non-blocking Desearch client.
+
+    Calls the Desearch REST API over one pooled httpx.AsyncClient, reused by
+    every request made through this instance.
+    """
+
+    def __init__(self, api_key: Optional[str] = None, client: Optional[httpx.AsyncClient] = None):
+        self.api_key = api_key or settings.DATURA_API_KEY
+        self.client = client or build_async_client(
+            base_url=DESEARCH_API_URL, headers={"Authorization": self.api_key}
+        )
+
+    async def aclose(self) -> None:
+        """Close the underlying HTTP client."""
+        await self.client.aclose()
+
+    async def search_tweets(self, query: str, count: int = 10) -> List[str]:
+        """
+        Search recent tweets.
+
+        Raises:
+            httpx.HTTPError: If the request fails after retries
+        """
+        response = await request_with_retries(
+            self.client, "GET", "/twitter", params={"query": query, "count": count}
+        )
+        return [tweet["text"] for tweet in response.json()]
@@ -0,0 +1,60 @@
+"""
+Shared helpers for async HTTP clients of external APIs.
+"""
+
+import asyncio
+import logging
+from typing import Any, Optional
+import httpx
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+# Responses worth retrying: rate limited or a transient server-side failure
+RETRYABLE_STATUS_CODES = (429, 502, 503, 504)
+
+
+def build_async_client(**kwargs: Any) -> httpx.AsyncClient:
+    """Build an AsyncClient with a bounded connection pool and the configured timeout."""
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(settings.EXTERNAL_API_TIMEOUT),
+        limits=httpx.Limits(
+            max_connections=settings.EXTERNAL_API_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.EXTERNAL_API_MAX_CONNECTIONS,
+        ),
+        **kwargs,
+    )
+
+
+async def request_with_retries(
+    client: httpx.AsyncClient,
+    method: str,
+    url: str,
+    retries: Optional[int] = None,
+    backoff: float = 0.5,
+    **kwargs: Any,
+) -> httpx.Response:
+    """
+    Send a request, retrying transport errors and retryable status codes.
+
+    Retries back off exponentially from `backoff` seconds.
+
+    Raises:
+        httpx.HTTPError: If the request still fails after the last retry
+    """
+    retries = settings.EXTERNAL_API_RETRIES if retries is None else retries
+    attempt = 0
+    while True:
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.TransportError as e:
+            if attempt >= retries:
+                raise
+            logger.warning(f"{method} {url} failed, retrying: {str(e)}")
+        else:
+            if response.status_code not in RETRYABLE_STATUS_CODES or attempt >= retries:
+                response.raise_for_status()
+                return response
+            logger.warning(f"{method} {url} returned {response.status_code}, retrying")
+        await asyncio.sleep(backoff * 2**attempt)
+        attempt += 1
@@ -1,22 +1,147 @@
+import asyncio
 import motor.motor_asyncio
+from prometheus_client import Counter
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, CollectionInvalid
 from app.config import settings
 import logging
-from typing import Any, Dict, Optional, List
+from typing import Any, AsyncIterator, Dict, Optional, List, Sequence, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Indexes created by `MongoDBClient.ensure_indexes`, as (keys, options) per collection
+INDEXES: Dict[str, List[Tuple[List[Tuple[str, int]], Dict[str, Any]]]] = {
+    "sentiment_staking_results": [
+        ([("task_id", 1)], {"unique": True}),
+        # Results of a (netuid, hotkey), in the keyset order of the results API
+        ([("netuid", 1), ("hotkey", 1), ("created_at", -1), ("_id", -1)], {}),
+        # Unfiltered listing of the most recent results
+        ([("created_at", -1), ("_id", -1)], {}),
+        # Queued stake decisions claimed by the batch flush
+        ([("status", 1)], {}),
+        ([("batch_id", 1)], {"sparse": True}),
+    ],
+}
+
+MONGODB_BUFFERED_UPSERTS = Counter(
+    "mongodb_buffered_upserts_total",
+    "Total count of buffered upserts by outcome "
+    "(coalesced, written, failed, requeued, dropped or lost).",
+    ["outcome"],
+)
+
+# Raised by an upsert whose query no longer matches its document, as the insert collides
+DUPLICATE_KEY = 11000
+
 
 class MongoDBClient:
-    def __init__(self):
+    def __init__(self, flush_interval: Optional[float] = None, max_buffered: Optional[int] = None):
         self.client = motor.motor_asyncio.AsyncIOMotorClient(settings.MONGODB_URL)
         self.db = self.client[settings.MONGODB_DB_NAME]
+        self.flush_interval = (
+            settings.MONGODB_BULK_FLUSH_INTERVAL if flush_interval is None else flush_interval
+        )
+        self.max_buffered = max_buffered or settings.MONGODB_BULK_MAX_OPS
+        # Pending upsert operators by collection and query
+        self._buffer: Dict[str, Dict[Tuple, Tuple[Dict[str, Any], Dict[str, Dict]]]] = {}
+        self._buffered = 0
+        self._flush_task: Optional[asyncio.Task] = None
+        # Flushes write one after another, so an older upsert never lands after a newer one
+        self._flush_lock = asyncio.Lock()
         logger.info(
             f"Connected to MongoDB at {settings.MONGODB_URL}, db: {settings.MONGODB_DB_NAME}"
         )
 
+    def close(self) -> None:
+        """Close the connection pool."""
+        self.client.close()
+
+    async def aclose(self) -> None:
+        """Flush buffered upserts, then close the connection pool."""
+        self._cancel_flush()
+        await self.flush()
+        # A failed flush schedules a retry the closed client could not run
+        self._cancel_flush()
+        if self._buffered:
+            MONGODB_BUFFERED_UPSERTS.labels(outcome="lost").inc(self._buffered)
+            logger.error(f"Closing MongoDB client with {self._buffered} unwritten upsert(s)")
+        self.close()
+
+    async def ensure_indexes(self) -> bool:
+        """
+        Create the indexes of every collection in INDEXES.
+
+        Returns:
+            bool: False if an index could not be created, the rest are then skipped
+        """
+        for collection_name, indexes in INDEXES.items():
+            for keys, options in indexes:
+                if await self.create_index(collection_name, keys, **options) is None:
+                    return False
+        return True
+
     def get_collection(self, collection_name: str):
         return self.db[collection_name]
 
+    async def create_timeseries_collection(
+        self,
+        collection_name: str,
+        time_field: str,
+        meta_field: str,
+        granularity: str = "minutes",
+        expire_after_seconds: Optional[int] = None,
+    ) -> bool:
+        """Create a time-series collection unless it already exists."""
+        options: Dict[str, Any] = {
+            "timeseries": {
+                "timeField": time_field,
+                "metaField": meta_field,
+                "granularity": granularity,
+            }
+        }
+        if expire_after_seconds is not None:
+            options["expireAfterSeconds"] = expire_after_seconds
+        try:
+            await self.db.create_collection(collection_name, **options)
+            logger.info(f"Created time-series collection {collection_name}")
+            return True
+        except CollectionInvalid:
+            return True
+        except Exception as e:
+            logger.error(f"Failed to create time-series collection {collection_name}: {e}")
+            return False
+
+    async def create_index(
+        self, collection_name: str, keys: Sequence[Tuple[str, int]], **kwargs: Any
+    ) -> Optional[str]:
+        try:
+            return await self.get_collection(collection_name).create_index(list(keys), **kwargs)
+        except Exception as e:
+            logger.error(f"Failed to create index on {collection_name}: {e}")
+            return None
+
+    async def insert_many(self, collection_name: str, documents: List[Dict[str, Any]]) -> int:
+        if not documents:
+            return 0
+        try:
+            result = await self.get_collection(collection_name).insert_many(
+                documents, ordered=False
+            )
+            return len(result.inserted_ids)
+        except Exception as e:
+            logger.error(f"Failed to insert documents into {collection_name}: {e}")
+            return 0
+
+    async def aggregate(
+        self, collection_name: str, pipeline: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        try:
+            cursor = self.get_collection(collection_name).aggregate(pipeline)
+            return [doc async for doc in cursor]
+        except Exception as e:
+            logger.error(f"Failed to aggregate documents in {collection_name}: {e}")
+            return []
+
     async def insert_one(self, collection_name: str, document: Dict[str, Any]) -> Optional[str]:
         try:
             result = await self.get_collection(collection_name).insert_one(document)
@@ -36,14 +161,54 @@ class MongoDBClient:
             logger.error(f"Failed to find document in {collection_name}: {e}")
             return None
 
-    async def find_many(self, collection_name: str, query: Dict[str, Any]) -> List[Dict[str, Any]]:
+    async def find_many(
+        self,
+        collection_name: str,
+        query: Dict[str, Any],
+        projection: Optional[Dict[str, Any]] = None,
+        sort: Optional[List[Tuple[str, int]]] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
         try:
-            cursor = self.get_collection(collection_name).find(query)
-            return [doc async for doc in cursor]
+            return [
+                doc
+                async for doc in self.iter_find(
+                    collection_name, query, projection=projection, sort=sort, limit=limit
+                )
+            ]
         except Exception as e:
             logger.error(f"Failed to find documents in {collection_name}: {e}")
             return []
 
+    async def iter_find(
+        self,
+        collection_name: str,
+        query: Dict[str, Any],
+        projection: Optional[Dict[str, Any]] = None,
+        sort: Optional[List[Tuple[str, int]]] = None,
+        limit: Optional[int] = None,
+        batch_size: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream the documents matching `query`, fetched from the server in batches.
+
+        Unlike `find_many`, the result set is never held in memory at once.
+        Errors are logged and raised, since a partial stream cannot report them.
+        """
+        cursor = self.get_collection(collection_name).find(
+            query, projection, sort=sort, limit=limit or 0
+        )
+        if batch_size:
+            cursor = cursor.batch_size(batch_size)
+        try:
+            async for doc in cursor:
+                yield doc
+        except Exception as e:
+            logger.error(f"Failed to find documents in {collection_name}: {e}")
+            raise
+        finally:
+            await cursor.close()
+
     async def update_one(
         self, collection_name: str, query: Dict[str, Any], update: Dict[str, Any]
     ) -> bool:
@@ -54,6 +219,177 @@ class MongoDBClient:
             logger.error(f"Failed to update document in {collection_name}: {e}")
             return False
 
+    async def update_many(
+        self, collection_name: str, query: Dict[str, Any], update: Dict[str, Any]
+    ) -> int:
+        try:
+            result = await self.get_collection(collection_name).update_many(query, {"$set": update})
+            return result.modified_count
+        except Exception as e:
+            logger.error(f"Failed to update documents in {collection_name}: {e}")
+            return 0
+
+    async def upsert_one(
+        self,
+        collection_name: str,
+        query: Dict[str, Any],
+        update: Dict[str, Any],
+        set_on_insert: Optional[Dict[str, Any]] = None,
+        buffered: bool = False,
+    ) -> bool:
+        """
+        Set fields of the document matching `query`, inserting it if there is none.
+
+        Args:
+            set_on_insert: Fields only set when the document is inserted
+            buffered: Whether the write may wait for the next bulk flush when
+                buffering is enabled (`flush_interval` > 0). Buffered upserts to
+                the same document are coalesced into one. A buffered upsert may
+                land late, after a retry, so a query guarding it against newer
+                writes (e.g. on a field they set) must include a unique field:
+                once the guard no longer matches, the upsert fails with a
+                duplicate key error and is dropped.
+
+        Returns:
+            bool: True if the document was written or buffered
+        """
+        if buffered and self.flush_interval > 0:
+            self._buffer_upsert(collection_name, query, update, set_on_insert or {})
+            if self._buffered >= self.max_buffered:
+                await self.flush()
+            else:
+                self._schedule_flush()
+            return True
+        operators: Dict[str, Dict[str, Any]] = {"$set": update}
+        if set_on_insert:
+            operators["$setOnInsert"] = set_on_insert
+        try:
+            await self.get_collection(collection_name).update_one(query, operators, upsert=True)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to upsert document in {collection_name}: {e}")
+            return False
+
+    def _buffer_upsert(
+        self,
+        collection_name: str,
+        query: Dict[str, Any],
+        update: Dict[str, Any],
+        set_on_insert: Dict[str, Any],
+    ) -> None:
+        pending = self._buffer.setdefault(collection_name, {})
+        key = tuple(sorted(query.items()))
+        if key in pending:
+            MONGODB_BUFFERED_UPSERTS.labels(outcome="coalesced").inc()
+            _, operators = pending[key]
+            operators["$set"].update(update)
+            for field, value in set_on_insert.items():
+                operators["$setOnInsert"].setdefault(field, value)
+        else:
+            self._buffered += 1
+            operators = {"$set": dict(update), "$setOnInsert": dict(set_on_insert)}
+            pending[key] = (query, operators)
+        # A field cannot be in both operators
+        for field in operators["$set"]:
+            operators["$setOnInsert"].pop(field, None)
+
+    def is_buffered(self, collection_name: str, query: Dict[str, Any]) -> bool:
+        """Whether an upsert of the document matching `query` is waiting to be flushed."""
+        return tuple(sorted(query.items())) in self._buffer.get(collection_name, {})
+
+    def _requeue(self, collection_name: str, failed: Dict[Tuple, Tuple[Dict, Dict]]) -> None:
+        """Put the upserts of a failed bulk write back, under the ones buffered since."""
+        pending = self._buffer.setdefault(collection_name, {})
+        for key, (query, operators) in failed.items():
+            if key not in pending:
+                self._buffered += 1
+                pending[key] = (query, operators)
+                continue
+            _, newer = pending[key]
+            for name in ("$set", "$setOnInsert"):
+                for field, value in operators[name].items():
+                    newer[name].setdefault(field, value)
+            for field in newer["$set"]:
+                newer["$setOnInsert"].pop(field, None)
+        MONGODB_BUFFERED_UPSERTS.labels(outcome="requeued").inc(len(failed))
+
+    def _schedule_flush(self) -> None:
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    def _cancel_flush(self) -> None:
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_interval)
+        self._flush_task = None
+        # A cancelled timer must not abandon a bulk write halfway
+        await asyncio.shield(self.flush())
+
+    async def flush(self) -> int:
+        """
+        Write the buffered upserts, one bulk_write per collection.
+
+        Flushes are serialized. The failed upserts of a bulk write are put back
+        into the buffer and retried by the next flush, all of them if the
+        server did not report which failed. Upserts failing with a duplicate
+        key error are dropped, as their guard no longer matches.
+
+        Returns:
+            int: Number of upserts written
+        """
+        async with self._flush_lock:
+            buffer, self._buffer, self._buffered = self._buffer, {}, 0
+            written = 0
+            for collection_name, pending in buffer.items():
+                operations = [
+                    UpdateOne(
+                        query,
+                        {name: fields for name, fields in operators.items() if fields},
+                        upsert=True,
+                    )
+                    for query, operators in pending.values()
+                ]
+                try:
+                    await self.get_collection(collection_name).bulk_write(operations, ordered=False)
+                    written += len(operations)
+                    MONGODB_BUFFERED_UPSERTS.labels(outcome="written").inc(len(operations))
+                except BulkWriteError as e:
+                    # The other upserts were applied, retrying them could undo newer writes
+                    keys = list(pending)
+                    errors = {
+                        keys[error["index"]]: error.get("code")
+                        for error in e.details.get("writeErrors", [])
+                    }
+                    failed = {
+                        key: pending[key] for key, code in errors.items() if code != DUPLICATE_KEY
+                    }
+                    written += len(operations) - len(errors)
+                    MONGODB_BUFFERED_UPSERTS.labels(outcome="written").inc(
+                        len(operations) - len(errors)
+                    )
+                    MONGODB_BUFFERED_UPSERTS.labels(outcome="dropped").inc(
+                        len(errors) - len(failed)
+                    )
+                    MONGODB_BUFFERED_UPSERTS.labels(outcome="failed").inc(len(failed))
+                    if failed:
+                        logger.error(
+                            f"Failed to bulk write {len(failed)} upsert(s) to {collection_name}: "
+                            f"{e}"
+                        )
+                        self._requeue(collection_name, failed)
+                except Exception as e:
+                    MONGODB_BUFFERED_UPSERTS.labels(outcome="failed").inc(len(operations))
+                    logger.error(
+                        f"Failed to bulk write {len(operations)} upsert(s) to {collection_name}: {e}"
+                    )
+                    self._requeue(collection_name, pending)
+            if self._buffered and self.flush_interval > 0:
+                self._schedule_flush()
+            return written
+
     async def delete_one(self, collection_name: str, query: Dict[str, Any]) -> bool:
         try:
             result = await self.get_collection(collection_name).delete_one(query)
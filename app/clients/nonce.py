@@ -0,0 +1,84 @@
+"""
+Local nonce allocation for extrinsics signed by the staking coldkey.
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Set
+from prometheus_client import Counter, Gauge
+
+logger = logging.getLogger(__name__)
+
+PENDING_EXTRINSICS = Gauge(
+    "bittensor_pending_extrinsics",
+    "Gauge of extrinsics holding a nonce that are not yet included or rejected, by account.",
+    ["account"],
+)
+NONCE_RESYNCS = Counter(
+    "bittensor_nonce_resyncs_total",
+    "Total count of account nonces re-read from chain after a submission error.",
+    ["account"],
+)
+
+
+class NonceManager:
+    """
+    Hand out account nonces locally so extrinsics can be submitted in parallel.
+
+    The next nonce of an account is read from chain once, then incremented
+    locally for every extrinsic, so concurrent submissions (on any pooled
+    connection) never reuse a nonce. A submission that fails before it is
+    included may leave a gap or a stale counter, so the next allocation
+    re-reads the nonce from chain, whose `account_nextIndex` also counts
+    extrinsics still in the transaction pool. That fills the gap, but the
+    chain does not know of extrinsics still being submitted, so nonces this
+    process still holds are skipped.
+
+    Nonces are only coordinated within this process. An extrinsic whose nonce
+    another process took first is rejected, and BitTensorClient resubmits it
+    once after the resync.
+    """
+
+    def __init__(self):
+        self._next: Dict[str, int] = {}
+        self._pending: Dict[str, Set[int]] = {}
+        self._lock = asyncio.Lock()
+
+    def pending(self, address: str) -> int:
+        """Number of extrinsics of an account holding a nonce."""
+        return len(self._pending.get(address, ()))
+
+    async def acquire(self, address: str, fetch: Callable[[], Awaitable[int]]) -> int:
+        """
+        Allocate the next nonce of an account.
+
+        Args:
+            address: SS58 address of the signing account
+            fetch: Reads the account's next nonce from chain, when it is not known
+        """
+        async with self._lock:
+            nonce = self._next.get(address)
+            if nonce is None:
+                nonce = await fetch()
+            pending = self._pending.setdefault(address, set())
+            # A resync may return a nonce held by an extrinsic not yet in the pool
+            while nonce in pending:
+                nonce += 1
+            self._next[address] = nonce + 1
+            pending.add(nonce)
+            PENDING_EXTRINSICS.labels(account=address).set(self.pending(address))
+            return nonce
+
+    def release(self, address: str, nonce: int, resync: bool = False) -> None:
+        """
+        Release a nonce once its extrinsic is included or rejected.
+
+        Args:
+            resync: Whether the extrinsic failed without being included, in which
+                case the account nonce is read from chain again on next use
+        """
+        self._pending.get(address, set()).discard(nonce)
+        PENDING_EXTRINSICS.labels(account=address).set(self.pending(address))
+        if resync and self._next.pop(address, None) is not None:
+            NONCE_RESYNCS.labels(account=address).inc()
+            logger.warning(f"Resyncing nonce of {address} after failed extrinsic {nonce}")
@@ -1,21 +1,72 @@
 from bittensor import Wallet
 from ..config import settings
 import logging
+import threading
+from typing import Dict, Optional, Tuple
+from prometheus_client import Counter
 
 logger = logging.getLogger(__name__)
 
+WALLET_CACHE_REQUESTS = Counter(
+    "wallet_cache_requests_total",
+    "Total count of wallet lookups by result (hit or miss).",
+    ["result"],
+)
+
+
+class WalletCache:
+    """
+    Process-wide cache of loaded and unlocked wallets.
+
+    Loading a wallet may regenerate its keyfiles from the mnemonic, and
+    unlocking reads and decodes the coldkey file; both happen once per process
+    instead of on every client. Call `invalidate` after the keyfiles or the
+    mnemonic change.
+    """
 
-class WalletClient:
     def __init__(self):
-        self.wallet = Wallet(name=settings.BITTENSOR_WALLET_NAME)
+        self._wallets: Dict[Tuple[Optional[str], Optional[str]], Wallet] = {}
+        self._lock = threading.Lock()
 
-        if not self.wallet.coldkey_file.exists_on_device():
-            self.wallet.regenerate_coldkey(
+    @staticmethod
+    def _load(name: Optional[str], path: Optional[str]) -> Wallet:
+        wallet = Wallet(name=name, path=path) if path else Wallet(name=name)
+        if not wallet.coldkey_file.exists_on_device():
+            wallet.regenerate_coldkey(
                 mnemonic=settings.BITTENSOR_WALLET_MNEMONIC, use_password=False, overwrite=True
             )
-            self.wallet.regenerate_hotkey(
+            wallet.regenerate_hotkey(
                 mnemonic=settings.BITTENSOR_WALLET_MNEMONIC, use_password=False, overwrite=True
             )
+        # Keep the decrypted coldkey in memory for signing
+        wallet.unlock_coldkey()
+        logger.info(f"Loaded wallet {name}")
+        return wallet
+
+    def get(self, name: Optional[str], path: Optional[str] = None) -> Wallet:
+        """Get the unlocked wallet with the given name, loading it on first use."""
+        key = (name, path)
+        with self._lock:
+            wallet = self._wallets.get(key)
+            WALLET_CACHE_REQUESTS.labels(result="hit" if wallet is not None else "miss").inc()
+            if wallet is None:
+                wallet = self._wallets[key] = self._load(name, path)
+            return wallet
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """Drop a cached wallet, or every cached wallet if no name is given."""
+        with self._lock:
+            for key in list(self._wallets):
+                if name is None or key[0] == name:
+                    del self._wallets[key]
+
+
+wallets = WalletCache()
+
+
+class WalletClient:
+    def __init__(self):
+        self.wallet = wallets.get(settings.BITTENSOR_WALLET_NAME, settings.BITTENSOR_WALLET_PATH)
 
     async def get_balance(self):
         return await self.wallet.get_balance()
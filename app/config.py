@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Optional
+from typing import List, Optional
 from pydantic import Field, validator, AnyHttpUrl, DirectoryPath
 import secrets
 import os
@@ -38,12 +38,109 @@ class Settings(BaseSettings):
     # MongoDB
     MONGODB_URL: str = Field("mongodb://localhost:27017", description="MongoDB connection URL")
     MONGODB_DB_NAME: str = Field("tao_dividends", description="MongoDB database name")
+    MONGODB_BULK_FLUSH_INTERVAL: float = Field(
+        0,
+        description="Seconds buffered upserts wait to be flushed together with bulk_write "
+        "(0 writes immediately; off by default, as buffered results show late and are lost "
+        "if the process is killed)",
+        ge=0,
+    )
+    MONGODB_BULK_MAX_OPS: int = Field(
+        500, description="Buffered upserts that trigger an immediate bulk_write flush", gt=0
+    )
 
     # Redis
     REDIS_URL: str = Field("redis://localhost:6379/1", description="Redis URL for caching")
     REDIS_POOL_SIZE: int = Field(100, description="Redis connection pool size", gt=0)
     REDIS_CACHE_TTL: int = Field(120, description="Redis cache TTL in seconds", gt=0)
 
+    CACHE_SERIALIZER: str = Field(
+        "json", description="Serializer of cached values ('json' or 'msgpack')"
+    )
+
+    # In-process cache tier in front of Redis
+    CACHE_LOCAL_ENABLED: bool = Field(
+        False, description="Keep recently read cache entries in process memory"
+    )
+    CACHE_LOCAL_MAX_ENTRIES: int = Field(
+        1024, description="Maximum number of in-process cache entries", gt=0
+    )
+    CACHE_LOCAL_MAX_BYTES: int = Field(
+        16 * 1024 * 1024, description="Maximum serialized size of in-process cache entries", gt=0
+    )
+    CACHE_LOCAL_TTL: float = Field(
+        5, description="Seconds an in-process cache entry is served without Redis", gt=0
+    )
+    CACHE_INVALIDATION_CHANNEL: str = Field(
+        "cache:invalidate", description="Redis pub/sub channel for cross-worker invalidation"
+    )
+
+    # Dividend snapshot cache
+    DIVIDEND_CACHE_HARD_TTL: Optional[int] = Field(
+        None,
+        description="Serve snapshots past REDIS_CACHE_TTL until this age (seconds) "
+        "while refreshing them in the background",
+        gt=0,
+    )
+    DIVIDEND_CACHE_EXPIRY_POLICY: str = Field(
+        "fixed",
+        description="'fixed' expires snapshots a TTL after they were read from chain, "
+        "'sliding' a TTL after they were last served",
+    )
+    DIVIDEND_SNAPSHOT_LAYOUT: str = Field(
+        "hash",
+        description="'hash' stores snapshots as one Redis hash field per hotkey, "
+        "'packed' as one binary value of 32-byte account ids and u64 dividends",
+    )
+    DIVIDEND_SINGLEFLIGHT_DISTRIBUTED: bool = Field(
+        False, description="Coalesce snapshot cache misses across workers with a Redis lock"
+    )
+    DIVIDEND_SINGLEFLIGHT_LOCK_TTL: float = Field(
+        30, description="Redis single-flight lock TTL in seconds", gt=0
+    )
+    DIVIDEND_SINGLEFLIGHT_POLL_INTERVAL: float = Field(
+        0.05, description="Seconds between checks while another worker holds the lock", gt=0
+    )
+    DIVIDEND_BLOCK_CACHE_SIZE: int = Field(
+        256, description="Block-pinned snapshots kept in process memory", gt=0
+    )
+    DIVIDEND_BLOCK_CACHE_TTL: int = Field(
+        86400, description="Seconds block-pinned snapshots are retained in Redis", gt=0
+    )
+    DIVIDEND_POINT_QUERY_MAX_HOTKEYS: int = Field(
+        4,
+        description="Read single hotkeys of a cold subnet by point query while at most this "
+        "many distinct hotkeys of it were requested recently (0 always scans the subnet)",
+        ge=0,
+    )
+    DIVIDEND_POINT_QUERY_WINDOW: float = Field(
+        60, description="Seconds requested hotkeys count towards the point query policy", gt=0
+    )
+    DIVIDEND_REFRESH_ENABLED: bool = Field(
+        False, description="Pre-warm snapshots of hot subnets in the background"
+    )
+    DIVIDEND_REFRESH_NETUIDS: List[int] = Field(
+        [18], description="Subnets kept warm by the background refresher"
+    )
+    DIVIDEND_REFRESH_BLOCKS: int = Field(
+        1, description="Refresh hot subnets every N new blocks", gt=0
+    )
+    DIVIDEND_REFRESH_POLL_INTERVAL: float = Field(
+        4, description="Seconds between chain head polls of the refresher", gt=0
+    )
+    DIVIDEND_HISTORY_ENABLED: bool = Field(
+        False, description="Record refreshed snapshots into a MongoDB time-series collection"
+    )
+    DIVIDEND_HISTORY_COLLECTION: str = Field(
+        "dividend_history", description="MongoDB time-series collection of dividend history"
+    )
+    DIVIDEND_HISTORY_INTERVAL: float = Field(
+        60, description="Minimum seconds between recorded snapshots of a subnet", ge=0
+    )
+    DIVIDEND_HISTORY_RETENTION: Optional[int] = Field(
+        None, description="Seconds dividend history is kept (forever if unset)", gt=0
+    )
+
     # Bittensor
     BITTENSOR_NETWORK: str = Field("test", description="Bittensor network (test or mainnet)")
     BITTENSOR_WALLET_PATH: Optional[str] = Field(None, description="Path to Bittensor wallet")
@@ -53,6 +150,21 @@ class Settings(BaseSettings):
         "5FFApaS75bv5pJHfAp2FVLBj9ZaXuFDjEypsaBNc1wCfe52v", description="Default hotkey for queries"
     )
     DEFAULT_NETUID: int = Field(18, description="Default subnet ID", ge=0)
+    BITTENSOR_POOL_SIZE: int = Field(
+        2, description="Number of long-lived subtensor connections per process", gt=0
+    )
+    BITTENSOR_HEALTH_CHECK_INTERVAL: float = Field(
+        30, description="Seconds between subtensor connection health checks (0 disables)", ge=0
+    )
+    BITTENSOR_FANOUT_CONCURRENCY: int = Field(
+        8, description="Maximum concurrent subnet queries of a multi-subnet fan-out", gt=0
+    )
+    BITTENSOR_QUERY_TIMEOUT: float = Field(
+        30, description="Timeout in seconds of each subnet query of a fan-out", gt=0
+    )
+    ACCOUNT_ID_CACHE_SIZE: int = Field(
+        32768, description="Raw account id <-> SS58 conversions kept in process memory", gt=0
+    )
 
     # Datura API
     DATURA_API_KEY: str = Field(..., description="API key for Datura")
@@ -60,6 +172,50 @@ class Settings(BaseSettings):
     # Chutes API
     CHUTES_API_KEY: str = Field(..., description="API key for Chutes LLM service")
 
+    # Sentiment analysis
+    SENTIMENT_TWEETS_TTL: int = Field(
+        300, description="Seconds the tweets searched for a subnet are cached", gt=0
+    )
+    SENTIMENT_SCORE_TTL: int = Field(
+        3600, description="Seconds the sentiment score of a set of tweets is cached", gt=0
+    )
+
+    SENTIMENT_TRIGGER_WINDOW: int = Field(
+        60,
+        description="Seconds after a sentiment staking trigger during which triggers for the "
+        "same netuid and hotkey are debounced (0 disables)",
+        ge=0,
+    )
+    SENTIMENT_TRIGGER_MODE: str = Field(
+        "suppress",
+        description="'suppress' drops debounced triggers, 'coalesce' merges them into one task "
+        "run when the window closes",
+    )
+
+    STAKE_BATCH_WINDOW: int = Field(
+        0,
+        description="Seconds stake decisions are gathered and netted per netuid and hotkey "
+        "before one batched extrinsic (0 stakes per task)",
+        ge=0,
+    )
+    STAKE_BATCH_STALE_AFTER: int = Field(
+        600,
+        description="Seconds after which stake decisions of an interrupted batch are queued "
+        "again, or failed if it was submitting",
+        gt=0,
+    )
+
+    # Outbound HTTP APIs (Desearch, Chutes)
+    EXTERNAL_API_TIMEOUT: float = Field(
+        30, description="Timeout in seconds of each external API request", gt=0
+    )
+    EXTERNAL_API_RETRIES: int = Field(
+        2, description="Retries of an external API request after a transient failure", ge=0
+    )
+    EXTERNAL_API_MAX_CONNECTIONS: int = Field(
+        20, description="Pooled connections per external API client", gt=0
+    )
+
     OTLP_GRPC_ENDPOINT: str = Field(
         "http://tempo:4317",
         description="OTLP gRPC endpoint for OpenTelemetry Collector (logs and traces)",
@@ -75,6 +231,30 @@ class Settings(BaseSettings):
             raise ValueError("BITTENSOR_NETWORK must be either 'test' or 'main'")
         return v
 
+    @validator("DIVIDEND_CACHE_EXPIRY_POLICY")
+    def validate_expiry_policy(cls, v: str) -> str:
+        if v not in ["fixed", "sliding"]:
+            raise ValueError("DIVIDEND_CACHE_EXPIRY_POLICY must be either 'fixed' or 'sliding'")
+        return v
+
+    @validator("CACHE_SERIALIZER")
+    def validate_cache_serializer(cls, v: str) -> str:
+        if v not in ["json", "msgpack"]:
+            raise ValueError("CACHE_SERIALIZER must be either 'json' or 'msgpack'")
+        return v
+
+    @validator("DIVIDEND_SNAPSHOT_LAYOUT")
+    def validate_snapshot_layout(cls, v: str) -> str:
+        if v not in ["hash", "packed"]:
+            raise ValueError("DIVIDEND_SNAPSHOT_LAYOUT must be either 'hash' or 'packed'")
+        return v
+
+    @validator("SENTIMENT_TRIGGER_MODE")
+    def validate_trigger_mode(cls, v: str) -> str:
+        if v not in ["suppress", "coalesce"]:
+            raise ValueError("SENTIMENT_TRIGGER_MODE must be either 'suppress' or 'coalesce'")
+        return v
+
     @validator("MONGODB_URL")
     def validate_mongodb_url(cls, v: str) -> str:
         if not v.startswith(("mongodb://", "mongodb+srv://")):
@@ -3,6 +3,7 @@ Main FastAPI application.
 """
 
 import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
@@ -10,17 +11,50 @@ from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from app.config import settings
-from app.api.v1 import tao_dividends
+from app.api.v1 import staking_results, tao_dividends
+from app.services.refresher import DividendRefresher
 import uvicorn
 from app.utils import PrometheusMiddleware, metrics, setting_api_logging, setting_otlp
 from prometheus_fastapi_instrumentator import Instrumentator
 
 
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Open the shared subtensor connections once instead of per request
+    bittensor_client = tao_dividends.bittensor_client
+    try:
+        await bittensor_client.connect()
+    except Exception as e:
+        logger.error(f"Failed to connect to subtensor, will retry on first request: {str(e)}")
+    if settings.BITTENSOR_HEALTH_CHECK_INTERVAL:
+        bittensor_client.start_health_checks(settings.BITTENSOR_HEALTH_CHECK_INTERVAL)
+    # Drop in-process cache entries other workers have replaced
+    tao_dividends.cache_client.start_invalidation_listener()
+    # Keep hot subnet snapshots warm so requests never wait on the chain
+    refresher = None
+    if settings.DIVIDEND_REFRESH_ENABLED:
+        history = None
+        if settings.DIVIDEND_HISTORY_ENABLED:
+            history = tao_dividends.dividend_history
+            await history.ensure_collection()
+        refresher = DividendRefresher(tao_dividends.dividend_service, history=history)
+        refresher.start()
+    yield
+    if refresher is not None:
+        await refresher.stop()
+    await tao_dividends.cache_client.stop_invalidation_listener()
+    await bittensor_client.close()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version="1.0.0",
     description="Tao Dividends API Service",
     debug=True,  # Enable debug mode
+    lifespan=lifespan,
 )
 
 setting_api_logging(settings.LOKI_URL)
@@ -77,6 +111,7 @@ async def general_exception_handler(request, exc):
 
 
 app.include_router(tao_dividends.router, prefix=settings.API_V1_STR)
+app.include_router(staking_results.router, prefix=settings.API_V1_STR)
 
 if __name__ == "__main__":
     # update uvicorn access logger format
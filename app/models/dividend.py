@@ -1,5 +1,7 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import Dict, List, Literal, Optional
+from datetime import datetime
+import time
 
 
 class DividendResponse(BaseModel):
@@ -7,7 +9,11 @@ class DividendResponse(BaseModel):
     hotkey: str
     dividend: float
     cached: bool = False
+    age: Optional[float] = None
+    block: Optional[int] = None
+    block_hash: Optional[str] = None
     stake_tx_triggered: bool = False
+    stake_tx_status: Optional[Literal["accepted", "merged", "suppressed"]] = None
 
 
 class DividendRequest(BaseModel):
@@ -15,6 +21,77 @@ class DividendRequest(BaseModel):
     hotkey: Optional[str] = None
 
 
+class BatchDividendItem(BaseModel):
+    netuid: int = Field(..., ge=0)
+    hotkey: str
+
+
+class BatchDividendRequest(BaseModel):
+    items: List[BatchDividendItem] = Field(..., min_length=1, max_length=500)
+
+
+class BatchDividendError(BaseModel):
+    netuid: int
+    detail: str
+
+
+class BatchDividendResponse(BaseModel):
+    results: List[DividendResponse]
+    errors: List[BatchDividendError] = []
+
+
+class HotkeyDividend(BaseModel):
+    hotkey: str
+    dividend: float
+
+
+class SubnetDividendsResponse(BaseModel):
+    netuid: int
+    block: Optional[int] = None
+    block_hash: Optional[str] = None
+    cached: bool = False
+    age: Optional[float] = None
+    dividends: List[HotkeyDividend]
+    next_cursor: Optional[str] = None
+
+
+class DividendHistoryPoint(BaseModel):
+    timestamp: datetime
+    hotkey: str
+    dividend: float
+    block: Optional[int] = None
+
+
+class DividendHistoryBucket(BaseModel):
+    timestamp: datetime
+    min: float
+    max: float
+    avg: float
+    count: int
+
+
+class DividendHistoryResponse(BaseModel):
+    netuid: int
+    hotkey: Optional[str] = None
+    start: datetime
+    end: datetime
+    points: Optional[List[DividendHistoryPoint]] = None
+    buckets: Optional[List[DividendHistoryBucket]] = None
+
+
+class DividendSnapshot(BaseModel):
+    netuid: int
+    dividends: Dict[str, float]
+    fetched_at: float
+    block: Optional[int] = None
+    block_hash: Optional[str] = None
+
+    @property
+    def age(self) -> float:
+        """Seconds since the snapshot was read from chain."""
+        return time.time() - self.fetched_at
+
+
 class ErrorResponse(BaseModel):
     error: str
     detail: Optional[str] = None
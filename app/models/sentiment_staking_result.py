@@ -1,15 +1,28 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 
 
 class SentimentStakingResult(BaseModel):
     task_id: str = Field(..., description="Celery task ID")
-    status: str = Field(..., description="Task status: pending, success, or failed")
+    status: str = Field(
+        ..., description="Task status: pending, queued, batching, submitting, success, or failed"
+    )
     netuid: int = Field(..., description="Subnet ID")
     hotkey: str = Field(..., description="Hotkey address")
     stake_amount: Optional[float] = Field(None, description="Stake or unstake amount")
+    batch_id: Optional[str] = Field(None, description="Stake batch the decision was executed in")
+    net_stake_amount: Optional[float] = Field(
+        None, description="Netted amount staked for the netuid and hotkey by the batch"
+    )
     error: Optional[str] = Field(None, description="Error message if failed")
     created_at: Optional[datetime] = Field(None, description="Task creation timestamp")
     updated_at: Optional[datetime] = Field(None, description="Task last update timestamp")
     # Add any additional fields as needed
+
+
+class SentimentStakingResultsResponse(BaseModel):
+    results: List[Dict[str, Any]] = Field(
+        ..., description="Results, newest first, with only the requested fields if projected"
+    )
+    next_cursor: Optional[str] = Field(None, description="Cursor of the next page, if any")
@@ -0,0 +1,71 @@
+"""
+Packed binary layout of dividend snapshots.
+
+    header:  version u8 | fetched_at f64 | block i64 (-1 if unknown) |
+             block_hash 32 bytes (zeros if unknown) | count u32
+    entries: count x (account id 32 bytes | dividend u64)
+
+All integers are little-endian. Hotkeys are stored as raw 32-byte account
+ids instead of 48-character SS58 strings, and dividends as fixed-width
+integers instead of decimal text.
+"""
+
+import struct
+from ..clients.accounts import account_ids
+from ..models.dividend import DividendSnapshot
+
+VERSION = 1
+HEADER = struct.Struct("<Bdq32sI")
+ENTRY = struct.Struct("<32sQ")
+NO_BLOCK_HASH = bytes(32)
+
+
+def pack_snapshot(snapshot: DividendSnapshot) -> bytes:
+    """
+    Encode a snapshot in the packed layout.
+
+    Raises:
+        ValueError: If a hotkey is not an SS58 address or a dividend is not a u64
+    """
+    block_hash = bytes.fromhex(snapshot.block_hash[2:]) if snapshot.block_hash else NO_BLOCK_HASH
+    block = snapshot.block if snapshot.block is not None else -1
+    buffer = bytearray(HEADER.size + ENTRY.size * len(snapshot.dividends))
+    HEADER.pack_into(
+        buffer, 0, VERSION, snapshot.fetched_at, block, block_hash, len(snapshot.dividends)
+    )
+    offset = HEADER.size
+    hotkeys = account_ids.to_account_ids(snapshot.dividends)
+    try:
+        for account_id, (hotkey, dividend) in zip(hotkeys, snapshot.dividends.items()):
+            if dividend != int(dividend):
+                raise ValueError(f"Dividend of {hotkey} is not an integer: {dividend}")
+            ENTRY.pack_into(buffer, offset, account_id, int(dividend))
+            offset += ENTRY.size
+    except struct.error as e:
+        raise ValueError(f"Cannot pack snapshot of netuid={snapshot.netuid}: {str(e)}") from e
+    return bytes(buffer)
+
+
+def unpack_snapshot(netuid: int, data: bytes) -> DividendSnapshot:
+    """
+    Decode a snapshot encoded by `pack_snapshot`.
+
+    Raises:
+        ValueError: If the data is not a packed snapshot
+    """
+    try:
+        version, fetched_at, block, block_hash, count = HEADER.unpack_from(data)
+        if version != VERSION or len(data) != HEADER.size + ENTRY.size * count:
+            raise ValueError(f"Malformed packed snapshot of netuid={netuid}")
+        entries = list(ENTRY.iter_unpack(memoryview(data)[HEADER.size :]))
+        hotkeys = account_ids.to_ss58_many((account_id for account_id, _ in entries), netuid)
+        dividends = {hotkey: dividend for hotkey, (_, dividend) in zip(hotkeys, entries)}
+    except struct.error as e:
+        raise ValueError(f"Malformed packed snapshot of netuid={netuid}: {str(e)}") from e
+    return DividendSnapshot(
+        netuid=netuid,
+        dividends=dividends,
+        fetched_at=fetched_at,
+        block=block if block >= 0 else None,
+        block_hash="0x" + block_hash.hex() if block_hash != NO_BLOCK_HASH else None,
+    )
@@ -0,0 +1,647 @@
+"""
+Subnet-wide dividend snapshots shared by all hotkeys of a subnet.
+"""
+
+import asyncio
+import bisect
+import re
+import time
+import logging
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from prometheus_client import Counter
+from ..config import settings
+from ..clients.bittensor import BitTensorClient
+from ..clients.cache import CacheClient
+from ..models.dividend import DividendSnapshot
+from .codec import pack_snapshot, unpack_snapshot
+from .pagination import InvalidCursor, decode_cursor, encode_cursor
+from .singleflight import RedisSingleFlight, SingleFlight
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_PREFIX = "api:tao_dividends_snapshot"
+BLOCK_SNAPSHOT_PREFIX = "api:tao_dividends_block"
+POINT_PREFIX = "api:tao_dividends_point"
+FETCHED_AT_FIELD = "__fetched_at__"
+BLOCK_FIELD = "__block__"
+BLOCK_HASH_FIELD = "__block_hash__"
+META_FIELDS = (FETCHED_AT_FIELD, BLOCK_FIELD, BLOCK_HASH_FIELD)
+BLOCK_HASH_PATTERN = re.compile(r"0x[0-9a-fA-F]{64}")
+
+DIVIDEND_SNAPSHOT_LOOKUPS = Counter(
+    "dividend_snapshot_lookups_total",
+    "Total count of snapshot lookups by result (hit, stale or miss).",
+    ["result"],
+)
+
+DIVIDEND_BLOCK_SNAPSHOT_LOOKUPS = Counter(
+    "dividend_block_snapshot_lookups_total",
+    "Total count of block-pinned snapshot lookups by result (hit or miss).",
+    ["result"],
+)
+
+DIVIDEND_CHAIN_READS = Counter(
+    "dividend_chain_reads_total",
+    "Total count of dividend chain reads by mode (subnet scan or hotkey point query).",
+    ["mode"],
+)
+
+SORT_ORDERS = ("desc", "asc")
+
+
+class UnknownBlock(LookupError):
+    """Raised when a requested block does not exist on chain (yet)."""
+
+
+class BlockMismatch(ValueError):
+    """Raised when a requested block number is not the number of the requested block hash."""
+
+
+class DividendService:
+    """
+    Serve dividends from one cached snapshot per subnet.
+
+    A snapshot holds the decoded `TaoDividendsPerSubnet` map of a subnet. It is
+    stored in Redis keyed by netuid, either as a hash (one field per hotkey) or
+    in the packed binary layout of `codec`, and kept as an in-process copy, so
+    a single chain scan answers every hotkey of that subnet until the snapshot
+    expires. Concurrent misses for the same subnet share one in-flight scan.
+
+    Scanning a subnet to answer a single hotkey is wasteful, so while only a
+    few distinct hotkeys of a cold subnet were requested recently, single
+    hotkey lookups read their own storage entry instead and cache it under a
+    per-hotkey key. Once more hotkeys are requested, the subnet is scanned.
+
+    With a hard TTL longer than the (soft) TTL, snapshots past the soft TTL are
+    still served immediately while a single background refresh replaces them
+    (stale-while-revalidate). Only snapshots past the hard TTL block on the chain.
+
+    Every scan is pinned to a block hash. Snapshots of a given (netuid, block
+    hash) never change, so they are also kept in an immutable per-block cache
+    that serves historical queries and repeat reads of the same block without
+    any TTL invalidation.
+
+    Cache hits never write to Redis under the default "fixed" expiry policy, so
+    snapshots are re-read from chain a TTL after they were fetched. The
+    "sliding" policy instead measures the TTL from the last hit and pays one
+    EXPIRE per hit to extend the Redis key.
+    """
+
+    def __init__(
+        self,
+        bittensor_client: BitTensorClient,
+        cache_client: CacheClient,
+        ttl: Optional[int] = None,
+        singleflight: Optional[SingleFlight] = None,
+        hard_ttl: Optional[int] = None,
+        expiry_policy: Optional[str] = None,
+        layout: Optional[str] = None,
+        point_query_hotkeys: Optional[int] = None,
+    ):
+        self.bittensor_client = bittensor_client
+        self.cache_client = cache_client
+        self.ttl = ttl or settings.REDIS_CACHE_TTL
+        self.hard_ttl = max(hard_ttl or settings.DIVIDEND_CACHE_HARD_TTL or self.ttl, self.ttl)
+        self.expiry_policy = expiry_policy or settings.DIVIDEND_CACHE_EXPIRY_POLICY
+        self.layout = layout or settings.DIVIDEND_SNAPSHOT_LAYOUT
+        self.point_query_hotkeys = (
+            point_query_hotkeys
+            if point_query_hotkeys is not None
+            else settings.DIVIDEND_POINT_QUERY_MAX_HOTKEYS
+        )
+        self.singleflight = singleflight or self._build_singleflight()
+        self._snapshots: Dict[int, DividendSnapshot] = {}
+        self._last_hits: Dict[int, float] = {}
+        self._revalidations: Dict[int, asyncio.Task] = {}
+        self._block_snapshots: "OrderedDict[Tuple[int, str], DividendSnapshot]" = OrderedDict()
+        self._sorted: Dict[Tuple[int, str], Tuple[float, List[Tuple[float, str]]]] = {}
+        self._requested_hotkeys: Dict[int, "OrderedDict[str, float]"] = {}
+        cache_client.add_invalidation_listener(self._on_invalidation)
+
+    def _on_invalidation(self, key: str) -> None:
+        """Drop the in-process copy of a snapshot another worker replaced."""
+        prefix, _, netuid = key.rpartition(":")
+        if prefix == SNAPSHOT_PREFIX and netuid.isdigit():
+            self._snapshots.pop(int(netuid), None)
+
+    def _build_singleflight(self) -> SingleFlight:
+        if settings.DIVIDEND_SINGLEFLIGHT_DISTRIBUTED:
+            return RedisSingleFlight(
+                "dividend_snapshot",
+                self.cache_client.redis,
+                lock_ttl=settings.DIVIDEND_SINGLEFLIGHT_LOCK_TTL,
+                poll_interval=settings.DIVIDEND_SINGLEFLIGHT_POLL_INTERVAL,
+            )
+        return SingleFlight("dividend_snapshot")
+
+    def build_snapshot_key(self, netuid: int) -> str:
+        return self.cache_client.build_cache_key(netuid, prefix=SNAPSHOT_PREFIX)
+
+    def build_block_snapshot_key(self, netuid: int, block_hash: str) -> str:
+        return self.cache_client.build_cache_key(netuid, block_hash, prefix=BLOCK_SNAPSHOT_PREFIX)
+
+    def build_point_key(self, netuid: int, hotkey: str) -> str:
+        return self.cache_client.build_cache_key(netuid, hotkey, prefix=POINT_PREFIX)
+
+    def _expiry_age(self, snapshot: DividendSnapshot) -> float:
+        """Age the TTLs are measured against, depending on the expiry policy."""
+        if self.expiry_policy == "sliding":
+            return time.time() - max(snapshot.fetched_at, self._last_hits.get(snapshot.netuid, 0))
+        return snapshot.age
+
+    def _is_fresh(self, snapshot: DividendSnapshot) -> bool:
+        return self._expiry_age(snapshot) < self.ttl
+
+    def _is_usable(self, snapshot: DividendSnapshot) -> bool:
+        return self._expiry_age(snapshot) < self.hard_ttl
+
+    async def _record_hit(self, netuid: int) -> None:
+        if self.expiry_policy == "sliding":
+            self._last_hits[netuid] = time.time()
+            await self.cache_client.touch(self.build_snapshot_key(netuid), ttl=self.hard_ttl)
+
+    async def _read_cached_snapshot(
+        self, netuid: int, key: Optional[str] = None
+    ) -> Optional[DividendSnapshot]:
+        key = key or self.build_snapshot_key(netuid)
+        try:
+            if self.layout == "packed":
+                packed = await self.cache_client.get_bytes(key)
+                return unpack_snapshot(netuid, packed) if packed else None
+            data = await self.cache_client.get_hash(key)
+        except Exception as cache_error:
+            logger.warning(f"Cache error: {str(cache_error)}")
+            return None
+        if not data or FETCHED_AT_FIELD not in data:
+            return None
+        # The cache may hand out a shared in-process copy, so leave `data` untouched
+        dividends = {hotkey: value for hotkey, value in data.items() if hotkey not in META_FIELDS}
+        return DividendSnapshot(
+            netuid=netuid,
+            dividends=dividends,
+            fetched_at=data[FETCHED_AT_FIELD],
+            block=data.get(BLOCK_FIELD),
+            block_hash=data.get(BLOCK_HASH_FIELD),
+        )
+
+    async def _read_fresh_cached_snapshot(self, netuid: int) -> Optional[DividendSnapshot]:
+        snapshot = await self._read_cached_snapshot(netuid)
+        return snapshot if snapshot is not None and self._is_fresh(snapshot) else None
+
+    async def _write_cached_snapshot(
+        self, snapshot: DividendSnapshot, key: Optional[str] = None, ttl: Optional[int] = None
+    ) -> None:
+        key = key or self.build_snapshot_key(snapshot.netuid)
+        try:
+            if self.layout == "packed":
+                await self.cache_client.set_bytes(
+                    key, pack_snapshot(snapshot), ttl=ttl or self.hard_ttl
+                )
+                return
+            mapping = {
+                **snapshot.dividends,
+                FETCHED_AT_FIELD: snapshot.fetched_at,
+                BLOCK_FIELD: snapshot.block,
+                BLOCK_HASH_FIELD: snapshot.block_hash,
+            }
+            await self.cache_client.set_hash(key, mapping, ttl=ttl or self.hard_ttl)
+        except Exception as cache_error:
+            logger.warning(f"Failed to cache snapshot: {str(cache_error)}")
+
+    def _remember_block_snapshot(self, snapshot: DividendSnapshot) -> None:
+        """Keep a pinned snapshot in the bounded in-process per-block cache."""
+        key = (snapshot.netuid, snapshot.block_hash)
+        self._block_snapshots[key] = snapshot
+        self._block_snapshots.move_to_end(key)
+        while len(self._block_snapshots) > settings.DIVIDEND_BLOCK_CACHE_SIZE:
+            self._block_snapshots.popitem(last=False)
+
+    async def _pin_block(
+        self, block: Optional[int] = None, block_hash: Optional[str] = None
+    ) -> Tuple[int, str]:
+        """
+        Resolve the number and hash of a block, the chain head if neither is given.
+
+        Raises:
+            UnknownBlock: If the block does not exist
+        """
+        if block_hash is None:
+            block_hash = await self.bittensor_client.get_block_hash(block)
+            if block_hash is None:
+                raise UnknownBlock(f"Unknown block {block}")
+        if block is None:
+            block = await self.bittensor_client.get_block_number(block_hash)
+            if block is None:
+                raise UnknownBlock(f"Unknown block hash {block_hash}")
+        return block, block_hash
+
+    async def refresh(self, netuid: int, block: Optional[int] = None) -> DividendSnapshot:
+        """
+        Scan the subnet on chain and replace its cached snapshot.
+
+        Args:
+            netuid: The subnet ID to scan
+            block: Optional current block number to pin the scan to, the chain head if None
+
+        Raises:
+            Exception: If the chain query fails
+        """
+        logger.info(f"Refreshing dividend snapshot for netuid={netuid}")
+        block, block_hash = await self._pin_block(block)
+        DIVIDEND_CHAIN_READS.labels(mode="scan").inc()
+        dividends = await self.bittensor_client.get_dividends_for_subnet(
+            netuid, block_hash=block_hash
+        )
+        snapshot = DividendSnapshot(
+            netuid=netuid,
+            dividends=dividends,
+            fetched_at=time.time(),
+            block=block,
+            block_hash=block_hash,
+        )
+        await self._write_cached_snapshot(snapshot)
+        self._snapshots[netuid] = snapshot
+        self._remember_block_snapshot(snapshot)
+        return snapshot
+
+    async def _coalesced_refresh(self, netuid: int) -> DividendSnapshot:
+        return await self.singleflight.do(
+            str(netuid),
+            lambda: self.refresh(netuid),
+            check=lambda: self._read_fresh_cached_snapshot(netuid),
+        )
+
+    async def _run_revalidation(self, netuid: int) -> None:
+        try:
+            await self._coalesced_refresh(netuid)
+        except Exception as e:
+            logger.error(f"Background refresh failed for netuid={netuid}: {str(e)}")
+
+    def _revalidate(self, netuid: int) -> None:
+        """Start a background refresh of a stale snapshot unless one is running."""
+        if netuid in self._revalidations:
+            return
+        task = asyncio.create_task(self._run_revalidation(netuid))
+        self._revalidations[netuid] = task
+        task.add_done_callback(lambda _: self._revalidations.pop(netuid, None))
+
+    async def refresh_many(
+        self, netuids: Iterable[int], block: Optional[int] = None
+    ) -> Dict[int, Union[DividendSnapshot, Exception]]:
+        """
+        Scan several subnets with one concurrent fan-out and replace their snapshots.
+
+        Args:
+            netuids: The subnet IDs to scan
+            block: Optional current block number to pin the scans to, the chain head if None
+
+        Returns:
+            Dict[int, Union[DividendSnapshot, Exception]]: The new snapshot, or the
+            error, by netuid
+        """
+        netuids = list(dict.fromkeys(netuids))
+        logger.info(f"Refreshing dividend snapshots for netuids={netuids}")
+        try:
+            block, block_hash = await self._pin_block(block)
+        except Exception as e:
+            return {netuid: e for netuid in netuids}
+        # Every subnet is read at the same block
+        DIVIDEND_CHAIN_READS.labels(mode="scan").inc(len(netuids))
+        results, errors = await self.bittensor_client.get_dividends_for_subnets(
+            netuids, block_hash=block_hash
+        )
+        fetched_at = time.time()
+        snapshots = {
+            netuid: DividendSnapshot(
+                netuid=netuid,
+                dividends=dividends,
+                fetched_at=fetched_at,
+                block=block,
+                block_hash=block_hash,
+            )
+            for netuid, dividends in results.items()
+        }
+        await asyncio.gather(*(self._write_cached_snapshot(s) for s in snapshots.values()))
+        self._snapshots.update(snapshots)
+        for snapshot in snapshots.values():
+            self._remember_block_snapshot(snapshot)
+        return {netuid: snapshots.get(netuid) or errors[netuid] for netuid in netuids}
+
+    async def _lookup(self, netuid: int) -> Optional[Tuple[DividendSnapshot, bool]]:
+        """Find a usable cached snapshot, refreshing a stale one in the background."""
+        snapshot = self._snapshots.get(netuid)
+        if snapshot is None or not self._is_fresh(snapshot):
+            cached_snapshot = await self._read_cached_snapshot(netuid)
+            if cached_snapshot is not None and (
+                snapshot is None or cached_snapshot.fetched_at > snapshot.fetched_at
+            ):
+                snapshot = cached_snapshot
+                self._snapshots[netuid] = snapshot
+                if self.expiry_policy == "sliding":
+                    # The Redis key only survives while it keeps being hit
+                    self._last_hits[netuid] = time.time()
+
+        if snapshot is not None and self._is_fresh(snapshot):
+            DIVIDEND_SNAPSHOT_LOOKUPS.labels(result="hit").inc()
+            await self._record_hit(netuid)
+            return snapshot, True
+
+        if snapshot is not None and self._is_usable(snapshot):
+            DIVIDEND_SNAPSHOT_LOOKUPS.labels(result="stale").inc()
+            self._revalidate(netuid)
+            return snapshot, True
+
+        DIVIDEND_SNAPSHOT_LOOKUPS.labels(result="miss").inc()
+        logger.debug(f"Snapshot cache miss for netuid={netuid}")
+        return None
+
+    async def get_snapshot(self, netuid: int) -> Tuple[DividendSnapshot, bool]:
+        """
+        Get the dividend snapshot of a subnet.
+
+        Looks in the in-process copy first, then Redis, and scans the chain only
+        when neither holds a usable snapshot. Only one scan per subnet is in
+        flight at a time; concurrent callers share its result. A stale but
+        usable snapshot is returned right away and refreshed in the background.
+
+        Returns:
+            Tuple[DividendSnapshot, bool]: The snapshot and whether it came from cache
+        """
+        found = await self._lookup(netuid)
+        if found is not None:
+            return found
+        return await self._coalesced_refresh(netuid), False
+
+    async def get_snapshots(
+        self, netuids: Iterable[int]
+    ) -> Dict[int, Union[Tuple[DividendSnapshot, bool], Exception]]:
+        """
+        Get the dividend snapshots of several subnets.
+
+        Each distinct subnet is looked up once. The subnets missing from cache
+        are scanned together by one concurrent fan-out, still coalesced per
+        subnet with concurrent callers. A subnet that cannot be read maps to
+        its exception instead of failing the whole lookup.
+
+        Returns:
+            Dict[int, Union[Tuple[DividendSnapshot, bool], Exception]]: Snapshot and
+            cache status, or the error, by netuid
+        """
+        netuids = list(dict.fromkeys(netuids))
+        lookups = await asyncio.gather(*(self._lookup(netuid) for netuid in netuids))
+        results = dict(zip(netuids, lookups))
+        missing = [netuid for netuid, found in results.items() if found is None]
+        if not missing:
+            return results
+
+        leading: List[int] = []
+        fan_out: Optional[asyncio.Future] = None
+
+        async def refresh_from_fan_out(netuid: int) -> DividendSnapshot:
+            nonlocal fan_out
+            if fan_out is not None:
+                # Became the leader after the shared scan started
+                return await self.refresh(netuid)
+            leading.append(netuid)
+            # Let the other subnets this call leads join the scan first
+            await asyncio.sleep(0)
+            if fan_out is None:
+                fan_out = asyncio.ensure_future(self.refresh_many(leading))
+            snapshot = (await asyncio.shield(fan_out))[netuid]
+            if isinstance(snapshot, Exception):
+                raise snapshot
+            return snapshot
+
+        refreshed = await asyncio.gather(
+            *(
+                self.singleflight.do(
+                    str(netuid),
+                    lambda netuid=netuid: refresh_from_fan_out(netuid),
+                    check=lambda netuid=netuid: self._read_fresh_cached_snapshot(netuid),
+                )
+                for netuid in missing
+            ),
+            return_exceptions=True,
+        )
+        for netuid, snapshot in zip(missing, refreshed):
+            results[netuid] = snapshot if isinstance(snapshot, Exception) else (snapshot, False)
+        return results
+
+    async def _fetch_block_snapshot(
+        self, netuid: int, block: Optional[int], block_hash: str
+    ) -> DividendSnapshot:
+        block, block_hash = await self._pin_block(block, block_hash)
+        logger.info(f"Reading dividend snapshot for netuid={netuid} at block {block}")
+        DIVIDEND_CHAIN_READS.labels(mode="scan").inc()
+        dividends = await self.bittensor_client.get_dividends_for_subnet(
+            netuid, block_hash=block_hash
+        )
+        snapshot = DividendSnapshot(
+            netuid=netuid,
+            dividends=dividends,
+            fetched_at=time.time(),
+            block=block,
+            block_hash=block_hash,
+        )
+        await self._write_cached_snapshot(
+            snapshot,
+            key=self.build_block_snapshot_key(netuid, block_hash),
+            ttl=settings.DIVIDEND_BLOCK_CACHE_TTL,
+        )
+        return snapshot
+
+    async def get_block_snapshot(
+        self, netuid: int, block: Optional[int] = None, block_hash: Optional[str] = None
+    ) -> Tuple[DividendSnapshot, bool]:
+        """
+        Get the dividend snapshot of a subnet as of a given block.
+
+        The state of a block never changes, so pinned snapshots are cached
+        under (netuid, block hash) without expiry checks; Redis only retains
+        them for DIVIDEND_BLOCK_CACHE_TTL to bound its memory.
+
+        Args:
+            netuid: The subnet ID
+            block: Block number, checked against the block hash if both are given
+            block_hash: Block hash
+
+        Returns:
+            Tuple[DividendSnapshot, bool]: The snapshot and whether it came from cache
+
+        Raises:
+            UnknownBlock: If the block does not exist or the block hash is malformed
+            BlockMismatch: If `block` is not the number of `block_hash`
+        """
+        expected_block = None
+        if block_hash is None:
+            block, block_hash = await self._pin_block(block)
+        else:
+            # The number of a given hash is read from chain, then checked against `block`
+            expected_block, block = block, None
+            if not BLOCK_HASH_PATTERN.fullmatch(block_hash):
+                raise UnknownBlock(f"Malformed block hash {block_hash}")
+        key = (netuid, block_hash)
+        snapshot = self._block_snapshots.get(key)
+        if snapshot is None:
+            snapshot = await self._read_cached_snapshot(
+                netuid, key=self.build_block_snapshot_key(netuid, block_hash)
+            )
+        if snapshot is not None:
+            DIVIDEND_BLOCK_SNAPSHOT_LOOKUPS.labels(result="hit").inc()
+            self._remember_block_snapshot(snapshot)
+            self._check_block(snapshot, expected_block)
+            return snapshot, True
+
+        DIVIDEND_BLOCK_SNAPSHOT_LOOKUPS.labels(result="miss").inc()
+        snapshot = await self.singleflight.do(
+            f"{netuid}@{block_hash}",
+            lambda: self._fetch_block_snapshot(netuid, block, block_hash),
+            check=lambda: self._read_cached_snapshot(
+                netuid, key=self.build_block_snapshot_key(netuid, block_hash)
+            ),
+        )
+        self._remember_block_snapshot(snapshot)
+        self._check_block(snapshot, expected_block)
+        return snapshot, False
+
+    @staticmethod
+    def _check_block(snapshot: DividendSnapshot, block: Optional[int]) -> None:
+        if block is not None and snapshot.block != block:
+            raise BlockMismatch(
+                f"Block hash {snapshot.block_hash} is block {snapshot.block}, not {block}"
+            )
+
+    def _prefers_point_query(self, netuid: int, hotkey: str) -> bool:
+        """
+        Record a hotkey request and tell whether its subnet is better read by point query.
+
+        Only the most recent `point_query_hotkeys + 1` distinct hotkeys of a
+        subnet are tracked, which is all the decision needs.
+        """
+        if not self.point_query_hotkeys:
+            return False
+        now = time.monotonic()
+        requested = self._requested_hotkeys.setdefault(netuid, OrderedDict())
+        requested[hotkey] = now
+        requested.move_to_end(hotkey)
+        cutoff = now - settings.DIVIDEND_POINT_QUERY_WINDOW
+        while requested and (
+            next(iter(requested.values())) < cutoff or len(requested) > self.point_query_hotkeys + 1
+        ):
+            requested.popitem(last=False)
+        return len(requested) <= self.point_query_hotkeys
+
+    async def _point_query(self, netuid: int, hotkey: str) -> DividendSnapshot:
+        block, block_hash = await self._pin_block()
+        logger.info(f"Point query of dividends for netuid={netuid}, hotkey={hotkey}")
+        DIVIDEND_CHAIN_READS.labels(mode="point").inc()
+        dividend = await self.bittensor_client.get_dividend(netuid, hotkey, block_hash=block_hash)
+        snapshot = DividendSnapshot(
+            netuid=netuid,
+            dividends={hotkey: dividend},
+            fetched_at=time.time(),
+            block=block,
+            block_hash=block_hash,
+        )
+        await self.cache_client.set(
+            self.build_point_key(netuid, hotkey), snapshot.model_dump(), ttl=self.ttl
+        )
+        return snapshot
+
+    async def _read_cached_point(self, netuid: int, hotkey: str) -> Optional[DividendSnapshot]:
+        data = await self.cache_client.get(self.build_point_key(netuid, hotkey))
+        return DividendSnapshot(**data) if data else None
+
+    async def get_hotkey_snapshot(self, netuid: int, hotkey: str) -> Tuple[DividendSnapshot, bool]:
+        """
+        Get a snapshot holding the dividend of one hotkey.
+
+        Served from the subnet snapshot when one is cached. Otherwise the
+        subnet is scanned, unless few of its hotkeys were requested recently;
+        then only the hotkey's storage entry is read, and the returned
+        snapshot holds that hotkey alone.
+
+        Returns:
+            Tuple[DividendSnapshot, bool]: The snapshot and whether it came from cache
+        """
+        point_query = self._prefers_point_query(netuid, hotkey)
+        found = await self._lookup(netuid)
+        if found is not None:
+            return found
+        if not point_query:
+            return await self._coalesced_refresh(netuid), False
+
+        snapshot = await self._read_cached_point(netuid, hotkey)
+        if snapshot is not None:
+            return snapshot, True
+        snapshot = await self.singleflight.do(
+            f"{netuid}:{hotkey}",
+            lambda: self._point_query(netuid, hotkey),
+            check=lambda: self._read_cached_point(netuid, hotkey),
+        )
+        return snapshot, False
+
+    async def get_dividend(self, netuid: int, hotkey: str) -> Tuple[float, bool]:
+        """
+        Get the dividend of one hotkey.
+
+        Returns:
+            Tuple[float, bool]: The dividend amount and whether it came from cache
+        """
+        snapshot, cached = await self.get_hotkey_snapshot(netuid, hotkey)
+        return snapshot.dividends.get(hotkey, 0.0), cached
+
+    def _sorted_keys(self, snapshot: DividendSnapshot, order: str) -> List[Tuple[float, str]]:
+        """Sort keys of a snapshot, computed once per snapshot and order."""
+        cached = self._sorted.get((snapshot.netuid, order))
+        if cached is not None and cached[0] == snapshot.fetched_at:
+            return cached[1]
+        sign = -1 if order == "desc" else 1
+        keys = sorted((sign * dividend, hotkey) for hotkey, dividend in snapshot.dividends.items())
+        self._sorted[(snapshot.netuid, order)] = (snapshot.fetched_at, keys)
+        return keys
+
+    def list_dividends(
+        self,
+        snapshot: DividendSnapshot,
+        order: str = "desc",
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Tuple[str, float]], Optional[str]]:
+        """
+        Page through the dividends of a snapshot, sorted by amount.
+
+        Ties are broken by hotkey. The cursor records the sort key of the last
+        returned hotkey, so pages stay consistent while the snapshot is
+        replaced underneath a client.
+
+        Args:
+            snapshot: The subnet snapshot to list
+            order: "desc" (largest first) or "asc"
+            limit: Maximum number of hotkeys to return, all if None
+            cursor: Cursor returned with the previous page
+
+        Returns:
+            Tuple[List[Tuple[str, float]], Optional[str]]: (hotkey, dividend) pairs and
+            the cursor of the next page, None on the last page
+
+        Raises:
+            InvalidCursor: If the cursor is malformed
+        """
+        keys = self._sorted_keys(snapshot, order)
+        start = 0
+        if cursor is not None:
+            position = decode_cursor(cursor)
+            try:
+                start = bisect.bisect_right(keys, (float(position["d"]), str(position["h"])))
+            except (KeyError, TypeError, ValueError) as e:
+                raise InvalidCursor(f"Invalid cursor: {cursor}") from e
+        end = len(keys) if limit is None else min(start + limit, len(keys))
+        sign = -1 if order == "desc" else 1
+        page = [(hotkey, sign * key) for key, hotkey in keys[start:end]]
+        next_cursor = None
+        if end < len(keys):
+            last_key, last_hotkey = keys[end - 1]
+            next_cursor = encode_cursor({"d": last_key, "h": last_hotkey})
+        return page, next_cursor
@@ -0,0 +1,227 @@
+"""
+Historical dividend time series persisted in MongoDB.
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Union
+from ..config import settings
+from ..clients.mongodb import MongoDBClient
+from ..models.dividend import DividendSnapshot
+
+logger = logging.getLogger(__name__)
+
+BUCKET_UNITS = ("minute", "hour", "day", "week", "month")
+# Seconds a block stays claimed when recording is not throttled
+BLOCK_CLAIM_TTL = 600
+
+
+class DividendHistory:
+    """
+    Record subnet dividend snapshots into a MongoDB time-series collection.
+
+    Each recorded snapshot becomes one measurement per hotkey, with
+    `{netuid, hotkey}` as time-series metadata so MongoDB buckets the points
+    of a hotkey together. History reads are served from MongoDB only and
+    never touch the chain.
+
+    Every API process refreshes and records the same subnets. With a Redis
+    client, a recording is first claimed with `SET NX PX` on a per-subnet key
+    held for `interval` (per block if `interval` is 0), so only one process
+    records each point.
+    """
+
+    def __init__(
+        self,
+        mongodb_client: MongoDBClient,
+        collection: Optional[str] = None,
+        interval: Optional[float] = None,
+        redis: Any = None,
+        claim_prefix: str = "dividend_history:claim",
+    ):
+        self.mongodb_client = mongodb_client
+        self.collection = collection or settings.DIVIDEND_HISTORY_COLLECTION
+        self.interval = interval if interval is not None else settings.DIVIDEND_HISTORY_INTERVAL
+        self.redis = redis
+        self.claim_prefix = claim_prefix
+        self._last_recorded: Dict[int, DividendSnapshot] = {}
+
+    async def ensure_collection(self) -> None:
+        """Create the time-series collection and its query indexes."""
+        await self.mongodb_client.create_timeseries_collection(
+            self.collection,
+            time_field="timestamp",
+            meta_field="meta",
+            granularity="minutes",
+            expire_after_seconds=settings.DIVIDEND_HISTORY_RETENTION,
+        )
+        await self.mongodb_client.create_index(
+            self.collection, [("meta.netuid", 1), ("meta.hotkey", 1), ("timestamp", 1)]
+        )
+        await self.mongodb_client.create_index(
+            self.collection, [("meta.netuid", 1), ("timestamp", 1)]
+        )
+
+    async def record(self, snapshot: DividendSnapshot) -> int:
+        """
+        Persist a snapshot unless its subnet was recorded less than `interval` ago.
+
+        Returns:
+            int: Number of measurements written
+        """
+        last = self._last_recorded.get(snapshot.netuid)
+        if last is not None and (
+            snapshot.fetched_at - last.fetched_at < self.interval
+            or (snapshot.block is not None and snapshot.block == last.block)
+        ):
+            return 0
+        claim_key = await self._claim(snapshot)
+        if claim_key is False:
+            return 0
+        timestamp = datetime.fromtimestamp(snapshot.fetched_at, tz=timezone.utc)
+        documents = [
+            {
+                "timestamp": timestamp,
+                "meta": {"netuid": snapshot.netuid, "hotkey": hotkey},
+                "dividend": float(dividend),
+                "block": snapshot.block,
+            }
+            for hotkey, dividend in snapshot.dividends.items()
+        ]
+        inserted = await self.mongodb_client.insert_many(self.collection, documents)
+        if inserted:
+            self._last_recorded[snapshot.netuid] = snapshot
+        elif claim_key is not None:
+            await self._release(claim_key)
+        return inserted
+
+    async def _claim(self, snapshot: DividendSnapshot) -> Union[str, bool, None]:
+        """
+        Claim the recording of a snapshot across processes.
+
+        Returns:
+            Union[str, bool, None]: The claimed key, False if another process
+            holds it, None if there is nothing to claim
+        """
+        if self.redis is None:
+            return None
+        if self.interval > 0:
+            key, ttl = f"{self.claim_prefix}:{snapshot.netuid}", self.interval
+        elif snapshot.block is not None:
+            key, ttl = f"{self.claim_prefix}:{snapshot.netuid}:{snapshot.block}", BLOCK_CLAIM_TTL
+        else:
+            return None
+        try:
+            claimed = await self.redis.set(key, 1, nx=True, px=max(int(ttl * 1000), 1))
+        except Exception as e:
+            # A duplicate point is better than a gap
+            logger.warning(f"Failed to claim dividend history key {key}: {str(e)}")
+            return None
+        return key if claimed else False
+
+    async def _release(self, key: str) -> None:
+        try:
+            await self.redis.delete(key)
+        except Exception as e:
+            logger.warning(f"Failed to release dividend history key {key}: {str(e)}")
+
+    @staticmethod
+    def _match(
+        netuid: int, hotkey: Optional[str], start: datetime, end: datetime
+    ) -> Dict[str, Any]:
+        match: Dict[str, Any] = {
+            "meta.netuid": netuid,
+            "timestamp": {"$gte": start, "$lt": end},
+        }
+        if hotkey is not None:
+            match["meta.hotkey"] = hotkey
+        return match
+
+    async def get_range(
+        self,
+        netuid: int,
+        start: datetime,
+        end: datetime,
+        hotkey: Optional[str] = None,
+        limit: int = 1000,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the recorded measurements of a subnet, or one of its hotkeys, in [start, end).
+
+        Returns:
+            List[Dict[str, Any]]: Points with timestamp, hotkey, dividend and block,
+            oldest first
+        """
+        pipeline = [
+            {"$match": self._match(netuid, hotkey, start, end)},
+            {"$sort": {"timestamp": 1}},
+            {"$limit": limit},
+            {
+                "$project": {
+                    "_id": 0,
+                    "timestamp": 1,
+                    "hotkey": "$meta.hotkey",
+                    "dividend": 1,
+                    "block": 1,
+                }
+            },
+        ]
+        return await self.mongodb_client.aggregate(self.collection, pipeline)
+
+    async def get_downsampled(
+        self,
+        netuid: int,
+        start: datetime,
+        end: datetime,
+        unit: str,
+        bin_size: int = 1,
+        hotkey: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get min/max/avg dividends per time bucket.
+
+        For a hotkey, its own measurements are aggregated. For a whole subnet,
+        the dividends of all hotkeys are first summed per recorded snapshot,
+        then the subnet totals are aggregated.
+
+        Args:
+            netuid: The subnet ID
+            start: Inclusive start of the range
+            end: Exclusive end of the range
+            unit: Bucket unit, one of BUCKET_UNITS
+            bin_size: Number of units per bucket
+            hotkey: Optional hotkey, the whole subnet if None
+
+        Returns:
+            List[Dict[str, Any]]: Buckets with timestamp, min, max, avg and count,
+            oldest first
+        """
+        pipeline: List[Dict[str, Any]] = [{"$match": self._match(netuid, hotkey, start, end)}]
+        if hotkey is None:
+            pipeline.append({"$group": {"_id": "$timestamp", "dividend": {"$sum": "$dividend"}}})
+            pipeline.append({"$project": {"timestamp": "$_id", "dividend": 1}})
+        pipeline += [
+            {
+                "$group": {
+                    "_id": {
+                        "$dateTrunc": {"date": "$timestamp", "unit": unit, "binSize": bin_size}
+                    },
+                    "min": {"$min": "$dividend"},
+                    "max": {"$max": "$dividend"},
+                    "avg": {"$avg": "$dividend"},
+                    "count": {"$sum": 1},
+                }
+            },
+            {"$sort": {"_id": 1}},
+            {
+                "$project": {
+                    "_id": 0,
+                    "timestamp": "$_id",
+                    "min": 1,
+                    "max": 1,
+                    "avg": 1,
+                    "count": 1,
+                }
+            },
+        ]
+        return await self.mongodb_client.aggregate(self.collection, pipeline)
@@ -0,0 +1,34 @@
+"""
+Opaque cursors for keyset pagination.
+"""
+
+import base64
+import json
+from typing import Any, Dict
+
+
+class InvalidCursor(ValueError):
+    """Raised when a client-supplied cursor cannot be decoded."""
+
+
+def encode_cursor(position: Dict[str, Any]) -> str:
+    """Encode the sort key of the last returned item as an opaque cursor."""
+    payload = json.dumps(position, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """
+    Decode a cursor produced by `encode_cursor`.
+
+    Raises:
+        InvalidCursor: If the cursor is malformed
+    """
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        position = json.loads(payload)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor}") from e
+    if not isinstance(position, dict):
+        raise InvalidCursor(f"Invalid cursor: {cursor}")
+    return position
@@ -0,0 +1,131 @@
+"""
+Background refresher keeping hot subnet dividend snapshots warm.
+"""
+
+import asyncio
+import logging
+from typing import Dict, List, Optional
+from prometheus_client import Counter, Gauge
+from ..config import settings
+from .dividends import DividendService
+from .history import DividendHistory
+
+logger = logging.getLogger(__name__)
+
+DIVIDEND_REFRESHES = Counter(
+    "dividend_refreshes_total",
+    "Total count of background snapshot refreshes by netuid and status.",
+    ["netuid", "status"],
+)
+DIVIDEND_SNAPSHOT_STALENESS_BLOCKS = Gauge(
+    "dividend_snapshot_staleness_blocks",
+    "Blocks between the chain head and the last refreshed snapshot, by netuid.",
+    ["netuid"],
+)
+
+
+class DividendRefresher:
+    """
+    Re-read `TaoDividendsPerSubnet` for hot subnets as new blocks arrive.
+
+    The chain head is polled every `poll_interval` seconds; once
+    `refresh_blocks` new blocks have been produced, all hot subnets are
+    scanned concurrently in one fan-out and their cached snapshots swapped
+    atomically. Requests for those
+    subnets are then always served from cache, at most `refresh_blocks`
+    blocks (plus one poll interval) behind the chain head. With a history
+    store, refreshed snapshots are also recorded as dividend history.
+    """
+
+    def __init__(
+        self,
+        dividend_service: DividendService,
+        netuids: Optional[List[int]] = None,
+        refresh_blocks: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        history: Optional[DividendHistory] = None,
+    ):
+        self.dividend_service = dividend_service
+        self.history = history
+        self.netuids = netuids if netuids is not None else settings.DIVIDEND_REFRESH_NETUIDS
+        self.refresh_blocks = refresh_blocks or settings.DIVIDEND_REFRESH_BLOCKS
+        self.poll_interval = poll_interval or settings.DIVIDEND_REFRESH_POLL_INTERVAL
+        self.last_refresh_block: Optional[int] = None
+        self._refreshed_blocks: Dict[int, int] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    async def _refresh_subnets(self, block: int) -> None:
+        snapshots = await self.dividend_service.refresh_many(self.netuids, block=block)
+        for netuid, snapshot in snapshots.items():
+            if isinstance(snapshot, Exception):
+                logger.error(
+                    f"Failed to refresh dividend snapshot for netuid={netuid}: {str(snapshot)}"
+                )
+                DIVIDEND_REFRESHES.labels(netuid=netuid, status="failed").inc()
+            else:
+                self._refreshed_blocks[netuid] = block
+                DIVIDEND_REFRESHES.labels(netuid=netuid, status="success").inc()
+        if self.history is not None:
+            await asyncio.gather(
+                *(
+                    self.history.record(snapshot)
+                    for snapshot in snapshots.values()
+                    if not isinstance(snapshot, Exception)
+                )
+            )
+
+    def _update_staleness(self, block: int) -> None:
+        for netuid in self.netuids:
+            refreshed_block = self._refreshed_blocks.get(netuid)
+            if refreshed_block is not None:
+                DIVIDEND_SNAPSHOT_STALENESS_BLOCKS.labels(netuid=netuid).set(
+                    block - refreshed_block
+                )
+
+    async def poll(self) -> bool:
+        """
+        Refresh the hot subnets if enough blocks were produced since the last refresh.
+
+        Returns:
+            bool: Whether a refresh was performed
+        """
+        block = await self.dividend_service.bittensor_client.get_current_block()
+        if (
+            self.last_refresh_block is not None
+            and block - self.last_refresh_block < self.refresh_blocks
+        ):
+            self._update_staleness(block)
+            return False
+
+        logger.debug(f"Refreshing dividend snapshots at block {block} for netuids={self.netuids}")
+        await self._refresh_subnets(block)
+        self.last_refresh_block = block
+        self._update_staleness(block)
+        return True
+
+    async def run(self) -> None:
+        logger.info(
+            f"Starting dividend refresher for netuids={self.netuids} "
+            f"every {self.refresh_blocks} block(s)"
+        )
+        while True:
+            try:
+                await self.poll()
+            except Exception as e:
+                logger.error(f"Dividend refresher poll failed: {str(e)}")
+            await asyncio.sleep(self.poll_interval)
+
+    def start(self) -> None:
+        """Run the refresher as a background task."""
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """Cancel the background task."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,116 @@
+"""
+Cached tweet search and sentiment scoring of subnets.
+"""
+
+import hashlib
+import logging
+import re
+from typing import List, Optional
+from prometheus_client import Counter
+from ..config import settings
+from ..clients.cache import CacheClient
+from ..clients.chutes import AsyncChutesClient
+from ..clients.desearch import AsyncDesearchClient
+from .singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+TWEETS_PREFIX = "api:sentiment_tweets"
+SCORE_PREFIX = "api:sentiment_score"
+TWEET_COUNT = 10
+
+SENTIMENT_CACHE_LOOKUPS = Counter(
+    "sentiment_cache_lookups_total",
+    "Total count of sentiment cache lookups by kind (tweets or score) and result (hit or miss).",
+    ["kind", "result"],
+)
+
+URL_PATTERN = re.compile(r"https?://\S+")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def fingerprint_tweets(tweets: List[str]) -> str:
+    """
+    Hash a set of tweets, ignoring order, duplicates, case, links and whitespace.
+
+    Tweets differing only in these score the same, so they share a cached score.
+    """
+    normalized = sorted(
+        {
+            WHITESPACE_PATTERN.sub(" ", URL_PATTERN.sub("", tweet)).strip().lower()
+            for tweet in tweets
+        }
+    )
+    return hashlib.sha256("\n".join(normalized).encode()).hexdigest()
+
+
+class SentimentService:
+    """
+    Score the sentiment of a subnet from its recent tweets.
+
+    The tweets of a subnet are cached for SENTIMENT_TWEETS_TTL, and the score
+    of a set of tweets for SENTIMENT_SCORE_TTL under its fingerprint, so
+    repeated triggers for a subnet skip both the search and the LLM call.
+    Concurrent misses in this process share one external call.
+    """
+
+    def __init__(
+        self,
+        desearch_client: AsyncDesearchClient,
+        chutes_client: AsyncChutesClient,
+        cache_client: CacheClient,
+        tweets_ttl: Optional[int] = None,
+        score_ttl: Optional[int] = None,
+    ):
+        self.desearch_client = desearch_client
+        self.chutes_client = chutes_client
+        self.cache_client = cache_client
+        self.tweets_ttl = tweets_ttl or settings.SENTIMENT_TWEETS_TTL
+        self.score_ttl = score_ttl or settings.SENTIMENT_SCORE_TTL
+        self.singleflight = SingleFlight("sentiment")
+
+    async def _search_tweets(self, netuid: int) -> List[str]:
+        tweets = await self.desearch_client.search_tweets(
+            f"Bittensor netuid {netuid}", count=TWEET_COUNT
+        )
+        await self.cache_client.set(
+            self.cache_client.build_cache_key(netuid, prefix=TWEETS_PREFIX),
+            tweets,
+            ttl=self.tweets_ttl,
+        )
+        return tweets
+
+    async def get_tweets(self, netuid: int) -> List[str]:
+        """Get the recent tweets about a subnet."""
+        tweets = await self.cache_client.get(
+            self.cache_client.build_cache_key(netuid, prefix=TWEETS_PREFIX)
+        )
+        SENTIMENT_CACHE_LOOKUPS.labels(
+            kind="tweets", result="hit" if tweets is not None else "miss"
+        ).inc()
+        if tweets is not None:
+            return tweets
+        return await self.singleflight.do(f"tweets:{netuid}", lambda: self._search_tweets(netuid))
+
+    async def _score_tweets(self, tweets: List[str], key: str) -> int:
+        score = await self.chutes_client.get_sentiment_score(tweets)
+        await self.cache_client.set(key, score, ttl=self.score_ttl)
+        return score
+
+    async def get_score(self, tweets: List[str]) -> int:
+        """Get the sentiment score of a set of tweets, between -100 and +100."""
+        fingerprint = fingerprint_tweets(tweets)
+        key = self.cache_client.build_cache_key(fingerprint, prefix=SCORE_PREFIX)
+        score = await self.cache_client.get(key)
+        SENTIMENT_CACHE_LOOKUPS.labels(
+            kind="score", result="hit" if score is not None else "miss"
+        ).inc()
+        if score is not None:
+            return score
+        return await self.singleflight.do(
+            f"score:{fingerprint}", lambda: self._score_tweets(tweets, key)
+        )
+
+    async def get_sentiment(self, netuid: int) -> int:
+        """Get the sentiment score of a subnet from its recent tweets."""
+        return await self.get_score(await self.get_tweets(netuid))
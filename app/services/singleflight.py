@@ -0,0 +1,157 @@
+"""
+Request coalescing so only one call per key is in flight at a time.
+"""
+
+import asyncio
+import time
+import uuid
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+from prometheus_client import Counter
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+SINGLEFLIGHT_REQUESTS = Counter(
+    "singleflight_requests_total",
+    "Total count of coalesced calls by group and role (leader, follower, remote_follower).",
+    ["group", "role"],
+)
+
+# Delete the lock only if it is still held by the caller's token
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key within this process.
+
+    The first caller (the leader) starts the call; callers arriving while it is
+    in flight (followers) await the same result instead of starting their own.
+    The shared call runs as a task, so a cancelled caller does not cancel it
+    for the others.
+    """
+
+    def __init__(self, group: str):
+        self.group = group
+        self._calls: Dict[str, asyncio.Future] = {}
+
+    def _forget(self, key: str, task: asyncio.Future) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+
+    async def do(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[T]],
+        check: Optional[Callable[[], Awaitable[Optional[T]]]] = None,
+    ) -> T:
+        """
+        Run `fn` once for all concurrent callers of `key` and share its result.
+
+        Args:
+            key: Coalescing key
+            fn: Coroutine factory performing the call
+            check: Optional coroutine factory returning an already available result
+                (unused in process, see RedisSingleFlight)
+
+        Returns:
+            The result of `fn`; exceptions are raised to every caller
+        """
+        task = self._calls.get(key)
+        if task is None:
+            SINGLEFLIGHT_REQUESTS.labels(group=self.group, role="leader").inc()
+            task = asyncio.ensure_future(self._run(key, fn, check))
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            SINGLEFLIGHT_REQUESTS.labels(group=self.group, role="follower").inc()
+        return await asyncio.shield(task)
+
+    async def _run(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[T]],
+        check: Optional[Callable[[], Awaitable[Optional[T]]]],
+    ) -> T:
+        return await fn()
+
+
+class RedisSingleFlight(SingleFlight):
+    """
+    Coalesce calls for the same key across worker processes.
+
+    Calls are first coalesced in process, then the local leader takes a Redis
+    lock (`SET NX PX`). If another worker already holds it, the local leader
+    polls `check` until that worker has published its result, and only falls
+    back to calling `fn` itself once the lock is released or times out.
+    """
+
+    def __init__(
+        self,
+        group: str,
+        redis: Any,
+        lock_ttl: float = 30,
+        poll_interval: float = 0.05,
+        prefix: str = "lock:singleflight",
+    ):
+        super().__init__(group)
+        self.redis = redis
+        self.lock_ttl = lock_ttl
+        self.poll_interval = poll_interval
+        self.prefix = prefix
+
+    def build_lock_key(self, key: str) -> str:
+        return f"{self.prefix}:{self.group}:{key}"
+
+    async def _acquire(self, lock_key: str, token: str) -> bool:
+        try:
+            acquired = await self.redis.set(lock_key, token, nx=True, px=int(self.lock_ttl * 1000))
+            return bool(acquired)
+        except Exception as e:
+            # Without Redis we can still coalesce in process
+            logger.warning(f"Failed to acquire single-flight lock {lock_key}: {str(e)}")
+            return True
+
+    async def _release(self, lock_key: str, token: str) -> None:
+        try:
+            await self.redis.eval(RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+        except Exception as e:
+            logger.warning(f"Failed to release single-flight lock {lock_key}: {str(e)}")
+
+    async def _run(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[T]],
+        check: Optional[Callable[[], Awaitable[Optional[T]]]],
+    ) -> T:
+        lock_key = self.build_lock_key(key)
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + self.lock_ttl
+        waited = False
+        while not await self._acquire(lock_key, token):
+            # Another worker is the leader: wait for its result
+            waited = True
+            result = await check() if check is not None else None
+            if result is not None:
+                SINGLEFLIGHT_REQUESTS.labels(group=self.group, role="remote_follower").inc()
+                return result
+            if time.monotonic() >= deadline:
+                logger.warning(f"Timed out waiting for single-flight lock {lock_key}")
+                return await fn()
+            await asyncio.sleep(self.poll_interval)
+        try:
+            # The previous leader may have published its result just before releasing
+            result = await check() if waited and check is not None else None
+            if result is not None:
+                SINGLEFLIGHT_REQUESTS.labels(group=self.group, role="remote_follower").inc()
+                return result
+            return await fn()
+        finally:
+            await self._release(lock_key, token)
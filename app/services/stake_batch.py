@@ -0,0 +1,205 @@
+"""
+Batched, netted execution of sentiment staking decisions.
+"""
+
+import datetime
+import logging
+import uuid
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from bittensor.utils.balance import rao, tao
+from prometheus_client import Counter
+from ..config import settings
+from ..clients.bittensor import BitTensorClient
+from ..clients.mongodb import MongoDBClient
+
+logger = logging.getLogger(__name__)
+
+RESULTS_COLLECTION = "sentiment_staking_results"
+QUEUED = "queued"
+BATCHING = "batching"
+SUBMITTING = "submitting"
+
+STAKE_BATCH_MOVES = Counter(
+    "stake_batch_moves_total",
+    "Total count of queued stake decisions by fate (submitted or netted out).",
+    ["fate"],
+)
+
+
+def net_moves(decisions: List[Dict[str, Any]]) -> Dict[Tuple[int, str], int]:
+    """
+    Sum the signed stake amounts of queued decisions per (netuid, hotkey), in rao.
+
+    Each amount is converted to rao before summing, so decisions that cancel
+    out net to exactly 0 rather than a float residue.
+    """
+    net: Dict[Tuple[int, str], int] = defaultdict(int)
+    for decision in decisions:
+        netuid = decision["netuid"]
+        net[(netuid, decision["hotkey"])] += tao(decision["stake_amount"] or 0, netuid).rao
+    return dict(net)
+
+
+class StakeBatcher:
+    """
+    Gather stake decisions over a window and execute them netted per (netuid, hotkey).
+
+    Tasks record their decision in `sentiment_staking_results` with status
+    "queued" and call `schedule`. The first decision of a window schedules one
+    flush `window` seconds later (`SET NX PX` on a Redis key). The flush claims
+    every queued decision ("batching"), nets them per pair, marks them
+    "submitting", submits the remaining moves as one extrinsic and records the
+    outcome on each task's result, along with the batch id and the pair's net
+    amount.
+
+    A flush failing before submission queues its decisions again. Decisions
+    left "batching" or "submitting" for `stale_after` seconds by a flush that
+    died are settled by the next flush: "batching" ones were never submitted
+    and are queued again, "submitting" ones may have been staked and fail
+    rather than risk staking twice.
+    """
+
+    def __init__(
+        self,
+        mongo_client: MongoDBClient,
+        bittensor_client: BitTensorClient,
+        redis: Any,
+        enqueue_flush: Callable[[float], None],
+        window: Optional[int] = None,
+        schedule_key: str = "stake_batch:scheduled",
+        stale_after: Optional[int] = None,
+    ):
+        self.mongo_client = mongo_client
+        self.bittensor_client = bittensor_client
+        self.redis = redis
+        self.enqueue_flush = enqueue_flush
+        self.window = settings.STAKE_BATCH_WINDOW if window is None else window
+        self.schedule_key = schedule_key
+        self.stale_after = stale_after or settings.STAKE_BATCH_STALE_AFTER
+
+    async def schedule(self) -> None:
+        """Schedule a flush at the end of the current window, unless one already is."""
+        try:
+            claimed = await self.redis.set(
+                self.schedule_key, 1, nx=True, px=max(int(self.window * 1000), 1)
+            )
+        except Exception as e:
+            # A redundant flush finds nothing to claim, a missing one strands decisions
+            logger.warning(f"Failed to claim stake batch schedule: {str(e)}")
+            claimed = True
+        if claimed:
+            self.enqueue_flush(self.window)
+
+    def reschedule(self, delay: float) -> None:
+        """
+        Schedule a flush `delay` seconds after a full window, even if one already is.
+
+        For a decision whose write is delayed, which the flush already scheduled
+        might run before.
+        """
+        self.enqueue_flush(self.window + delay)
+
+    async def recover(self) -> None:
+        """Settle the decisions of flushes interrupted more than `stale_after` seconds ago."""
+        now = datetime.datetime.utcnow()
+        stale = now - datetime.timedelta(seconds=self.stale_after)
+        requeued = await self.mongo_client.update_many(
+            RESULTS_COLLECTION,
+            {"status": BATCHING, "updated_at": {"$lt": stale}},
+            {"status": QUEUED, "batch_id": None, "updated_at": now},
+        )
+        failed = await self.mongo_client.update_many(
+            RESULTS_COLLECTION,
+            {"status": SUBMITTING, "updated_at": {"$lt": stale}},
+            {
+                "status": "failed",
+                "error": "Stake batch interrupted during submission",
+                "updated_at": now,
+            },
+        )
+        if requeued or failed:
+            logger.warning(
+                f"Recovered stale stake decisions: {requeued} queued again, {failed} failed"
+            )
+
+    async def flush(self, wallet: Any) -> Optional[str]:
+        """
+        Execute every queued decision.
+
+        Returns:
+            Optional[str]: The batch id, None if nothing was queued
+
+        Raises:
+            Exception: If the claimed decisions could not be read or marked for
+                submission; they are then queued again
+        """
+        await self.recover()
+        batch_id = uuid.uuid4().hex
+        # Claiming by batch id keeps concurrent flushes from executing a decision twice.
+        # Tasks guard their status writes on batch_id None, so a retried buffered write
+        # of a "queued" status landing after the claim does not apply.
+        claimed = await self.mongo_client.update_many(
+            RESULTS_COLLECTION,
+            {"status": QUEUED, "batch_id": None},
+            {"status": BATCHING, "batch_id": batch_id, "updated_at": datetime.datetime.utcnow()},
+        )
+        if not claimed:
+            return None
+        try:
+            # iter_find raises on errors, an empty read would strand the claimed decisions
+            decisions = [
+                decision
+                async for decision in self.mongo_client.iter_find(
+                    RESULTS_COLLECTION, {"batch_id": batch_id}
+                )
+            ]
+            net = net_moves(decisions)
+            # Past this point the decisions may be staked, so they are never queued again
+            submitting = await self.mongo_client.update_many(
+                RESULTS_COLLECTION,
+                {"batch_id": batch_id, "status": BATCHING},
+                {"status": SUBMITTING, "updated_at": datetime.datetime.utcnow()},
+            )
+            if submitting != len(decisions):
+                raise Exception(
+                    f"Marked {submitting} of {len(decisions)} decision(s) for submission"
+                )
+        except Exception as e:
+            logger.error(f"Stake batch {batch_id} failed before submission: {str(e)}")
+            await self.mongo_client.update_many(
+                RESULTS_COLLECTION,
+                {"batch_id": batch_id, "status": {"$in": [BATCHING, SUBMITTING]}},
+                {"status": QUEUED, "batch_id": None, "updated_at": datetime.datetime.utcnow()},
+            )
+            await self.schedule()
+            raise
+        moves = [
+            (netuid, hotkey, amount) for (netuid, hotkey), amount in net.items() if amount != 0
+        ]
+        STAKE_BATCH_MOVES.labels(fate="submitted").inc(len(moves))
+        STAKE_BATCH_MOVES.labels(fate="netted_out").inc(len(decisions) - len(moves))
+        logger.info(
+            f"Stake batch {batch_id}: {len(decisions)} decision(s) netted to {len(moves)} move(s)"
+        )
+
+        error = None
+        try:
+            success = await self.bittensor_client.submit_stake_batch(wallet, moves)
+        except Exception as e:
+            logger.error(f"Stake batch {batch_id} failed: {str(e)}")
+            success, error = False, str(e)
+
+        # Pairs netted to zero needed no extrinsic and succeed with the batch
+        for (netuid, hotkey), amount in net.items():
+            await self.mongo_client.update_many(
+                RESULTS_COLLECTION,
+                {"batch_id": batch_id, "netuid": netuid, "hotkey": hotkey},
+                {
+                    "status": "success" if success else "failed",
+                    "net_stake_amount": rao(amount, netuid).tao,
+                    "error": error,
+                    "updated_at": datetime.datetime.utcnow(),
+                },
+            )
+        return batch_id
@@ -0,0 +1,210 @@
+"""
+Filtered, keyset-paginated reads of sentiment staking results.
+"""
+
+import logging
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+from bson import ObjectId
+from bson.errors import InvalidId
+from ..clients.mongodb import MongoDBClient
+from ..models.sentiment_staking_result import SentimentStakingResult
+from .pagination import InvalidCursor, decode_cursor, encode_cursor
+
+logger = logging.getLogger(__name__)
+
+RESULTS_COLLECTION = "sentiment_staking_results"
+RESULT_FIELDS = tuple(SentimentStakingResult.model_fields)
+# Newest first; the unique _id breaks ties between results created at the same time
+SORT = [("created_at", -1), ("_id", -1)]
+STREAM_BATCH_SIZE = 500
+
+
+class InvalidFields(ValueError):
+    """Raised when a projection names fields results do not have."""
+
+
+class StakingResults:
+    """
+    Query sentiment staking results by netuid, hotkey, status and creation time.
+
+    Pages are keyset-paginated on `(created_at, _id)` rather than skipped
+    through. Unfiltered queries and queries filtered by both netuid and hotkey,
+    with or without a time range, are index range scans of the
+    `(created_at, _id)` or `(netuid, hotkey, created_at, _id)` index, so every
+    page costs the same however deep it is. Other filters (netuid or hotkey
+    alone, status) have no index in that order: MongoDB either walks the
+    `(created_at, _id)` index discarding non-matching results, or sorts the
+    matches in memory. Results without `created_at`, written before it was
+    always set, sort last.
+    """
+
+    def __init__(self, mongodb_client: MongoDBClient, collection: str = RESULTS_COLLECTION):
+        self.mongodb_client = mongodb_client
+        self.collection = collection
+
+    @staticmethod
+    def build_query(
+        netuid: Optional[int] = None,
+        hotkey: Optional[str] = None,
+        status: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Dict[str, Any]:
+        """Build the filter of results created in [start, end) matching the given fields."""
+        query: Dict[str, Any] = {}
+        if netuid is not None:
+            query["netuid"] = netuid
+        if hotkey is not None:
+            query["hotkey"] = hotkey
+        if status is not None:
+            query["status"] = status
+        if start is not None or end is not None:
+            created_at = query["created_at"] = {}
+            if start is not None:
+                created_at["$gte"] = start
+            if end is not None:
+                created_at["$lt"] = end
+        return query
+
+    @staticmethod
+    def build_projection(fields: Optional[Sequence[str]]) -> Optional[Dict[str, int]]:
+        """
+        Project results onto `fields`, plus the sort keys needed for the cursor.
+
+        Raises:
+            InvalidFields: If a field is not a result field
+        """
+        if not fields:
+            return None
+        unknown = sorted(set(fields) - set(RESULT_FIELDS))
+        if unknown:
+            raise InvalidFields(f"Unknown fields: {', '.join(unknown)}")
+        return {field: 1 for field in (*fields, "created_at")}
+
+    @staticmethod
+    def _cursor_position(doc: Dict[str, Any]) -> str:
+        created_at = doc.get("created_at")
+        return encode_cursor(
+            {
+                "created_at": created_at.isoformat() if created_at is not None else None,
+                "id": str(doc["_id"]),
+            }
+        )
+
+    @staticmethod
+    def _after(cursor: str) -> Dict[str, Any]:
+        """
+        Filter of the results sorting after the cursor.
+
+        Raises:
+            InvalidCursor: If the cursor is malformed
+        """
+        position = decode_cursor(cursor)
+        try:
+            last_id = ObjectId(position["id"])
+            created_at = position["created_at"]
+            created_at = datetime.fromisoformat(created_at) if created_at is not None else None
+        except (KeyError, TypeError, ValueError, InvalidId) as e:
+            raise InvalidCursor(f"Invalid cursor: {cursor}") from e
+        if created_at is None:
+            return {"created_at": None, "_id": {"$lt": last_id}}
+        return {
+            "$or": [
+                {"created_at": {"$lt": created_at}},
+                {"created_at": created_at, "_id": {"$lt": last_id}},
+                {"created_at": None},
+            ]
+        }
+
+    def _find(
+        self,
+        query: Dict[str, Any],
+        cursor: Optional[str],
+        projection: Optional[Dict[str, int]],
+        limit: Optional[int],
+        batch_size: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        if cursor:
+            query = {"$and": [query, self._after(cursor)]} if query else self._after(cursor)
+        return self.mongodb_client.iter_find(
+            self.collection,
+            query,
+            projection=projection,
+            sort=SORT,
+            limit=limit,
+            batch_size=batch_size,
+        )
+
+    @staticmethod
+    def _to_result(doc: Dict[str, Any], fields: Optional[Sequence[str]]) -> Dict[str, Any]:
+        # Drop the sort keys only projected for the cursor
+        doc.pop("_id", None)
+        if fields and "created_at" not in fields:
+            doc.pop("created_at", None)
+        return doc
+
+    async def list(
+        self,
+        query: Dict[str, Any],
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Get a page of results matching `query`, newest first.
+
+        Returns:
+            Tuple[List[Dict[str, Any]], Optional[str]]: The results, and the cursor of
+            the next page if there is one
+
+        Raises:
+            InvalidCursor: If the cursor is malformed
+            InvalidFields: If a projected field is not a result field
+        """
+        projection = self.build_projection(fields)
+        # One extra result tells whether another page follows
+        docs = [doc async for doc in self._find(query, cursor, projection, limit + 1)]
+        next_cursor = self._cursor_position(docs[limit - 1]) if len(docs) > limit else None
+        return [self._to_result(doc, fields) for doc in docs[:limit]], next_cursor
+
+    def stream(
+        self,
+        query: Dict[str, Any],
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream the results matching `query`, newest first, fetched in batches.
+
+        With a `limit` leaving more results, the last item is `{"next_cursor": ...}`
+        instead of a result. The cursor and fields are validated before the
+        stream starts.
+
+        Raises:
+            InvalidCursor: If the cursor is malformed
+            InvalidFields: If a projected field is not a result field
+        """
+        projection = self.build_projection(fields)
+        # One extra result tells whether another page follows
+        docs = self._find(
+            query, cursor, projection, limit + 1 if limit else None, batch_size=STREAM_BATCH_SIZE
+        )
+        return self._results(docs, fields, limit)
+
+    async def _results(
+        self,
+        docs: AsyncIterator[Dict[str, Any]],
+        fields: Optional[Sequence[str]],
+        limit: Optional[int],
+    ) -> AsyncIterator[Dict[str, Any]]:
+        count = 0
+        last = None
+        async for doc in docs:
+            if limit and count == limit:
+                yield {"next_cursor": self._cursor_position(last)}
+                break
+            count += 1
+            last = {"created_at": doc.get("created_at"), "_id": doc["_id"]}
+            yield self._to_result(doc, fields)
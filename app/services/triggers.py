@@ -0,0 +1,131 @@
+"""
+Debouncing of sentiment staking triggers per (netuid, hotkey).
+"""
+
+import logging
+from typing import Any, Callable, Optional
+from prometheus_client import Counter
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+ACCEPTED = "accepted"
+MERGED = "merged"
+SUPPRESSED = "suppressed"
+
+STAKING_TRIGGERS = Counter(
+    "sentiment_staking_triggers_total",
+    "Total count of sentiment staking triggers by outcome (accepted, merged, suppressed or failed).",
+    ["outcome"],
+)
+
+
+class StakingTriggers:
+    """
+    Debounce sentiment staking triggers across API workers with Redis keys.
+
+    The first trigger of a (netuid, hotkey) pair enqueues a task and opens a
+    window of `window` seconds (`SET NX PX`). Later triggers in the window are
+    either suppressed, or, in "coalesce" mode, merged into one trailing task
+    enqueued to run when the window closes, so the last trigger is still acted
+    on without a task per request.
+
+    Without Redis every trigger is accepted, as before debouncing.
+    """
+
+    def __init__(
+        self,
+        redis: Any,
+        enqueue: Callable[[int, str, Optional[float]], None],
+        window: Optional[int] = None,
+        mode: Optional[str] = None,
+        prefix: str = "api:stake_trigger",
+    ):
+        """
+        Args:
+            redis: Async Redis client
+            enqueue: Enqueues a task for (netuid, hotkey), delayed by the given
+                countdown in seconds if not None; raises if it cannot
+            window: Debounce window in seconds, defaults to settings.SENTIMENT_TRIGGER_WINDOW;
+                0 disables debouncing
+            mode: "suppress" or "coalesce", defaults to settings.SENTIMENT_TRIGGER_MODE
+        """
+        self.redis = redis
+        self.enqueue = enqueue
+        self.window = settings.SENTIMENT_TRIGGER_WINDOW if window is None else window
+        self.mode = mode or settings.SENTIMENT_TRIGGER_MODE
+        self.prefix = prefix
+
+    def build_key(self, netuid: int, hotkey: str, kind: str) -> str:
+        return f"{self.prefix}:{kind}:{netuid}:{hotkey}"
+
+    async def _claim(self, key: str, ttl: float) -> bool:
+        try:
+            return bool(await self.redis.set(key, 1, nx=True, px=max(int(ttl * 1000), 1)))
+        except Exception as e:
+            logger.warning(f"Failed to claim staking trigger key {key}: {str(e)}")
+            return True
+
+    async def _release(self, key: str) -> None:
+        try:
+            await self.redis.delete(key)
+        except Exception as e:
+            logger.warning(f"Failed to release staking trigger key {key}: {str(e)}")
+
+    async def _remaining(self, key: str) -> float:
+        try:
+            remaining = await self.redis.pttl(key)
+        except Exception as e:
+            logger.warning(f"Failed to read staking trigger window {key}: {str(e)}")
+            return 0
+        return max(remaining, 0) / 1000
+
+    async def _enqueue(
+        self, netuid: int, hotkey: str, key: Optional[str], countdown: Optional[float]
+    ) -> bool:
+        try:
+            self.enqueue(netuid, hotkey, countdown)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to enqueue sentiment-staking task: {str(e)}")
+            # Do not debounce triggers against a task that does not exist
+            if key is not None:
+                await self._release(key)
+            STAKING_TRIGGERS.labels(outcome="failed").inc()
+            return False
+
+    async def trigger(self, netuid: int, hotkey: str) -> Optional[str]:
+        """
+        Trigger sentiment staking for a (netuid, hotkey) pair.
+
+        Returns:
+            Optional[str]: "accepted" if a task was enqueued for this trigger,
+            "merged" if it was folded into a pending trailing task, "suppressed"
+            if it was dropped, or None if the task could not be enqueued
+        """
+        if self.window <= 0:
+            if not await self._enqueue(netuid, hotkey, None, None):
+                return None
+            STAKING_TRIGGERS.labels(outcome=ACCEPTED).inc()
+            return ACCEPTED
+
+        window_key = self.build_key(netuid, hotkey, "window")
+        if await self._claim(window_key, self.window):
+            if not await self._enqueue(netuid, hotkey, window_key, None):
+                return None
+            STAKING_TRIGGERS.labels(outcome=ACCEPTED).inc()
+            return ACCEPTED
+
+        if self.mode != "coalesce":
+            STAKING_TRIGGERS.labels(outcome=SUPPRESSED).inc()
+            return SUPPRESSED
+
+        # One trailing task per window, run when the window closes
+        # An unknown remaining window falls back to a full one, as the key is held that long
+        countdown = await self._remaining(window_key) or self.window
+        trailing_key = self.build_key(netuid, hotkey, "trailing")
+        if await self._claim(trailing_key, countdown):
+            if not await self._enqueue(netuid, hotkey, trailing_key, countdown):
+                return None
+        STAKING_TRIGGERS.labels(outcome=MERGED).inc()
+        return MERGED
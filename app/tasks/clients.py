@@ -0,0 +1,146 @@
+"""
+Clients shared by every task run in a Celery worker process.
+"""
+
+import asyncio
+import logging
+from typing import Any, Callable, Dict, Optional
+from celery.signals import worker_process_init, worker_process_shutdown
+from app.clients.bittensor import BitTensorClient
+from app.clients.cache import CacheClient
+from app.clients.chutes import AsyncChutesClient
+from app.clients.desearch import AsyncDesearchClient
+from app.clients.mongodb import MongoDBClient
+from app.clients.wallet import WalletClient
+from app.services.sentiment import SentimentService
+from .loop import WorkerLoop
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerClients:
+    """
+    Lazily built clients, reused across the tasks of one worker process.
+
+    Async clients (motor, AsyncSubtensor, httpx) are bound to the event loop
+    they first run on, so they are rebuilt when tasks start running on a
+    different loop. The wallet is not tied to a loop and is loaded once.
+    """
+
+    # Closed in this order, MongoDB first to flush its buffered writes
+    LOOP_BOUND = (
+        "mongo_client",
+        "bittensor_client",
+        "desearch_client",
+        "chutes_client",
+        "cache_client",
+        "sentiment_service",
+    )
+
+    def __init__(self):
+        self._clients: Dict[str, Any] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get(self, name: str, factory: Callable[[], Any]) -> Any:
+        client = self._clients.get(name)
+        if client is None:
+            client = self._clients[name] = factory()
+        return client
+
+    @property
+    def mongo_client(self) -> MongoDBClient:
+        return self._get("mongo_client", MongoDBClient)
+
+    @property
+    def bittensor_client(self) -> BitTensorClient:
+        # A worker process runs one task at a time, one connection serves it
+        return self._get("bittensor_client", lambda: BitTensorClient(pool_size=1))
+
+    @property
+    def wallet_client(self) -> WalletClient:
+        return self._get("wallet_client", WalletClient)
+
+    @property
+    def desearch_client(self) -> AsyncDesearchClient:
+        return self._get("desearch_client", AsyncDesearchClient)
+
+    @property
+    def chutes_client(self) -> AsyncChutesClient:
+        return self._get("chutes_client", AsyncChutesClient)
+
+    @property
+    def cache_client(self) -> CacheClient:
+        return self._get("cache_client", CacheClient)
+
+    @property
+    def sentiment_service(self) -> SentimentService:
+        return self._get(
+            "sentiment_service",
+            lambda: SentimentService(self.desearch_client, self.chutes_client, self.cache_client),
+        )
+
+    def bind(self) -> "WorkerClients":
+        """Make the async clients usable on the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            if self._loop is not None:
+                # Clients of the previous loop cannot be used, nor closed, from this one
+                for name in self.LOOP_BOUND:
+                    self._clients.pop(name, None)
+            self._loop = loop
+        return self
+
+    async def aclose(self) -> None:
+        """Close the async clients built so far."""
+        clients = {name: self._clients.pop(name, None) for name in self.LOOP_BOUND}
+        self._loop = None
+        for name, client in clients.items():
+            # The sentiment service holds no connections of its own
+            if client is None or name == "sentiment_service":
+                continue
+            try:
+                if name in ("bittensor_client", "cache_client"):
+                    await client.close()
+                else:
+                    await client.aclose()
+            except Exception as e:
+                logger.warning(f"Failed to close {name}: {str(e)}")
+
+
+worker_clients: Optional[WorkerClients] = None
+worker_loop: Optional[WorkerLoop] = None
+
+
+@worker_process_init.connect
+def init_worker_clients(**kwargs) -> None:
+    """Start the event loop and build the shared clients when a worker process starts."""
+    global worker_clients, worker_loop
+    worker_loop = WorkerLoop()
+    worker_loop.start()
+    worker_clients = WorkerClients()
+    # Load the wallet key files once instead of on the first task
+    worker_clients.wallet_client.get_wallet()
+
+    async def ensure_indexes() -> None:
+        await worker_clients.bind().mongo_client.ensure_indexes()
+
+    try:
+        worker_loop.run(ensure_indexes(), timeout=60)
+    except Exception as e:
+        logger.warning(f"Failed to create MongoDB indexes: {str(e)}")
+    logger.info("Initialized worker process event loop and clients")
+
+
+@worker_process_shutdown.connect
+def close_worker_clients(**kwargs) -> None:
+    """Close the shared clients on their loop, then stop it, when a worker process exits."""
+    global worker_clients, worker_loop
+    clients, worker_clients = worker_clients, None
+    loop, worker_loop = worker_loop, None
+    try:
+        if clients is not None and loop is not None:
+            loop.run(clients.aclose(), timeout=10)
+    except Exception as e:
+        logger.warning(f"Failed to close worker process clients: {str(e)}")
+    if loop is not None:
+        loop.stop()
@@ -0,0 +1,78 @@
+"""
+Event loop of a Celery worker process, running on a dedicated thread.
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Any, Coroutine, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class WorkerLoop:
+    """
+    An event loop running forever on a daemon thread.
+
+    Tasks submit coroutines to it and block on their result, so async
+    clients created on this loop stay connected across tasks. Coroutines of
+    concurrent tasks (e.g. with a thread pool) interleave on the one loop.
+    """
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name="worker-event-loop", daemon=True)
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    @property
+    def running(self) -> bool:
+        return self._thread.is_alive()
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+        """
+        Run a coroutine on the loop and wait for its result.
+
+        The coroutine is cancelled if the waiting thread is interrupted, e.g.
+        by a Celery time limit.
+
+        Raises:
+            RuntimeError: If called from the loop's own thread, which would deadlock
+        """
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("WorkerLoop.run cannot be called from the loop thread")
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            future.cancel()
+            raise
+
+    def stop(self, timeout: float = 10) -> None:
+        """Cancel pending tasks, stop the loop and wait for its thread."""
+        if not self.running:
+            return
+
+        async def cancel_pending() -> None:
+            current = asyncio.current_task()
+            pending = [task for task in asyncio.all_tasks() if task is not current]
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        try:
+            self.run(cancel_pending(), timeout)
+        except Exception as e:
+            logger.warning(f"Failed to cancel pending worker loop tasks: {str(e)}")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout)
+        if not self.running:
+            self.loop.close()
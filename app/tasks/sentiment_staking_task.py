@@ -1,12 +1,17 @@
 from .worker import celery_app
-from app.clients.chutes import ChutesClient
-from app.clients.desearch import DesearchClient
+from . import clients as worker_process
+from app.clients.chutes import AsyncChutesClient
+from app.clients.desearch import AsyncDesearchClient
 from app.clients.bittensor import BitTensorClient
+from app.clients.cache import CacheClient
 from app.clients.wallet import WalletClient
 import asyncio
 import logging
 from app.clients.mongodb import MongoDBClient
 from app.models.sentiment_staking_result import SentimentStakingResult
+from app.services.sentiment import SentimentService
+from app.services.stake_batch import QUEUED, StakeBatcher
+from app.config import settings
 import datetime
 from typing import Optional, Callable
 
@@ -16,22 +21,16 @@ logger = logging.getLogger(__name__)
 
 def run_async(coro):
     """
-    Utility function to run an async coroutine in a synchronous context.
-    Handles both cases: if already in an event loop (e.g., in Jupyter or Celery),
-    or if not (e.g., standard script execution).
+    Run an async coroutine from the synchronous Celery task and return its result.
+
+    Inside a worker process the coroutine runs on the persistent worker event
+    loop, so async clients stay connected across tasks. Elsewhere (e.g. eager
+    tasks or scripts) it runs on a fresh loop.
     """
-    try:
-        loop = asyncio.get_running_loop()
-    except RuntimeError:
-        loop = None
-    if loop and loop.is_running():
-        # If already in an event loop, create a new task and wait for it
-        import nest_asyncio
-
-        nest_asyncio.apply()
-        return asyncio.ensure_future(coro)
-    else:
-        return asyncio.run(coro)
+    loop = worker_process.worker_loop
+    if loop is not None and loop.running:
+        return loop.run(coro)
+    return asyncio.run(coro)
 
 
 async def sentiment_staking(
@@ -41,26 +40,31 @@ async def sentiment_staking(
     mongo_client: Optional[MongoDBClient] = None,
     bittensor_client: Optional[BitTensorClient] = None,
     wallet_client: Optional[WalletClient] = None,
-    desearch_client: Optional[DesearchClient] = None,
-    chutes_client: Optional[ChutesClient] = None,
+    desearch_client: Optional[AsyncDesearchClient] = None,
+    chutes_client: Optional[AsyncChutesClient] = None,
+    cache_client: Optional[CacheClient] = None,
     stake_amount_fn: Optional[Callable[[float], float]] = None,
 ):
     """
     Perform sentiment-based staking on the Tao network.
 
     Steps:
-    1. Persist a 'pending' result in MongoDB for tracking.
-    2. Fetch recent tweets related to the given netuid using DesearchClient.
-    3. Analyze the sentiment of those tweets using ChutesClient.
+    1. Persist a 'pending' result in MongoDB for tracking (buffered with
+       MONGODB_BULK_FLUSH_INTERVAL set).
+    2. Fetch recent tweets related to the given netuid using AsyncDesearchClient,
+       reusing the tweets cached by a recent task for the same netuid.
+    3. Analyze the sentiment of those tweets using AsyncChutesClient, reusing
+       the score cached for the same set of tweets.
     4. Decide how much TAO to stake or unstake based on the sentiment score.
-    5. Execute the stake/unstake operation using BitTensorClient and WalletClient.
+    5. Execute the stake/unstake operation using BitTensorClient and WalletClient,
+       or, with STAKE_BATCH_WINDOW set, queue it for a batched, netted execution.
     6. Update the MongoDB record with the result (success/failure, error info, etc).
 
     Args:
         netuid (int): The network UID to analyze and stake for.
         hotkey (str): The hotkey (wallet address) to use for staking.
         task_id (str): Unique identifier for this task (used for DB tracking).
-        mongo_client, bittensor_client, wallet_client, desearch_client, chutes_client: Optional dependency-injected clients for testability.
+        mongo_client, bittensor_client, wallet_client, desearch_client, chutes_client, cache_client: Optional dependency-injected clients for testability.
         stake_amount_fn (Callable): Optional function to determine stake amount from sentiment score.
 
     Returns:
@@ -68,17 +72,28 @@ async def sentiment_staking(
     """
     stake_amount = None
     result = None
-    # Use provided clients or default to real implementations
-    mongo_client = mongo_client or MongoDBClient()
-    bittensor_client = bittensor_client or BitTensorClient()
-    wallet_client = wallet_client or WalletClient()
-    desearch_client = desearch_client or DesearchClient()
-    chutes_client = chutes_client or ChutesClient()
+    # Use provided clients, else the worker process clients, else clients owned by this task
+    shared_clients = worker_process.worker_clients
+    task_clients = shared_clients.bind() if shared_clients else worker_process.WorkerClients()
+    mongo_client = mongo_client or task_clients.mongo_client
+    bittensor_client = bittensor_client or task_clients.bittensor_client
+    wallet_client = wallet_client or task_clients.wallet_client
+    if desearch_client or chutes_client or cache_client:
+        sentiment_service = SentimentService(
+            desearch_client or task_clients.desearch_client,
+            chutes_client or task_clients.chutes_client,
+            cache_client or task_clients.cache_client,
+        )
+    else:
+        sentiment_service = task_clients.sentiment_service
     stake_amount_fn = stake_amount_fn or (
         lambda sentiment_score: 0.1 * sentiment_score
     )  # Default: always stake 1 TAO
 
-    # Step 1: Insert a pending result for this task in MongoDB
+    # Step 1: Upsert a pending result for this task in MongoDB
+    # Buffered writes of this task's result are coalesced into one upsert. They only
+    # apply until a stake batch claims the decision, even if a retry lands later.
+    result_query = {"task_id": task_id, "batch_id": None}
     pending_doc = {
         "task_id": task_id,
         "status": "pending",
@@ -86,18 +101,22 @@ async def sentiment_staking(
         "hotkey": hotkey,
         "stake_amount": None,
         "error": None,
-        "created_at": datetime.datetime.utcnow(),
         "updated_at": datetime.datetime.utcnow(),
     }
-    await mongo_client.insert_one("sentiment_staking_results", pending_doc)
+    await mongo_client.upsert_one(
+        "sentiment_staking_results",
+        result_query,
+        pending_doc,
+        set_on_insert={"created_at": datetime.datetime.utcnow()},
+        buffered=True,
+    )
     try:
         # Step 2: Fetch tweets related to the netuid
-        tweets = desearch_client.search_tweets(f"Bittensor netuid {netuid}", count=10)
+        tweets = await sentiment_service.get_tweets(netuid)
         logger.info(f"Tweets: {tweets}")
 
         # Step 3: Analyze sentiment of the tweets
-        sentiment_score = chutes_client.get_sentiment_score(tweets)
-        chutes_client.close()
+        sentiment_score = await sentiment_service.get_score(tweets)
         logger.info(f"Sentiment score: {sentiment_score}")
 
         # Step 4: Decide how much to stake or unstake based on sentiment
@@ -105,7 +124,10 @@ async def sentiment_staking(
         logger.info(f"Stake amount: {stake_amount}")
         stake_unstake_success = False
         # Step 5: Stake or unstake TAO using BitTensorClient
-        if stake_amount > 0:
+        if settings.STAKE_BATCH_WINDOW > 0:
+            # Executed by execute_stake_batch_task, netted with the other queued decisions
+            status = QUEUED
+        elif stake_amount > 0:
             # Positive sentiment: stake TAO
             stake_unstake_success = await bittensor_client.stake(
                 wallet_client.get_wallet(), netuid, hotkey, stake_amount
@@ -117,11 +139,13 @@ async def sentiment_staking(
                 wallet_client.get_wallet(), netuid, hotkey, abs(stake_amount)
             )
             logger.info(f"Unstake success: {stake_unstake_success}")
+        if settings.STAKE_BATCH_WINDOW <= 0:
+            status = "success" if stake_unstake_success else "failed"
 
         # Prepare result document
         result = {
             "task_id": task_id,
-            "status": "success" if stake_unstake_success else "failed",
+            "status": status,
             "netuid": netuid,
             "hotkey": hotkey,
             "stake_amount": stake_amount,
@@ -142,18 +166,68 @@ async def sentiment_staking(
         }
     # Step 6: Update the MongoDB record with the final result
     try:
-        validated_doc = SentimentStakingResult(**result).model_dump()
-        await mongo_client.update_one(
-            "sentiment_staking_results", {"task_id": task_id}, validated_doc
+        # Only the fields of the result, so created_at and batch fields are kept
+        validated_doc = SentimentStakingResult(**result).model_dump(exclude_unset=True)
+        await mongo_client.upsert_one(
+            "sentiment_staking_results", result_query, validated_doc, buffered=True
         )
         logger.info(
             f"Updated sentiment staking result for task_id={task_id} with status {result['status']}"
         )
     except Exception as e:
         logger.error(f"Failed to update sentiment staking result for task_id={task_id}: {e}")
+    # Schedule the batch only once the decision is recorded for it to find
+    if result["status"] == QUEUED:
+        await mongo_client.flush()
+        stake_batcher = _stake_batcher(mongo_client, bittensor_client, task_clients)
+        if mongo_client.is_buffered("sentiment_staking_results", result_query):
+            # Retried by a later flush, which the scheduled batch could run before
+            logger.warning(f"Queued decision of task_id={task_id} not written yet")
+            stake_batcher.reschedule(mongo_client.flush_interval)
+        else:
+            await stake_batcher.schedule()
+    # Close the connections opened for this task only, worker clients stay open
+    if shared_clients is None:
+        await task_clients.aclose()
     return result
 
 
+def _stake_batcher(
+    mongo_client: MongoDBClient, bittensor_client: BitTensorClient, task_clients
+) -> StakeBatcher:
+    return StakeBatcher(
+        mongo_client,
+        bittensor_client,
+        task_clients.cache_client.redis,
+        lambda countdown: execute_stake_batch_task.apply_async(countdown=countdown),
+    )
+
+
+async def execute_stake_batch(
+    mongo_client: Optional[MongoDBClient] = None,
+    bittensor_client: Optional[BitTensorClient] = None,
+    wallet_client: Optional[WalletClient] = None,
+) -> Optional[str]:
+    """
+    Execute the queued stake decisions, netted per (netuid, hotkey), in one extrinsic.
+
+    Returns:
+        Optional[str]: The batch id, None if nothing was queued
+    """
+    shared_clients = worker_process.worker_clients
+    task_clients = shared_clients.bind() if shared_clients else worker_process.WorkerClients()
+    mongo_client = mongo_client or task_clients.mongo_client
+    bittensor_client = bittensor_client or task_clients.bittensor_client
+    wallet_client = wallet_client or task_clients.wallet_client
+    try:
+        return await _stake_batcher(mongo_client, bittensor_client, task_clients).flush(
+            wallet_client.get_wallet()
+        )
+    finally:
+        if shared_clients is None:
+            await task_clients.aclose()
+
+
 @celery_app.task(bind=True)
 def sentiment_staking_task(self, netuid: int, hotkey: str):
     """
@@ -162,3 +236,9 @@ def sentiment_staking_task(self, netuid: int, hotkey: str):
     """
     logger.info(f"sentiment_staking_task called with netuid={netuid}, hotkey={hotkey}")
     return run_async(sentiment_staking(netuid, hotkey, task_id=self.request.id))
+
+
+@celery_app.task
+def execute_stake_batch_task():
+    """Celery task entry point executing the stake decisions queued by sentiment_staking_task."""
+    return run_async(execute_stake_batch())
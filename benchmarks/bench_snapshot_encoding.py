@@ -0,0 +1,95 @@
+"""
+Compare encodings of a cached subnet snapshot.
+
+Measures encode/decode time and payload size of a synthetic snapshot for:
+
+- json-hash:  the `hash` layout, one JSON-encoded Redis hash field per hotkey
+- json:       the whole mapping as one JSON blob (the old `CacheClient.set` path)
+- msgpack:    the whole mapping as one msgpack blob
+- packed:     the `packed` layout, 32-byte account ids and u64 dividends
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_snapshot_encoding.py [--hotkeys 256] [--number 200]
+"""
+
+import argparse
+import os
+import random
+import time
+import timeit
+from bittensor.core.chain_data import decode_account_id
+from app.clients.serializers import JsonSerializer, MsgpackSerializer
+from app.models.dividend import DividendSnapshot
+from app.services.codec import pack_snapshot, unpack_snapshot
+
+
+def make_snapshot(hotkeys: int) -> DividendSnapshot:
+    dividends = {
+        decode_account_id(os.urandom(32)): random.randrange(0, 2**48) for _ in range(hotkeys)
+    }
+    return DividendSnapshot(
+        netuid=18,
+        dividends=dividends,
+        fetched_at=time.time(),
+        block=5_000_000,
+        block_hash="0x" + os.urandom(32).hex(),
+    )
+
+
+def mapping(snapshot: DividendSnapshot) -> dict:
+    return {
+        **snapshot.dividends,
+        "__fetched_at__": snapshot.fetched_at,
+        "__block__": snapshot.block,
+        "__block_hash__": snapshot.block_hash,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--hotkeys", type=int, default=256)
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    snapshot = make_snapshot(args.hotkeys)
+    json_serializer = JsonSerializer()
+    msgpack_serializer = MsgpackSerializer()
+    data = mapping(snapshot)
+
+    def hash_encode():
+        return {field: json_serializer.dumps(value) for field, value in data.items()}
+
+    def hash_decode(fields):
+        return {field: json_serializer.loads(value) for field, value in fields.items()}
+
+    encodings = {
+        "json-hash": (hash_encode, hash_decode),
+        "json": (lambda: json_serializer.dumps(data), json_serializer.loads),
+        "msgpack": (lambda: msgpack_serializer.dumps(data), msgpack_serializer.loads),
+        "packed": (lambda: pack_snapshot(snapshot), lambda b: unpack_snapshot(18, b)),
+    }
+
+    print(f"{args.hotkeys} hotkeys, best of 5 x {args.number} runs")
+    print(f"{'encoding':<10} {'bytes':>8} {'encode us':>10} {'decode us':>10}")
+    for name, (encode, decode) in encodings.items():
+        payload = encode()
+        if isinstance(payload, dict):
+            size = sum(len(field) + len(value) for field, value in payload.items())
+        else:
+            size = len(payload)
+        encode_time = min(timeit.repeat(encode, number=args.number, repeat=5)) / args.number
+        decode_time = (
+            min(
+                timeit.repeat(
+                    lambda decode=decode, payload=payload: decode(payload),
+                    number=args.number,
+                    repeat=5,
+                )
+            )
+            / args.number
+        )
+        print(f"{name:<10} {size:>8} {encode_time * 1e6:>10.1f} {decode_time * 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
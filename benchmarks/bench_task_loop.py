@@ -0,0 +1,102 @@
+"""
+Compare per-task event loops with the persistent worker event loop.
+
+Each simulated task makes the outbound HTTP calls of a staking task against
+a local keep-alive HTTP server:
+
+- asyncio.run:  a new event loop and a new httpx client per task, as
+                `run_async` did before the worker loop
+- new client:   tasks submitted to one `WorkerLoop`, with a new httpx client per task
+- worker loop:  tasks submitted to one `WorkerLoop`, reusing a pooled client
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_task_loop.py [--tasks 200] [--calls 3]
+"""
+
+import argparse
+import asyncio
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, List
+import httpx
+from app.tasks.loop import WorkerLoop
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+async def task(client: httpx.AsyncClient, url: str, calls: int) -> None:
+    for _ in range(calls):
+        (await client.get(url)).raise_for_status()
+
+
+def measure(run_task: Callable[[], None], tasks: int) -> List[float]:
+    latencies = []
+    for _ in range(tasks):
+        started = time.perf_counter()
+        run_task()
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def report(name: str, latencies: List[float]) -> None:
+    latencies = sorted(latencies)
+    p50 = statistics.median(latencies) * 1e3
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1e3
+    mean = statistics.fmean(latencies) * 1e3
+    print(f"{name:<12} {mean:>9.2f} {p50:>9.2f} {p99:>9.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=200)
+    parser.add_argument("--calls", type=int, default=3)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+
+    async def fresh_task() -> None:
+        async with httpx.AsyncClient() as client:
+            await task(client, url, args.calls)
+
+    per_task = measure(lambda: asyncio.run(fresh_task()), args.tasks)
+
+    worker_loop = WorkerLoop()
+    worker_loop.start()
+
+    async def build_client() -> httpx.AsyncClient:
+        return httpx.AsyncClient()
+
+    client = worker_loop.run(build_client())
+    persistent = measure(lambda: worker_loop.run(task(client, url, args.calls)), args.tasks)
+    fresh_client = measure(lambda: worker_loop.run(fresh_task()), args.tasks)
+    worker_loop.run(client.aclose())
+    worker_loop.stop()
+    server.shutdown()
+
+    print(f"{args.tasks} tasks of {args.calls} HTTP calls, latency per task in ms")
+    print(f"{'mode':<12} {'mean':>9} {'p50':>9} {'p99':>9}")
+    report("asyncio.run", per_task)
+    report("new client", fresh_client)
+    report("worker loop", persistent)
+
+
+if __name__ == "__main__":
+    main()
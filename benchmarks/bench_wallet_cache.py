@@ -0,0 +1,78 @@
+"""
+Compare building a WalletClient cold with the process-wide wallet cache.
+
+Each iteration builds a WalletClient and gets its unlocked coldkey, as a
+staking task does, against keyfiles in a temporary directory:
+
+- regenerate:  no keyfiles on disk, so they are derived from the mnemonic and
+               written, as on the first task of a fresh container
+- load:        keyfiles on disk, cache invalidated, as every task did before the cache
+- cached:      the wallet loaded and unlocked by an earlier client
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_wallet_cache.py [--iterations 200]
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from typing import Callable, List
+
+WALLET_DIR = tempfile.mkdtemp(prefix="bench-wallet-")
+os.environ.setdefault("BITTENSOR_WALLET_NAME", "bench")
+os.environ["BITTENSOR_WALLET_PATH"] = WALLET_DIR
+os.environ["BITTENSOR_WALLET_MNEMONIC"] = " ".join(["abandon"] * 11 + ["about"])
+
+from app.clients.wallet import WalletClient, wallets  # noqa: E402
+
+
+def measure(build: Callable[[], None], iterations: int, setup: Callable[[], None]) -> List[float]:
+    latencies = []
+    for _ in range(iterations):
+        setup()
+        started = time.perf_counter()
+        build()
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def report(name: str, latencies: List[float]) -> None:
+    latencies = sorted(latencies)
+    p50 = statistics.median(latencies) * 1e3
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1e3
+    mean = statistics.fmean(latencies) * 1e3
+    print(f"{name:<12} {mean:>9.3f} {p50:>9.3f} {p99:>9.3f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    def build() -> None:
+        # Loads the coldkey unless the wallet is cached and unlocked
+        _ = WalletClient().get_wallet().coldkey
+
+    def remove_keyfiles() -> None:
+        wallets.invalidate()
+        shutil.rmtree(WALLET_DIR, ignore_errors=True)
+
+    try:
+        regenerate = measure(build, args.iterations, remove_keyfiles)
+        load = measure(build, args.iterations, wallets.invalidate)
+        cached = measure(build, args.iterations, lambda: None)
+    finally:
+        shutil.rmtree(WALLET_DIR, ignore_errors=True)
+
+    print(f"{args.iterations} WalletClient builds, latency in ms")
+    print(f"{'mode':<12} {'mean':>9} {'p50':>9} {'p99':>9}")
+    report("regenerate", regenerate)
+    report("load", load)
+    report("cached", cached)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,12 @@
+import concurrent.futures
+import threading
 import pytest
 import asyncio
-from unittest.mock import AsyncMock, MagicMock
-from app.tasks.sentiment_staking_task import sentiment_staking
+from unittest.mock import AsyncMock, MagicMock, patch
+from app.tasks import clients as worker_process
+from app.tasks.clients import WorkerClients
+from app.tasks.loop import WorkerLoop
+from app.tasks.sentiment_staking_task import run_async, sentiment_staking
 
 
 @pytest.mark.asyncio
@@ -10,8 +15,8 @@ async def test_sentiment_staking_success():
     mock_mongo = AsyncMock()
     mock_bittensor = AsyncMock()
     mock_wallet = MagicMock()
-    mock_desearch = MagicMock()
-    mock_chutes = MagicMock()
+    mock_desearch = AsyncMock()
+    mock_chutes = AsyncMock()
 
     # Set up return values
     mock_desearch.search_tweets.return_value = ["tweet1", "tweet2"]
@@ -29,14 +34,14 @@ async def test_sentiment_staking_success():
         wallet_client=mock_wallet,
         desearch_client=mock_desearch,
         chutes_client=mock_chutes,
+        cache_client=mock_cache_client(),
         stake_amount_fn=lambda score: 1.5,  # Custom logic for test
     )
 
     # Assert
     assert result["status"] == "success"
     assert result["stake_amount"] == 1.5
-    mock_mongo.insert_one.assert_awaited()
-    mock_mongo.update_one.assert_awaited()
+    assert mock_mongo.upsert_one.await_count == 2
     mock_bittensor.stake.assert_awaited_with("mock_wallet", 1, "hotkey", 1.5)
 
 
@@ -46,8 +51,8 @@ async def test_sentiment_staking_failure_on_stake():
     mock_mongo = AsyncMock()
     mock_bittensor = AsyncMock()
     mock_wallet = MagicMock()
-    mock_desearch = MagicMock()
-    mock_chutes = MagicMock()
+    mock_desearch = AsyncMock()
+    mock_chutes = AsyncMock()
 
     # Set up return values
     mock_desearch.search_tweets.return_value = ["tweet1", "tweet2"]
@@ -65,13 +70,201 @@ async def test_sentiment_staking_failure_on_stake():
         wallet_client=mock_wallet,
         desearch_client=mock_desearch,
         chutes_client=mock_chutes,
+        cache_client=mock_cache_client(),
     )
 
     # Assert
     assert result["status"] == "failed"
-    mock_mongo.insert_one.assert_awaited()
-    mock_mongo.update_one.assert_awaited()
+    assert mock_mongo.upsert_one.await_count == 2
     mock_bittensor.stake.assert_awaited()
 
 
-# Add more tests for exceptions, unstake, etc.
+def mock_cache_client() -> AsyncMock:
+    cache_client = AsyncMock()
+    cache_client.get.return_value = None
+    cache_client.build_cache_key = MagicMock(return_value="key")
+    return cache_client
+
+
+def mock_worker_clients() -> WorkerClients:
+    clients = WorkerClients()
+    clients._clients = {
+        "mongo_client": AsyncMock(),
+        "bittensor_client": AsyncMock(),
+        "wallet_client": MagicMock(),
+        "desearch_client": AsyncMock(),
+        "chutes_client": AsyncMock(),
+        "cache_client": mock_cache_client(),
+    }
+    clients._clients["desearch_client"].search_tweets.return_value = ["tweet"]
+    clients._clients["chutes_client"].get_sentiment_score.return_value = 5
+    clients._clients["bittensor_client"].stake.return_value = True
+    clients._clients["mongo_client"].is_buffered = MagicMock(return_value=False)
+    return clients
+
+
+@pytest.mark.asyncio
+async def test_sentiment_staking_reuses_worker_clients():
+    clients = mock_worker_clients()
+    with patch.object(worker_process, "worker_clients", clients):
+        for task_id in ("task1", "task2"):
+            result = await sentiment_staking(netuid=1, hotkey="hotkey", task_id=task_id)
+            assert result["status"] == "success"
+    assert clients._clients["bittensor_client"].stake.await_count == 2
+    clients._clients["bittensor_client"].close.assert_not_awaited()
+    clients._clients["chutes_client"].aclose.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_sentiment_staking_closes_task_owned_clients():
+    clients = mock_worker_clients()
+    owned = dict(clients._clients)
+    with patch.object(worker_process, "WorkerClients", return_value=clients):
+        result = await sentiment_staking(netuid=1, hotkey="hotkey", task_id="task1")
+    assert result["status"] == "success"
+    owned["mongo_client"].aclose.assert_awaited_once()
+    owned["bittensor_client"].close.assert_awaited_once()
+    owned["desearch_client"].aclose.assert_awaited_once()
+    owned["chutes_client"].aclose.assert_awaited_once()
+    owned["cache_client"].close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_sentiment_staking_reuses_cached_sentiment():
+    clients = mock_worker_clients()
+    cached = {}
+    clients._clients["cache_client"].get.side_effect = lambda key: cached.get(key)
+    clients._clients["cache_client"].set.side_effect = lambda key, data, ttl=None: (
+        cached.__setitem__(key, data)
+    )
+    clients._clients["cache_client"].build_cache_key = lambda *args, prefix: f"{prefix}:{args}"
+    with patch.object(worker_process, "worker_clients", clients):
+        for task_id in ("task1", "task2"):
+            result = await sentiment_staking(netuid=1, hotkey="hotkey", task_id=task_id)
+            assert result["stake_amount"] == 0.5
+    clients._clients["desearch_client"].search_tweets.assert_awaited_once()
+    clients._clients["chutes_client"].get_sentiment_score.assert_awaited_once()
+    assert clients._clients["bittensor_client"].stake.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_sentiment_staking_queues_decision_when_batching():
+    clients = mock_worker_clients()
+    batcher = MagicMock(schedule=AsyncMock())
+    with (
+        patch.object(worker_process, "worker_clients", clients),
+        patch("app.tasks.sentiment_staking_task.settings.STAKE_BATCH_WINDOW", 5),
+        patch("app.tasks.sentiment_staking_task._stake_batcher", return_value=batcher),
+    ):
+        result = await sentiment_staking(netuid=1, hotkey="hotkey", task_id="task1")
+    assert result["status"] == "queued"
+    assert result["stake_amount"] == 0.5
+    clients._clients["bittensor_client"].stake.assert_not_awaited()
+    mongo_client = clients._clients["mongo_client"]
+    queued = mongo_client.upsert_one.await_args.args[2]
+    assert queued["status"] == "queued"
+    assert "created_at" not in queued
+    # A retried write must not reset the status of a decision a batch has claimed
+    assert mongo_client.upsert_one.await_args.args[1] == {"task_id": "task1", "batch_id": None}
+    mongo_client.flush.assert_awaited_once()
+    batcher.schedule.assert_awaited_once()
+    batcher.reschedule.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_sentiment_staking_reschedules_batch_after_unwritten_decision():
+    clients = mock_worker_clients()
+    mongo_client = clients._clients["mongo_client"]
+    mongo_client.is_buffered.return_value = True
+    mongo_client.flush_interval = 2
+    batcher = MagicMock(schedule=AsyncMock())
+    with (
+        patch.object(worker_process, "worker_clients", clients),
+        patch("app.tasks.sentiment_staking_task.settings.STAKE_BATCH_WINDOW", 5),
+        patch("app.tasks.sentiment_staking_task._stake_batcher", return_value=batcher),
+    ):
+        result = await sentiment_staking(netuid=1, hotkey="hotkey", task_id="task1")
+    assert result["status"] == "queued"
+    mongo_client.is_buffered.assert_called_once_with(
+        "sentiment_staking_results", {"task_id": "task1", "batch_id": None}
+    )
+    batcher.schedule.assert_not_awaited()
+    batcher.reschedule.assert_called_once_with(2)
+
+
+def test_worker_clients_rebuild_loop_bound_clients_on_new_loop():
+    clients = WorkerClients()
+    with (
+        patch("app.tasks.clients.MongoDBClient", side_effect=lambda: MagicMock()),
+        patch("app.tasks.clients.WalletClient", side_effect=lambda: MagicMock()),
+    ):
+
+        async def resolve():
+            bound = clients.bind()
+            return bound.mongo_client, bound.wallet_client
+
+        async def resolve_twice():
+            return await resolve(), await resolve()
+
+        first, again = asyncio.run(resolve_twice())
+        second = asyncio.run(resolve())
+    assert first == again
+    assert second[0] is not first[0]
+    assert second[1] is first[1]
+
+
+@pytest.fixture
+def worker_loop():
+    loop = WorkerLoop()
+    loop.start()
+    yield loop
+    loop.stop()
+
+
+def test_worker_loop_runs_coroutines_on_one_loop(worker_loop):
+    async def current_loop():
+        return asyncio.get_running_loop()
+
+    assert worker_loop.run(current_loop()) is worker_loop.loop
+    assert worker_loop.run(current_loop()) is worker_loop.loop
+
+
+def test_worker_loop_propagates_exceptions(worker_loop):
+    async def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        worker_loop.run(fail())
+
+
+def test_worker_loop_cancels_timed_out_coroutine(worker_loop):
+    cancelled = threading.Event()
+
+    async def hang():
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(concurrent.futures.TimeoutError):
+        worker_loop.run(hang(), timeout=0.05)
+    assert cancelled.wait(1)
+
+
+def test_worker_loop_stop_closes_loop():
+    loop = WorkerLoop()
+    loop.start()
+    loop.loop.call_soon_threadsafe(lambda: loop.loop.create_task(asyncio.sleep(60)))
+    loop.stop()
+    assert not loop.running
+    assert loop.loop.is_closed()
+
+
+def test_run_async_uses_worker_loop(worker_loop):
+    async def current_loop():
+        return asyncio.get_running_loop()
+
+    with patch.object(worker_process, "worker_loop", worker_loop):
+        assert run_async(current_loop()) is worker_loop.loop
+    assert run_async(current_loop()) is not worker_loop.loop
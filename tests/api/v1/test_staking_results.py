@@ -0,0 +1,124 @@
+import json
+import pytest
+import pytest_asyncio
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+from bson import ObjectId
+from httpx import ASGITransport, AsyncClient
+from app.main import app
+import app.api.v1.staking_results as staking_results_module
+from app.services.staking_results import StakingResults
+
+SECRET_KEY = "secret_key"
+
+app.dependency_overrides[staking_results_module.get_api_key] = lambda: SECRET_KEY
+
+
+@pytest_asyncio.fixture
+async def async_client():
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        yield ac
+
+
+@pytest.fixture
+def mock_mongodb_client():
+    client = MagicMock()
+    docs = [
+        {
+            "_id": ObjectId(f"{i:024x}"),
+            "task_id": f"task{i}",
+            "status": "success",
+            "netuid": 1,
+            "hotkey": "hk",
+            "stake_amount": 0.5,
+            "created_at": datetime(2026, 1, 1, 12, 0, i),
+        }
+        for i in range(3, 0, -1)
+    ]
+
+    def iter_find(collection, query, projection=None, sort=None, limit=None, batch_size=None):
+        async def results():
+            for doc in docs[:limit] if limit else docs:
+                yield dict(doc)
+
+        return results()
+
+    client.iter_find = MagicMock(side_effect=iter_find)
+    with patch.object(staking_results_module, "staking_results", StakingResults(client)):
+        yield client
+
+
+@pytest.mark.anyio
+async def test_list_staking_results_paginates(async_client, mock_mongodb_client):
+    response = await async_client.get(
+        "/api/v1/staking_results?netuid=1&hotkey=hk&status=success&limit=2",
+        headers={"X-API-Key": SECRET_KEY},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [r["task_id"] for r in data["results"]] == ["task3", "task2"]
+    assert data["results"][0]["created_at"] == "2026-01-01T12:00:03"
+    assert data["next_cursor"]
+    query = mock_mongodb_client.iter_find.call_args.args[1]
+    assert query == {"netuid": 1, "hotkey": "hk", "status": "success"}
+
+
+@pytest.mark.anyio
+async def test_list_staking_results_projects_fields(async_client, mock_mongodb_client):
+    response = await async_client.get(
+        "/api/v1/staking_results?fields=task_id,stake_amount",
+        headers={"X-API-Key": SECRET_KEY},
+    )
+    assert response.status_code == 200
+    assert mock_mongodb_client.iter_find.call_args.kwargs["projection"] == {
+        "task_id": 1,
+        "stake_amount": 1,
+        "created_at": 1,
+    }
+
+
+@pytest.mark.anyio
+async def test_list_staking_results_streams_ndjson(async_client, mock_mongodb_client):
+    response = await async_client.get(
+        "/api/v1/staking_results?format=ndjson", headers={"X-API-Key": SECRET_KEY}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["task_id"] for line in lines] == ["task3", "task2", "task1"]
+
+
+@pytest.mark.anyio
+async def test_list_staking_results_streams_ndjson_pages(async_client, mock_mongodb_client):
+    response = await async_client.get(
+        "/api/v1/staking_results?format=ndjson&limit=2", headers={"X-API-Key": SECRET_KEY}
+    )
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["task_id"] for line in lines[:-1]] == ["task3", "task2"]
+    next_cursor = lines[-1]["next_cursor"]
+    paged = await async_client.get(
+        "/api/v1/staking_results?limit=2", headers={"X-API-Key": SECRET_KEY}
+    )
+    assert next_cursor == paged.json()["next_cursor"]
+
+    # The last page has no cursor line
+    response = await async_client.get(
+        "/api/v1/staking_results?format=ndjson&limit=3", headers={"X-API-Key": SECRET_KEY}
+    )
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["task_id"] for line in lines] == ["task3", "task2", "task1"]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "params",
+    ["fields=password", "cursor=garbage", "start=2026-01-02T00:00:00&end=2026-01-01T00:00:00"],
+)
+async def test_list_staking_results_rejects_invalid_params(
+    async_client, mock_mongodb_client, params
+):
+    response = await async_client.get(
+        f"/api/v1/staking_results?{params}", headers={"X-API-Key": SECRET_KEY}
+    )
+    assert response.status_code == 400
+    mock_mongodb_client.iter_find.assert_not_called()
@@ -6,13 +6,19 @@ from unittest.mock import AsyncMock, patch, MagicMock
 from app.main import app
 from app.models.dividend import DividendResponse, ErrorResponse
 import app.api.v1.tao_dividends as tao_dividends_module
+from app.services.dividends import DividendService, FETCHED_AT_FIELD
+from app.services.triggers import StakingTriggers
 from httpx import ASGITransport, AsyncClient
 import asyncio
+import json
+import time
 
 # Constants for test
 TEST_NETUID = 42
 TEST_HOTKEY = "test_hotkey"
 TEST_DIVIDEND = 123.45
+TEST_BLOCK = 100
+TEST_BLOCK_HASH = "0x" + "ab" * 32
 SECRET_KEY = "secret_key"
 
 # Patch settings for test
@@ -32,90 +38,278 @@ async def async_client():
         yield ac
 
 
-@pytest.mark.anyio
-async def test_get_tao_dividends_cache_hit(async_client):
+@pytest.fixture
+def mock_clients():
+    """Run the endpoint against a real DividendService backed by mocked clients."""
+    mock_cache_client = MagicMock()
+    mock_bt_client = MagicMock()
+    mock_cache_client.build_cache_key.return_value = "cache:key"
+    mock_cache_client.set_hash = AsyncMock()
+    mock_bt_client.get_block_hash = AsyncMock(return_value=TEST_BLOCK_HASH)
+    mock_bt_client.get_block_number = AsyncMock(return_value=TEST_BLOCK)
+    mock_redis = AsyncMock()
+    mock_redis.set.return_value = True
     with (
-        patch.object(tao_dividends_module, "cache_client") as mock_cache_client,
-        patch.object(tao_dividends_module, "bittensor_client") as mock_bt_client,
+        patch.object(
+            tao_dividends_module,
+            "dividend_service",
+            DividendService(mock_bt_client, mock_cache_client, point_query_hotkeys=0),
+        ),
+        patch.object(
+            tao_dividends_module,
+            "staking_triggers",
+            StakingTriggers(mock_redis, tao_dividends_module._enqueue_sentiment_staking_task),
+        ),
     ):
-        mock_cache_client.build_cache_key.return_value = "cache:key"
-        mock_cache_client.get = AsyncMock(return_value=TEST_DIVIDEND)
-        mock_cache_client.set = AsyncMock()
-        mock_bt_client.get_dividend = AsyncMock()
+        yield mock_cache_client, mock_bt_client
 
-        response = await async_client.get(
-            f"/api/v1/tao_dividends?netuid={TEST_NETUID}&hotkey={TEST_HOTKEY}",
-            headers={"X-API-Key": SECRET_KEY},
-        )
-        assert response.status_code == 200
-        data = response.json()
-        assert data["netuid"] == TEST_NETUID
-        assert data["hotkey"] == TEST_HOTKEY
-        assert data["dividend"] == TEST_DIVIDEND
-        assert data["cached"] is True
-        assert data["stake_tx_triggered"] is False
-        mock_cache_client.get.assert_awaited_once()
-        mock_bt_client.get_dividend.assert_not_awaited()
+
+def cached_snapshot(dividends: dict) -> dict:
+    return {**dividends, FETCHED_AT_FIELD: time.time()}
 
 
 @pytest.mark.anyio
-async def test_get_tao_dividends_cache_miss(async_client):
-    with (
-        patch.object(tao_dividends_module, "cache_client") as mock_cache_client,
-        patch.object(tao_dividends_module, "bittensor_client") as mock_bt_client,
-    ):
-        mock_cache_client.build_cache_key.return_value = "cache:key"
-        mock_cache_client.get = AsyncMock(return_value=None)
-        mock_cache_client.set = AsyncMock()
-        mock_bt_client.get_dividend = AsyncMock(return_value=TEST_DIVIDEND)
+async def test_get_tao_dividends_cache_hit(async_client, mock_clients):
+    mock_cache_client, mock_bt_client = mock_clients
+    mock_cache_client.get_hash = AsyncMock(
+        return_value=cached_snapshot({TEST_HOTKEY: TEST_DIVIDEND})
+    )
+    mock_bt_client.get_dividends_for_subnet = AsyncMock()
+
+    response = await async_client.get(
+        f"/api/v1/tao_dividends?netuid={TEST_NETUID}&hotkey={TEST_HOTKEY}",
+        headers={"X-API-Key": SECRET_KEY},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["netuid"] == TEST_NETUID
+    assert data["hotkey"] == TEST_HOTKEY
+    assert data["dividend"] == TEST_DIVIDEND
+    assert data["cached"] is True
+    assert data["stake_tx_triggered"] is False
+    assert data["age"] >= 0
+    mock_cache_client.get_hash.assert_awaited_once()
+    mock_bt_client.get_dividends_for_subnet.assert_not_awaited()
+
+
+@pytest.mark.anyio
+async def test_get_tao_dividends_cache_miss(async_client, mock_clients):
+    mock_cache_client, mock_bt_client = mock_clients
+    mock_cache_client.get_hash = AsyncMock(return_value=None)
+    mock_bt_client.get_dividends_for_subnet = AsyncMock(return_value={TEST_HOTKEY: TEST_DIVIDEND})
+
+    response = await async_client.get(
+        f"/api/v1/tao_dividends?netuid={TEST_NETUID}&hotkey={TEST_HOTKEY}",
+        headers={"X-API-Key": SECRET_KEY},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["netuid"] == TEST_NETUID
+    assert data["hotkey"] == TEST_HOTKEY
+    assert data["dividend"] == TEST_DIVIDEND
+    assert data["cached"] is False
+    assert data["stake_tx_triggered"] is False
+    mock_cache_client.get_hash.assert_awaited_once()
+    mock_bt_client.get_dividends_for_subnet.assert_awaited_once_with(
+        TEST_NETUID, block_hash=TEST_BLOCK_HASH
+    )
+    mock_cache_client.set_hash.assert_awaited_once()
+
+
+@pytest.mark.anyio
+async def test_get_tao_dividends_cold_subnet_point_query(async_client, mock_clients):
+    mock_cache_client, mock_bt_client = mock_clients
+    tao_dividends_module.dividend_service.point_query_hotkeys = 4
+    mock_cache_client.get_hash = AsyncMock(return_value=None)
+    mock_cache_client.get = AsyncMock(return_value=None)
+    mock_cache_client.set = AsyncMock()
+    mock_bt_client.get_dividends_for_subnet = AsyncMock()
+    mock_bt_client.get_dividend = AsyncMock(return_value=TEST_DIVIDEND)
+
+    response = await async_client.get(
+        f"/api/v1/tao_dividends?netuid={TEST_NETUID}&hotkey={TEST_HOTKEY}",
+        headers={"X-API-Key": SECRET_KEY},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["dividend"] == TEST_DIVIDEND
+    assert data["cached"] is False
+    assert data["block_hash"] == TEST_BLOCK_HASH
+    mock_bt_client.get_dividend.assert_awaited_once_with(
+        TEST_NETUID, TEST_HOTKEY, block_hash=TEST_BLOCK_HASH
+    )
+    mock_bt_client.get_dividends_for_subnet.assert_not_awaited()
+
+
+@pytest.mark.anyio
+async def test_get_tao_dividends_snapshot_shared_across_hotkeys(async_client, mock_clients):
+    mock_cache_client, mock_bt_client = mock_clients
+    mock_cache_client.get_hash = AsyncMock(return_value=None)
+    mock_bt_client.get_dividends_for_subnet = AsyncMock(
+        return_value={TEST_HOTKEY: TEST_DIVIDEND, "other_hotkey": 7}
+    )
+
+    first = await async_client.get(
+        f"/api/v1/tao_dividends?netuid={TEST_NETUID}&hotkey={TEST_HOTKEY}",
+        headers={"X-API-Key": SECRET_KEY},
+    )
+    second = await async_client.get(
+        f"/api/v1/tao_dividends?netuid={TEST_NETUID}&hotkey=other_hotkey",
+        headers={"X-API-Key": SECRET_KEY},
+    )
+    assert first.json()["cached"] is False
+    assert second.json()["dividend"] == 7
+    assert second.json()["cached"] is True
+    mock_bt_client.get_dividends_for_subnet.assert_awaited_once_with(
+        TEST_NETUID, block_hash=TEST_BLOCK_HASH
+    )
+
+
+@pytest.mark.anyio
+async def test_get_tao_dividends_stale_while_revalidate(async_client, mock_clients):
+    mock_cache_client, mock_bt_client = mock_clients
+    tao_dividends_module.dividend_service.hard_ttl = 3600
+    mock_cache_client.get_hash = AsyncMock(
+        return_value={TEST_HOTKEY: TEST_DIVIDEND, FETCHED_AT_FIELD: time.time() - 600}
+    )
+    mock_bt_client.get_dividends_for_subnet = AsyncMock(return_value={TEST_HOTKEY: 1.0})
+
+    response = await async_client.get(
+        f"/api/v1/tao_dividends?netuid={TEST_NETUID}&hotkey={TEST_HOTKEY}",
+        headers={"X-API-Key": SECRET_KEY},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["dividend"] == TEST_DIVIDEND
+    assert data["cached"] is True
+    assert data["age"] >= 600
+    await asyncio.gather(*tao_dividends_module.dividend_service._revalidations.values())
+    mock_bt_client.get_dividends_for_subnet.assert_awaited_once_with(
+        TEST_NETUID, block_hash=TEST_BLOCK_HASH
+    )
+
+
+@pytest.mark.anyio
+async def test_get_tao_dividends_blockchain_error(async_client, mock_clients):
+    mock_cache_client, mock_bt_client = mock_clients
+    mock_cache_client.get_hash = AsyncMock(return_value=None)
+    mock_bt_client.get_dividends_for_subnet = AsyncMock(side_effect=Exception("blockchain error"))
+
+    response = await async_client.get(
+        f"/api/v1/tao_dividends?netuid={TEST_NETUID}&hotkey={TEST_HOTKEY}",
+        headers={"X-API-Key": SECRET_KEY},
+    )
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    data = response.json()
+    assert "Failed to query blockchain" in data["detail"]
+
+
+@pytest.mark.anyio
+async def test_get_tao_dividends_cache_error(async_client, mock_clients):
+    mock_cache_client, mock_bt_client = mock_clients
+    mock_cache_client.get_hash = AsyncMock(side_effect=Exception("cache error"))
+    mock_bt_client.get_dividends_for_subnet = AsyncMock(return_value={TEST_HOTKEY: TEST_DIVIDEND})
+
+    response = await async_client.get(
+        f"/api/v1/tao_dividends?netuid={TEST_NETUID}&hotkey={TEST_HOTKEY}",
+        headers={"X-API-Key": SECRET_KEY},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["netuid"] == TEST_NETUID
+    assert data["hotkey"] == TEST_HOTKEY
+    assert data["dividend"] == TEST_DIVIDEND
+    assert data["cached"] is False
+    assert data["stake_tx_triggered"] is False
+    mock_cache_client.get_hash.assert_awaited_once()
+    mock_bt_client.get_dividends_for_subnet.assert_awaited_once_with(
+        TEST_NETUID, block_hash=TEST_BLOCK_HASH
+    )
+    mock_cache_client.set_hash.assert_awaited_once()
+
+
+@pytest.mark.anyio
+async def test_get_tao_dividends_trade_triggers_task(async_client, mock_clients):
+    mock_cache_client, mock_bt_client = mock_clients
+    with patch.object(tao_dividends_module, "sentiment_staking_task") as mock_task:
+        mock_cache_client.get_hash = AsyncMock(
+            return_value=cached_snapshot({TEST_HOTKEY: TEST_DIVIDEND})
+        )
+        mock_bt_client.get_dividends_for_subnet = AsyncMock()
+        mock_task.delay = MagicMock()
 
         response = await async_client.get(
-            f"/api/v1/tao_dividends?netuid={TEST_NETUID}&hotkey={TEST_HOTKEY}",
+            f"/api/v1/tao_dividends?netuid={TEST_NETUID}&hotkey={TEST_HOTKEY}&trade=true",
             headers={"X-API-Key": SECRET_KEY},
         )
         assert response.status_code == 200
         data = response.json()
-        assert data["netuid"] == TEST_NETUID
-        assert data["hotkey"] == TEST_HOTKEY
-        assert data["dividend"] == TEST_DIVIDEND
-        assert data["cached"] is False
-        assert data["stake_tx_triggered"] is False
-        mock_cache_client.get.assert_awaited_once()
-        mock_bt_client.get_dividend.assert_awaited_once_with(TEST_NETUID, TEST_HOTKEY)
-        mock_cache_client.set.assert_awaited_once()
+        assert data["stake_tx_triggered"] is True
+        assert data["stake_tx_status"] == "accepted"
+        mock_task.delay.assert_called_once_with(TEST_NETUID, TEST_HOTKEY)
 
 
 @pytest.mark.anyio
-async def test_get_tao_dividends_blockchain_error(async_client):
+async def test_get_tao_dividends_trade_is_debounced(async_client, mock_clients):
+    mock_cache_client, mock_bt_client = mock_clients
+    mock_redis = AsyncMock()
+    mock_redis.set.side_effect = [True, None]
+    triggers = StakingTriggers(
+        mock_redis, tao_dividends_module._enqueue_sentiment_staking_task, window=60
+    )
     with (
-        patch.object(tao_dividends_module, "cache_client") as mock_cache_client,
-        patch.object(tao_dividends_module, "bittensor_client") as mock_bt_client,
+        patch.object(tao_dividends_module, "sentiment_staking_task") as mock_task,
+        patch.object(tao_dividends_module, "staking_triggers", triggers),
     ):
-        mock_cache_client.build_cache_key.return_value = "cache:key"
-        mock_cache_client.get = AsyncMock(return_value=None)
-        mock_cache_client.set = AsyncMock()
-        mock_bt_client.get_dividend = AsyncMock(side_effect=Exception("blockchain error"))
-
-        response = await async_client.get(
-            f"/api/v1/tao_dividends?netuid={TEST_NETUID}&hotkey={TEST_HOTKEY}",
-            headers={"X-API-Key": SECRET_KEY},
+        mock_cache_client.get_hash = AsyncMock(
+            return_value=cached_snapshot({TEST_HOTKEY: TEST_DIVIDEND})
         )
-        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
-        data = response.json()
-        assert "Failed to query blockchain" in data["detail"]
+        statuses = []
+        for _ in range(2):
+            response = await async_client.get(
+                f"/api/v1/tao_dividends?netuid={TEST_NETUID}&hotkey={TEST_HOTKEY}&trade=true",
+                headers={"X-API-Key": SECRET_KEY},
+            )
+            statuses.append(response.json()["stake_tx_status"])
+        assert statuses == ["accepted", "suppressed"]
+        mock_task.delay.assert_called_once_with(TEST_NETUID, TEST_HOTKEY)
 
 
 @pytest.mark.anyio
-async def test_get_tao_dividends_cache_error(async_client):
-    with (
-        patch.object(tao_dividends_module, "cache_client") as mock_cache_client,
-        patch.object(tao_dividends_module, "bittensor_client") as mock_bt_client,
-    ):
-        mock_cache_client.build_cache_key.return_value = "cache:key"
-        mock_cache_client.get = AsyncMock(side_effect=Exception("cache error"))
-        mock_cache_client.set = AsyncMock()
-        mock_bt_client.get_dividend = AsyncMock(return_value=TEST_DIVIDEND)
+async def test_get_tao_dividends_defaults(async_client, mock_clients):
+    # Test default netuid and hotkey from settings
+    from app.config import settings
+
+    mock_cache_client, mock_bt_client = mock_clients
+    mock_cache_client.get_hash = AsyncMock(
+        return_value=cached_snapshot({settings.DEFAULT_HOTKEY: TEST_DIVIDEND})
+    )
+    mock_bt_client.get_dividends_for_subnet = AsyncMock()
+
+    response = await async_client.get(
+        "/api/v1/tao_dividends",
+        headers={"X-API-Key": SECRET_KEY},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["netuid"] == settings.DEFAULT_NETUID
+    assert data["hotkey"] == settings.DEFAULT_HOTKEY
 
+
+@pytest.mark.anyio
+async def test_get_tao_dividends_concurrent(async_client, mock_clients):
+    """
+    Simulate many concurrent requests to the /api/v1/tao_dividends endpoint
+    to ensure the service can handle concurrent access.
+    """
+    mock_cache_client, mock_bt_client = mock_clients
+    mock_cache_client.get_hash = AsyncMock(
+        return_value=cached_snapshot({TEST_HOTKEY: TEST_DIVIDEND})
+    )
+    mock_bt_client.get_dividends_for_subnet = AsyncMock()
+
+    # Define a single request coroutine
+    async def make_request():
         response = await async_client.get(
             f"/api/v1/tao_dividends?netuid={TEST_NETUID}&hotkey={TEST_HOTKEY}",
             headers={"X-API-Key": SECRET_KEY},
@@ -125,93 +319,266 @@ async def test_get_tao_dividends_cache_error(async_client):
         assert data["netuid"] == TEST_NETUID
         assert data["hotkey"] == TEST_HOTKEY
         assert data["dividend"] == TEST_DIVIDEND
-        assert data["cached"] is False
+        assert data["cached"] is True
         assert data["stake_tx_triggered"] is False
-        mock_cache_client.get.assert_awaited_once()
-        mock_bt_client.get_dividend.assert_awaited_once_with(TEST_NETUID, TEST_HOTKEY)
-        mock_cache_client.set.assert_awaited_once()
+        return data
 
+    # Simulate 20 concurrent requests
+    results = await asyncio.gather(*(make_request() for _ in range(20)))
+    assert len(results) == 20
+    # Optionally, check that all results are identical
+    for result in results:
+        assert result["dividend"] == TEST_DIVIDEND
 
-@pytest.mark.anyio
-async def test_get_tao_dividends_trade_triggers_task(async_client):
-    with (
-        patch.object(tao_dividends_module, "cache_client") as mock_cache_client,
-        patch.object(tao_dividends_module, "bittensor_client") as mock_bt_client,
-        patch.object(tao_dividends_module, "sentiment_staking_task") as mock_task,
-    ):
-        mock_cache_client.build_cache_key.return_value = "cache:key"
-        mock_cache_client.get = AsyncMock(return_value=TEST_DIVIDEND)
-        mock_cache_client.set = AsyncMock()
-        mock_bt_client.get_dividend = AsyncMock()
-        mock_task.delay = MagicMock()
 
-        response = await async_client.get(
-            f"/api/v1/tao_dividends?netuid={TEST_NETUID}&hotkey={TEST_HOTKEY}&trade=true",
-            headers={"X-API-Key": SECRET_KEY},
+@pytest.mark.anyio
+async def test_get_tao_dividends_batch_scans_each_subnet_once(async_client, mock_clients):
+    mock_cache_client, mock_bt_client = mock_clients
+    mock_cache_client.get_hash = AsyncMock(return_value=None)
+    mock_bt_client.get_dividends_for_subnets = AsyncMock(
+        return_value=(
+            {
+                1: {TEST_HOTKEY: 1.0, "other_hotkey": 1.0},
+                2: {TEST_HOTKEY: 2.0, "other_hotkey": 1.0},
+            },
+            {},
         )
-        assert response.status_code == 200
-        data = response.json()
-        assert data["stake_tx_triggered"] is True
-        mock_task.delay.assert_called_once_with(TEST_NETUID, TEST_HOTKEY)
+    )
+
+    response = await async_client.post(
+        "/api/v1/tao_dividends/batch",
+        json={
+            "items": [
+                {"netuid": 1, "hotkey": TEST_HOTKEY},
+                {"netuid": 2, "hotkey": TEST_HOTKEY},
+                {"netuid": 1, "hotkey": "other_hotkey"},
+                {"netuid": 1, "hotkey": "missing_hotkey"},
+            ]
+        },
+        headers={"X-API-Key": SECRET_KEY},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [(r["netuid"], r["hotkey"], r["dividend"]) for r in data["results"]] == [
+        (1, TEST_HOTKEY, 1.0),
+        (2, TEST_HOTKEY, 2.0),
+        (1, "other_hotkey", 1.0),
+        (1, "missing_hotkey", 0.0),
+    ]
+    assert data["errors"] == []
+    mock_bt_client.get_dividends_for_subnets.assert_awaited_once_with(
+        [1, 2], block_hash=TEST_BLOCK_HASH
+    )
 
 
 @pytest.mark.anyio
-async def test_get_tao_dividends_defaults(async_client):
-    # Test default netuid and hotkey from settings
-    with (
-        patch.object(tao_dividends_module, "cache_client") as mock_cache_client,
-        patch.object(tao_dividends_module, "bittensor_client") as mock_bt_client,
-    ):
-        from app.config import settings
+async def test_get_tao_dividends_batch_reports_failed_subnets(async_client, mock_clients):
+    mock_cache_client, mock_bt_client = mock_clients
+    mock_cache_client.get_hash = AsyncMock(return_value=None)
+    mock_bt_client.get_dividends_for_subnets = AsyncMock(
+        return_value=({1: {TEST_HOTKEY: TEST_DIVIDEND}}, {2: Exception("blockchain error")})
+    )
+
+    response = await async_client.post(
+        "/api/v1/tao_dividends/batch",
+        json={
+            "items": [{"netuid": 1, "hotkey": TEST_HOTKEY}, {"netuid": 2, "hotkey": TEST_HOTKEY}]
+        },
+        headers={"X-API-Key": SECRET_KEY},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [r["netuid"] for r in data["results"]] == [1]
+    assert data["errors"][0]["netuid"] == 2
+    assert "Failed to query blockchain" in data["errors"][0]["detail"]
+
+
+@pytest.mark.anyio
+async def test_get_tao_dividends_batch_all_subnets_failed(async_client, mock_clients):
+    mock_cache_client, mock_bt_client = mock_clients
+    mock_cache_client.get_hash = AsyncMock(return_value=None)
+    mock_bt_client.get_dividends_for_subnets = AsyncMock(
+        return_value=({}, {1: Exception("blockchain error")})
+    )
+
+    response = await async_client.post(
+        "/api/v1/tao_dividends/batch",
+        json={"items": [{"netuid": 1, "hotkey": TEST_HOTKEY}]},
+        headers={"X-API-Key": SECRET_KEY},
+    )
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+
 
-        mock_cache_client.build_cache_key.return_value = "cache:key"
-        mock_cache_client.get = AsyncMock(return_value=TEST_DIVIDEND)
-        mock_cache_client.set = AsyncMock()
-        mock_bt_client.get_dividend = AsyncMock()
+@pytest.mark.anyio
+async def test_get_tao_dividends_batch_rejects_empty_batch(async_client, mock_clients):
+    response = await async_client.post(
+        "/api/v1/tao_dividends/batch",
+        json={"items": []},
+        headers={"X-API-Key": SECRET_KEY},
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.anyio
+async def test_list_subnet_dividends_paginates_by_amount(async_client, mock_clients):
+    mock_cache_client, mock_bt_client = mock_clients
+    mock_cache_client.get_hash = AsyncMock(
+        return_value=cached_snapshot({"hk_a": 1.0, "hk_b": 3.0, "hk_c": 2.0, "hk_d": 3.0})
+    )
+
+    first = await async_client.get(
+        f"/api/v1/subnets/{TEST_NETUID}/dividends?limit=3",
+        headers={"X-API-Key": SECRET_KEY},
+    )
+    assert first.status_code == 200
+    data = first.json()
+    assert data["netuid"] == TEST_NETUID
+    assert data["cached"] is True
+    assert [d["hotkey"] for d in data["dividends"]] == ["hk_b", "hk_d", "hk_c"]
+    assert data["next_cursor"]
+
+    second = await async_client.get(
+        f"/api/v1/subnets/{TEST_NETUID}/dividends?limit=3&cursor={data['next_cursor']}",
+        headers={"X-API-Key": SECRET_KEY},
+    )
+    assert second.json()["dividends"] == [{"hotkey": "hk_a", "dividend": 1.0}]
+    assert second.json()["next_cursor"] is None
+
+
+@pytest.mark.anyio
+async def test_list_subnet_dividends_streams_ndjson(async_client, mock_clients):
+    mock_cache_client, mock_bt_client = mock_clients
+    mock_cache_client.get_hash = AsyncMock(
+        return_value=cached_snapshot({"hk_a": 1.0, "hk_b": 3.0, "hk_c": 2.0})
+    )
 
+    response = await async_client.get(
+        f"/api/v1/subnets/{TEST_NETUID}/dividends?format=ndjson&order=asc",
+        headers={"X-API-Key": SECRET_KEY},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert response.headers["x-cached"] == "true"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["hotkey"] for line in lines] == ["hk_a", "hk_c", "hk_b"]
+    assert lines[0] == {"netuid": TEST_NETUID, "hotkey": "hk_a", "dividend": 1.0}
+
+
+@pytest.mark.anyio
+async def test_list_subnet_dividends_rejects_invalid_cursor(async_client, mock_clients):
+    mock_cache_client, mock_bt_client = mock_clients
+    mock_cache_client.get_hash = AsyncMock(return_value=cached_snapshot({"hk_a": 1.0}))
+
+    response = await async_client.get(
+        f"/api/v1/subnets/{TEST_NETUID}/dividends?cursor=not-a-cursor",
+        headers={"X-API-Key": SECRET_KEY},
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.anyio
+async def test_get_tao_dividends_pinned_block_is_cached(async_client, mock_clients):
+    mock_cache_client, mock_bt_client = mock_clients
+    mock_cache_client.get_hash = AsyncMock(return_value=None)
+    mock_bt_client.get_dividends_for_subnet = AsyncMock(return_value={TEST_HOTKEY: TEST_DIVIDEND})
+
+    first = await async_client.get(
+        f"/api/v1/tao_dividends?netuid={TEST_NETUID}&hotkey={TEST_HOTKEY}&block={TEST_BLOCK}",
+        headers={"X-API-Key": SECRET_KEY},
+    )
+    second = await async_client.get(
+        f"/api/v1/tao_dividends?netuid={TEST_NETUID}&hotkey={TEST_HOTKEY}"
+        f"&block_hash={TEST_BLOCK_HASH}",
+        headers={"X-API-Key": SECRET_KEY},
+    )
+    assert first.status_code == 200
+    assert first.json()["block"] == TEST_BLOCK
+    assert first.json()["block_hash"] == TEST_BLOCK_HASH
+    assert first.json()["cached"] is False
+    assert second.json()["dividend"] == TEST_DIVIDEND
+    assert second.json()["cached"] is True
+    mock_bt_client.get_block_hash.assert_awaited_once_with(TEST_BLOCK)
+    mock_bt_client.get_dividends_for_subnet.assert_awaited_once_with(
+        TEST_NETUID, block_hash=TEST_BLOCK_HASH
+    )
+
+
+@pytest.mark.anyio
+async def test_get_tao_dividends_unknown_block(async_client, mock_clients):
+    mock_cache_client, mock_bt_client = mock_clients
+    mock_bt_client.get_block_hash = AsyncMock(return_value=None)
+
+    response = await async_client.get(
+        f"/api/v1/tao_dividends?netuid={TEST_NETUID}&hotkey={TEST_HOTKEY}&block=999999999",
+        headers={"X-API-Key": SECRET_KEY},
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.anyio
+async def test_get_tao_dividends_block_hash_errors(async_client, mock_clients):
+    mock_cache_client, mock_bt_client = mock_clients
+    mock_cache_client.get_hash = AsyncMock(return_value=None)
+    mock_bt_client.get_dividends_for_subnet = AsyncMock(return_value={TEST_HOTKEY: TEST_DIVIDEND})
+    url = f"/api/v1/tao_dividends?netuid={TEST_NETUID}&hotkey={TEST_HOTKEY}"
+
+    malformed = await async_client.get(
+        f"{url}&block_hash=0xnothex", headers={"X-API-Key": SECRET_KEY}
+    )
+    mismatched = await async_client.get(
+        f"{url}&block={TEST_BLOCK + 1}&block_hash={TEST_BLOCK_HASH}",
+        headers={"X-API-Key": SECRET_KEY},
+    )
+    assert malformed.status_code == status.HTTP_404_NOT_FOUND
+    assert mismatched.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.anyio
+async def test_get_dividend_history_downsampled(async_client, mock_clients):
+    mock_cache_client, mock_bt_client = mock_clients
+    mock_history = MagicMock()
+    mock_history.get_downsampled = AsyncMock(
+        return_value=[
+            {"timestamp": "2025-01-01T00:00:00Z", "min": 1.0, "max": 3.0, "avg": 2.0, "count": 3}
+        ]
+    )
+    with patch.object(tao_dividends_module, "dividend_history", mock_history):
         response = await async_client.get(
-            "/api/v1/tao_dividends",
+            f"/api/v1/subnets/{TEST_NETUID}/dividends/history?hotkey={TEST_HOTKEY}"
+            "&start=2025-01-01T00:00:00&end=2025-01-02T00:00:00&bucket=hour",
             headers={"X-API-Key": SECRET_KEY},
         )
-        assert response.status_code == 200
-        data = response.json()
-        assert data["netuid"] == settings.DEFAULT_NETUID
-        assert data["hotkey"] == settings.DEFAULT_HOTKEY
+    assert response.status_code == 200
+    data = response.json()
+    assert data["buckets"][0]["avg"] == 2.0
+    assert data["points"] is None
+    args = mock_history.get_downsampled.await_args
+    assert args.args[1].tzinfo is not None
+    assert args.kwargs == {"unit": "hour", "bin_size": 1, "hotkey": TEST_HOTKEY}
+    mock_bt_client.get_dividends_for_subnet.assert_not_called()
 
 
 @pytest.mark.anyio
-async def test_get_tao_dividends_concurrent(async_client):
-    """
-    Simulate many concurrent requests to the /api/v1/tao_dividends endpoint
-    to ensure the service can handle concurrent access.
-    """
-    with (
-        patch.object(tao_dividends_module, "cache_client") as mock_cache_client,
-        patch.object(tao_dividends_module, "bittensor_client") as mock_bt_client,
-    ):
-        mock_cache_client.build_cache_key.return_value = "cache:key"
-        mock_cache_client.get = AsyncMock(return_value=TEST_DIVIDEND)
-        mock_cache_client.set = AsyncMock()
-        mock_bt_client.get_dividend = AsyncMock()
+async def test_get_dividend_history_raw_points(async_client, mock_clients):
+    mock_history = MagicMock()
+    mock_history.get_range = AsyncMock(
+        return_value=[{"timestamp": "2025-01-01T00:00:00Z", "hotkey": TEST_HOTKEY, "dividend": 1.0}]
+    )
+    with patch.object(tao_dividends_module, "dividend_history", mock_history):
+        response = await async_client.get(
+            f"/api/v1/subnets/{TEST_NETUID}/dividends/history?limit=10",
+            headers={"X-API-Key": SECRET_KEY},
+        )
+    assert response.status_code == 200
+    assert response.json()["points"][0]["hotkey"] == TEST_HOTKEY
+    assert mock_history.get_range.await_args.kwargs == {"hotkey": None, "limit": 10}
 
-        # Define a single request coroutine
-        async def make_request():
-            response = await async_client.get(
-                f"/api/v1/tao_dividends?netuid={TEST_NETUID}&hotkey={TEST_HOTKEY}",
-                headers={"X-API-Key": SECRET_KEY},
-            )
-            assert response.status_code == 200
-            data = response.json()
-            assert data["netuid"] == TEST_NETUID
-            assert data["hotkey"] == TEST_HOTKEY
-            assert data["dividend"] == TEST_DIVIDEND
-            assert data["cached"] is True
-            assert data["stake_tx_triggered"] is False
-            return data
-
-        # Simulate 20 concurrent requests
-        results = await asyncio.gather(*(make_request() for _ in range(20)))
-        assert len(results) == 20
-        # Optionally, check that all results are identical
-        for result in results:
-            assert result["dividend"] == TEST_DIVIDEND
+
+@pytest.mark.anyio
+async def test_get_dividend_history_rejects_empty_range(async_client, mock_clients):
+    response = await async_client.get(
+        f"/api/v1/subnets/{TEST_NETUID}/dividends/history"
+        "?start=2025-01-02T00:00:00Z&end=2025-01-01T00:00:00Z",
+        headers={"X-API-Key": SECRET_KEY},
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
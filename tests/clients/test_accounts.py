@@ -0,0 +1,67 @@
+import os
+import pytest
+from bittensor.core.chain_data import decode_account_id
+from app.clients.accounts import ACCOUNT_ID_CACHE_REQUESTS, AccountIdCache, account_id_bytes
+
+
+def requests(result: str) -> float:
+    return ACCOUNT_ID_CACHE_REQUESTS.labels(result=result)._value.get()
+
+
+def test_to_ss58_encodes_once():
+    cache = AccountIdCache(max_entries=10)
+    account_id = os.urandom(32)
+    misses = requests("miss")
+    assert cache.to_ss58(account_id) == decode_account_id(account_id)
+    assert cache.to_ss58(account_id) == decode_account_id(account_id)
+    assert requests("miss") == misses + 1
+
+
+def test_to_account_ids_round_trips():
+    cache = AccountIdCache(max_entries=10)
+    account_id = os.urandom(32)
+    ss58 = decode_account_id(account_id)
+    assert cache.to_account_ids([ss58]) == [account_id]
+    assert cache.to_ss58(account_id) == ss58
+
+
+def test_to_account_ids_rejects_invalid_address():
+    with pytest.raises(ValueError):
+        AccountIdCache(max_entries=10).to_account_ids(["not-an-address"])
+
+
+def test_cache_evicts_least_recently_used():
+    cache = AccountIdCache(max_entries=2)
+    a, b, c = (os.urandom(32) for _ in range(3))
+    cache.to_ss58(a)
+    cache.to_ss58(b)
+    cache.to_ss58(a)
+    cache.to_ss58(c)
+    assert len(cache) == 2
+    misses = requests("miss")
+    cache.to_ss58(a)
+    assert requests("miss") == misses
+    cache.to_ss58(b)
+    assert requests("miss") == misses + 1
+
+
+def test_subnet_index_survives_eviction():
+    cache = AccountIdCache(max_entries=1)
+    hotkeys = [os.urandom(32) for _ in range(3)]
+    index = cache.index_subnet(1, hotkeys)
+    assert index == {account_id: decode_account_id(account_id) for account_id in hotkeys}
+    misses = requests("miss")
+    assert cache.index_subnet(1, hotkeys) == index
+    assert requests("miss") == misses
+    # Decoding a packed snapshot of the subnet reads the index, not the evicted LRU entries
+    assert cache.to_ss58_many(hotkeys, netuid=1) == list(index.values())
+    assert requests("miss") == misses
+    assert cache.to_ss58_many(hotkeys[:1], netuid=2) == [index[hotkeys[0]]]
+    assert requests("miss") == misses + 1
+
+
+def test_account_id_bytes_normalizes_substrate_keys():
+    account_id = os.urandom(32)
+    assert account_id_bytes(account_id) == account_id
+    assert account_id_bytes((tuple(account_id),)) == account_id
+    assert account_id_bytes(list(account_id)) == account_id
@@ -1,62 +1,383 @@
+import asyncio
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
-from app.clients.bittensor import BitTensorClient
+from async_substrate_interface.errors import SubstrateRequestException
+from bittensor.core.chain_data import decode_account_id
+from app.clients.accounts import account_ids
+from app.clients.bittensor import BITTENSOR_POOL_CONNECTIONS, BitTensorClient
+
+
+def make_subtensor():
+    subtensor = MagicMock()
+    subtensor.initialize = AsyncMock()
+    subtensor.close = AsyncMock()
+    return subtensor
 
 
 @pytest.fixture
 def bittensor_client():
     with patch("app.clients.bittensor.AsyncSubtensor") as mock_subtensor:
-        mock_instance = MagicMock()
+        mock_instance = make_subtensor()
         mock_subtensor.return_value = mock_instance
-        client = BitTensorClient()
+        client = BitTensorClient(pool_size=1)
         client.subtensor = mock_instance
         yield client
 
 
+def pool_gauge(state: str) -> float:
+    return BITTENSOR_POOL_CONNECTIONS.labels(state=state)._value.get()
+
+
 @pytest.mark.asyncio
 async def test_get_dividends_for_subnet(bittensor_client):
-    mock_async_subtensor = MagicMock()
-    mock_result = [(b"key", MagicMock(value=42))]
+    account_id = bytes(range(32))
+    mock_result = [((tuple(account_id),), MagicMock(value=42))]
 
     async def async_iter():
         for k, v in mock_result:
             yield k, v
 
-    mock_async_subtensor.substrate.query_map = AsyncMock(
+    bittensor_client.subtensor.substrate.query_map = AsyncMock(
         return_value=MagicMock(__aiter__=lambda s: async_iter())
     )
-    bittensor_client.subtensor.__aenter__.return_value = mock_async_subtensor
-    with patch("app.clients.bittensor.decode_account_id", return_value="hotkey1"):
-        result = await bittensor_client.get_dividends_for_subnet(1)
-        assert result == {"hotkey1": 42}
+    result = await bittensor_client.get_dividends_for_subnet(1)
+    assert result == {decode_account_id(account_id): 42}
+    assert account_ids._subnets[1] == {account_id: decode_account_id(account_id)}
 
 
 @pytest.mark.asyncio
 async def test_get_dividend(bittensor_client):
-    with patch.object(
-        bittensor_client, "get_dividends_for_subnet", AsyncMock(return_value={"hk": 1.23})
+    bittensor_client.subtensor.substrate.query = AsyncMock(return_value=MagicMock(value=123))
+    bittensor_client.subtensor.substrate.query_map = AsyncMock()
+    assert await bittensor_client.get_dividend(1, "hk", block_hash="0xabc") == 123
+    bittensor_client.subtensor.substrate.query.assert_awaited_once_with(
+        module="SubtensorModule",
+        storage_function="TaoDividendsPerSubnet",
+        params=[1, "hk"],
+        block_hash="0xabc",
+    )
+    bittensor_client.subtensor.substrate.query_map.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_get_block_number_of_unknown_hash_is_none(bittensor_client):
+    bittensor_client.subtensor.substrate.get_block_number = AsyncMock(
+        side_effect=SubstrateRequestException("Invalid params")
+    )
+    assert await bittensor_client.get_block_number("0xbad") is None
+
+
+@pytest.mark.asyncio
+async def test_get_dividend_missing_entry_is_zero(bittensor_client):
+    bittensor_client.subtensor.substrate.query = AsyncMock(return_value=None)
+    assert await bittensor_client.get_dividend(1, "hk") == 0
+
+
+def mock_submission(bittensor_client, next_index=7, success=True):
+    """Mock composing, signing and submitting extrinsics on the pooled connection."""
+    substrate = bittensor_client.subtensor.substrate
+    substrate.compose_call = AsyncMock(side_effect=lambda **kwargs: kwargs)
+    substrate.rpc_request = AsyncMock(return_value={"result": next_index})
+    substrate.create_signed_extrinsic = AsyncMock(side_effect=lambda **kwargs: kwargs)
+    receipt = MagicMock()
+    receipt.is_success = asyncio.sleep(0, success)
+    receipt.error_message = asyncio.sleep(0, None if success else {"name": "NotEnoughStake"})
+    substrate.submit_extrinsic = AsyncMock(return_value=receipt)
+    return substrate
+
+
+@pytest.fixture
+def wallet():
+    wallet = MagicMock()
+    wallet.coldkey.ss58_address = "coldkey"
+    with patch("app.clients.bittensor.unlock_key", return_value=MagicMock(success=True)):
+        yield wallet
+
+
+@pytest.mark.asyncio
+async def test_stake_success(bittensor_client, wallet):
+    substrate = mock_submission(bittensor_client)
+    result = await bittensor_client.stake(wallet, 1, "hk", 5)
+    assert result is True
+    call = substrate.create_signed_extrinsic.await_args.kwargs["call"]
+    assert call["call_function"] == "add_stake"
+    assert call["call_params"] == {"hotkey": "hk", "netuid": 1, "amount_staked": 5_000_000_000}
+    assert substrate.create_signed_extrinsic.await_args.kwargs["nonce"] == 7
+
+
+@pytest.mark.asyncio
+async def test_unstake_success(bittensor_client, wallet):
+    substrate = mock_submission(bittensor_client)
+    result = await bittensor_client.unstake(wallet, 1, "hk", 5)
+    assert result is True
+    call = substrate.create_signed_extrinsic.await_args.kwargs["call"]
+    assert call["call_function"] == "remove_stake"
+    assert call["call_params"]["amount_unstaked"] == 5_000_000_000
+
+
+@pytest.mark.asyncio
+async def test_failed_dispatch_returns_false(bittensor_client, wallet):
+    mock_submission(bittensor_client, success=False)
+    assert await bittensor_client.stake(wallet, 1, "hk", 5) is False
+
+
+@pytest.mark.asyncio
+async def test_parallel_submissions_get_distinct_nonces(wallet):
+    with patch(
+        "app.clients.bittensor.AsyncSubtensor", side_effect=lambda **kwargs: make_subtensor()
     ):
-        val = await bittensor_client.get_dividend(1, "hk")
-        assert val == 1.23
+        client = BitTensorClient(pool_size=3)
+        await client.connect()
+    nonces = []
+    for subtensor in client._connections:
+        client.subtensor = subtensor
+        substrate = mock_submission(client)
+
+        async def submit(extrinsic, **kwargs):
+            nonces.append(extrinsic["nonce"])
+            await asyncio.sleep(0.01)
+            return MagicMock(is_success=asyncio.sleep(0, True))
+
+        substrate.submit_extrinsic = AsyncMock(side_effect=submit)
+    results = await asyncio.gather(*(client.stake(wallet, 1, "hk", 1) for _ in range(6)))
+    assert all(results)
+    assert sorted(nonces) == list(range(7, 13))
+    assert client.nonces.pending("coldkey") == 0
 
 
 @pytest.mark.asyncio
-async def test_stake_success(bittensor_client):
-    mock_wallet = MagicMock()
-    mock_async_subtensor = MagicMock()
-    mock_async_subtensor.add_stake = AsyncMock(return_value=True)
-    bittensor_client.subtensor.__aenter__.return_value = mock_async_subtensor
-    with patch("app.clients.bittensor.tao", return_value=10):
-        result = await bittensor_client.stake(mock_wallet, 1, "hk", 5)
-        assert result is True
+async def test_rejected_submission_resyncs_nonce(bittensor_client, wallet):
+    substrate = mock_submission(bittensor_client)
+    substrate.submit_extrinsic.side_effect = Exception("Inability to pay some fees")
+    with pytest.raises(Exception):
+        await bittensor_client.stake(wallet, 1, "hk", 5)
+    substrate.submit_extrinsic.assert_awaited_once()
+    substrate.submit_extrinsic.side_effect = None
+    substrate.rpc_request.return_value = {"result": 9}
+    await bittensor_client.stake(wallet, 1, "hk", 5)
+    assert substrate.rpc_request.await_count == 2
+    assert substrate.create_signed_extrinsic.await_args.kwargs["nonce"] == 9
+
+
+@pytest.mark.asyncio
+async def test_nonce_taken_by_another_process_is_resubmitted_once(bittensor_client, wallet):
+    substrate = mock_submission(bittensor_client)
+    receipt = substrate.submit_extrinsic.return_value
+    substrate.submit_extrinsic.side_effect = [
+        SubstrateRequestException({"code": 1014, "message": "Priority is too low: (7 vs 7)"}),
+        receipt,
+    ]
+    # Another process already has nonce 7 in the transaction pool
+    substrate.rpc_request.side_effect = [{"result": 7}, {"result": 8}]
+    assert await bittensor_client.stake(wallet, 1, "hk", 5) is True
+    nonces = [c.kwargs["nonce"] for c in substrate.create_signed_extrinsic.await_args_list]
+    assert nonces == [7, 8]
+    assert bittensor_client.nonces.pending("coldkey") == 0
+
+
+@pytest.mark.asyncio
+async def test_nonce_collision_is_resubmitted_only_once(bittensor_client, wallet):
+    substrate = mock_submission(bittensor_client)
+    substrate.submit_extrinsic.side_effect = Exception(
+        "Invalid Transaction: Transaction is outdated"
+    )
+    with pytest.raises(Exception, match="outdated"):
+        await bittensor_client.stake(wallet, 1, "hk", 5)
+    assert substrate.submit_extrinsic.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_submit_stake_batch_sends_one_batch_all(bittensor_client, wallet):
+    substrate = mock_submission(bittensor_client)
+    success = await bittensor_client.submit_stake_batch(
+        wallet, [(1, "hk1", 1_000_000_000), (2, "hk2", -500_000_000), (3, "hk3", 0)]
+    )
+    assert success is True
+    substrate.submit_extrinsic.assert_awaited_once()
+    batch = substrate.create_signed_extrinsic.await_args.kwargs["call"]
+    assert batch["call_module"] == "Utility"
+    assert batch["call_function"] == "batch_all"
+    calls = batch["call_params"]["calls"]
+    assert [call["call_function"] for call in calls] == ["add_stake", "remove_stake"]
+    assert calls[1]["call_params"]["amount_unstaked"] == 500_000_000
 
 
 @pytest.mark.asyncio
-async def test_unstake_success(bittensor_client):
-    mock_wallet = MagicMock()
-    mock_async_subtensor = MagicMock()
-    mock_async_subtensor.unstake = AsyncMock(return_value=True)
-    bittensor_client.subtensor.__aenter__.return_value = mock_async_subtensor
-    with patch("app.clients.bittensor.tao", return_value=10):
-        result = await bittensor_client.unstake(mock_wallet, 1, "hk", 5)
-        assert result is True
+async def test_submit_stake_batch_single_move_is_plain_stake(bittensor_client, wallet):
+    substrate = mock_submission(bittensor_client)
+    assert await bittensor_client.submit_stake_batch(wallet, [(1, "hk", -2_000_000_000)]) is True
+    call = substrate.create_signed_extrinsic.await_args.kwargs["call"]
+    assert call["call_function"] == "remove_stake"
+    assert call["call_params"]["amount_unstaked"] == 2_000_000_000
+    assert await bittensor_client.submit_stake_batch(wallet, [(1, "hk", 0)]) is True
+    substrate.submit_extrinsic.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_connection_is_reused_across_calls(bittensor_client):
+    fn = AsyncMock(return_value=1)
+    await bittensor_client._call(fn)
+    await bittensor_client._call(fn)
+    bittensor_client.subtensor.initialize.assert_awaited_once()
+    bittensor_client.subtensor.close.assert_not_awaited()
+    assert pool_gauge("idle") == 1
+    assert pool_gauge("in_use") == 0
+
+
+@pytest.mark.asyncio
+async def test_broken_connection_is_replaced_and_query_retried(bittensor_client):
+    fresh = make_subtensor()
+    fn = AsyncMock(side_effect=[ConnectionError("closed"), "ok"])
+    await bittensor_client.connect()
+    with patch("app.clients.bittensor.AsyncSubtensor", return_value=fresh):
+        assert await bittensor_client._call(fn) == "ok"
+    bittensor_client.subtensor.close.assert_awaited_once()
+    fresh.initialize.assert_awaited_once()
+    assert fn.await_args.args[0] is fresh
+    assert bittensor_client._pool.get_nowait() is fresh
+
+
+@pytest.mark.asyncio
+async def test_extrinsics_are_not_retried_after_reconnect(bittensor_client):
+    fn = AsyncMock(side_effect=ConnectionError("closed"))
+    with pytest.raises(ConnectionError):
+        await bittensor_client._call(fn, retry=False)
+    fn.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_health_check_reconnects_unresponsive_connection(bittensor_client):
+    fresh = make_subtensor()
+    await bittensor_client.connect()
+    bittensor_client.subtensor.substrate.get_chain_head = AsyncMock(side_effect=OSError("down"))
+    with patch("app.clients.bittensor.AsyncSubtensor", return_value=fresh):
+        assert await bittensor_client.health_check() == 0
+    assert bittensor_client._pool.get_nowait() is fresh
+
+
+@pytest.mark.asyncio
+async def test_failed_reconnect_leaves_empty_slot_reopened_on_next_call(bittensor_client):
+    fresh = make_subtensor()
+    await bittensor_client.connect()
+    fn = AsyncMock(side_effect=ConnectionError("closed"))
+    with patch("app.clients.bittensor.AsyncSubtensor", side_effect=OSError("node down")):
+        with pytest.raises(ConnectionError):
+            await bittensor_client._call(fn)
+    assert bittensor_client._connections == []
+    assert bittensor_client.connected
+    fn = AsyncMock(return_value="ok")
+    with patch("app.clients.bittensor.AsyncSubtensor", return_value=fresh):
+        assert await bittensor_client._call(fn) == "ok"
+    assert fn.await_args.args[0] is fresh
+    assert bittensor_client._connections == [fresh]
+    assert bittensor_client._pool.get_nowait() is fresh
+
+
+@pytest.mark.asyncio
+async def test_health_check_failed_reconnect_keeps_slot_empty(bittensor_client):
+    await bittensor_client.connect()
+    bittensor_client.subtensor.substrate.get_chain_head = AsyncMock(side_effect=OSError("down"))
+    with patch("app.clients.bittensor.AsyncSubtensor", side_effect=OSError("node down")):
+        assert await bittensor_client.health_check() == 0
+        assert await bittensor_client.health_check() == 0
+    assert bittensor_client._pool.get_nowait() is None
+
+
+@pytest.mark.asyncio
+async def test_close_closes_pooled_connections(bittensor_client):
+    await bittensor_client.connect()
+    await bittensor_client.close()
+    bittensor_client.subtensor.close.assert_awaited_once()
+    assert not bittensor_client.connected
+
+
+@pytest.mark.asyncio
+async def test_close_fails_callers_waiting_for_a_connection(bittensor_client):
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def hold(subtensor):
+        started.set()
+        await release.wait()
+        return "done"
+
+    holder = asyncio.create_task(bittensor_client._call(hold))
+    await started.wait()
+    waiters = [asyncio.create_task(bittensor_client._call(AsyncMock())) for _ in range(2)]
+    await asyncio.sleep(0)
+    await bittensor_client.close()
+    for waiter in waiters:
+        with pytest.raises(ConnectionError, match="closed"):
+            await asyncio.wait_for(waiter, 1)
+    release.set()
+    assert await holder == "done"
+    # The connection taken before close() is not put back, a new pool is opened on next use
+    fresh = make_subtensor()
+    with patch("app.clients.bittensor.AsyncSubtensor", return_value=fresh):
+        fn = AsyncMock(return_value="ok")
+        assert await bittensor_client._call(fn) == "ok"
+    assert fn.await_args.args[0] is bittensor_client.subtensor
+    assert bittensor_client._pool.qsize() == 1
+    assert pool_gauge("idle") == 1
+
+
+@pytest.mark.asyncio
+async def test_get_dividends_for_subnets_reports_partial_failures(bittensor_client):
+    async def query_dividends(async_subtensor, netuid, block_hash):
+        if netuid == 2:
+            raise ValueError("bad subnet")
+        if netuid == 3:
+            await asyncio.sleep(1)
+        return {"hk": netuid}
+
+    with patch.object(bittensor_client, "_query_dividends", side_effect=query_dividends):
+        results, errors = await bittensor_client.get_dividends_for_subnets(
+            [1, 2, 3, 1], concurrency=2, timeout=0.05
+        )
+    assert results == {1: {"hk": 1}}
+    assert isinstance(errors[2], ValueError)
+    assert isinstance(errors[3], TimeoutError)
+    bittensor_client.subtensor.initialize.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_get_dividends_for_subnets_bounds_concurrency(bittensor_client):
+    in_flight = 0
+    peak = 0
+
+    async def query_dividends(async_subtensor, netuid, block_hash):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return {}
+
+    with patch.object(bittensor_client, "_query_dividends", side_effect=query_dividends):
+        results, errors = await bittensor_client.get_dividends_for_subnets(range(10), concurrency=3)
+    assert len(results) == 10
+    assert errors == {}
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_get_dividends_for_subnets_retries_only_missing_after_reconnect(bittensor_client):
+    fresh = make_subtensor()
+    calls = []
+
+    async def query_dividends(async_subtensor, netuid, block_hash):
+        calls.append((async_subtensor, netuid))
+        if netuid == 2 and async_subtensor is not fresh:
+            raise ConnectionError("closed")
+        return {"hk": netuid}
+
+    await bittensor_client.connect()
+    with (
+        patch.object(bittensor_client, "_query_dividends", side_effect=query_dividends),
+        patch("app.clients.bittensor.AsyncSubtensor", return_value=fresh),
+    ):
+        results, errors = await bittensor_client.get_dividends_for_subnets([1, 2])
+    assert results == {1: {"hk": 1}, 2: {"hk": 2}}
+    assert errors == {}
+    assert calls[-1] == (fresh, 2)
+    assert len(calls) == 3
@@ -1,6 +1,8 @@
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
-from app.clients.cache import CacheClient
+import time
+from app.clients.cache import CacheClient, LocalCache
+from app.clients.serializers import MsgpackSerializer, get_serializer
 
 
 @pytest.fixture
@@ -23,7 +25,7 @@ def test_build_cache_key(cache_client):
 @pytest.mark.asyncio
 async def test_get_returns_value(cache_client):
     cache_client.redis.get = AsyncMock(return_value=b"123")
-    with patch("app.clients.cache.json.loads", return_value=123):
+    with patch("app.clients.serializers.json.loads", return_value=123):
         val = await cache_client.get("key")
         assert val == 123
 
@@ -38,6 +40,193 @@ async def test_get_returns_none_on_exception(cache_client):
 @pytest.mark.asyncio
 async def test_set_success(cache_client):
     cache_client.redis.setex = AsyncMock()
-    with patch("app.clients.cache.json.dumps", return_value="data"):
+    with patch("app.clients.serializers.json.dumps", return_value="data"):
         await cache_client.set("key", {"foo": "bar"})
         cache_client.redis.setex.assert_awaited()
+
+
+@pytest.mark.asyncio
+async def test_get_hash_decodes_fields(cache_client):
+    cache_client.redis.hgetall = AsyncMock(return_value={b"hk1": b"10", b"hk2": b"2.5"})
+    val = await cache_client.get_hash("key")
+    assert val == {"hk1": 10, "hk2": 2.5}
+
+
+@pytest.mark.asyncio
+async def test_get_hash_returns_none_when_missing(cache_client):
+    cache_client.redis.hgetall = AsyncMock(return_value={})
+    assert await cache_client.get_hash("key") is None
+
+
+@pytest.mark.asyncio
+async def test_set_hash_replaces_hash_atomically(cache_client):
+    pipe = MagicMock()
+    pipe.execute = AsyncMock()
+    cache_client.redis.pipeline.return_value.__aenter__ = AsyncMock(return_value=pipe)
+    cache_client.redis.pipeline.return_value.__aexit__ = AsyncMock(return_value=False)
+    await cache_client.set_hash("key", {"hk1": 10}, ttl=30)
+    cache_client.redis.pipeline.assert_called_once_with(transaction=True)
+    pipe.delete.assert_called_once_with("key")
+    pipe.hset.assert_called_once_with("key", mapping={"hk1": b"10"})
+    pipe.expire.assert_called_once_with("key", 30)
+    pipe.execute.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_touch_resets_ttl(cache_client):
+    cache_client.redis.expire = AsyncMock()
+    await cache_client.touch("key", ttl=30)
+    cache_client.redis.expire.assert_awaited_once_with("key", 30)
+
+
+def test_local_cache_evicts_least_recently_used():
+    local = LocalCache(max_entries=2, max_bytes=1024)
+    local.set("a", 1, ttl=60, size=1)
+    local.set("b", 2, ttl=60, size=1)
+    assert local.get("a") == (True, 1)
+    local.set("c", 3, ttl=60, size=1)
+    assert local.get("b") == (False, None)
+    assert local.get("a") == (True, 1)
+    assert local.get("c") == (True, 3)
+
+
+def test_local_cache_caps_total_size():
+    local = LocalCache(max_entries=10, max_bytes=10)
+    local.set("a", 1, ttl=60, size=6)
+    local.set("b", 2, ttl=60, size=6)
+    assert len(local) == 1
+    assert local.size == 6
+    local.set("huge", 3, ttl=60, size=11)
+    assert local.get("huge") == (False, None)
+
+
+def test_local_cache_expires_entries():
+    local = LocalCache(max_entries=10, max_bytes=1024)
+    local.set("a", 1, ttl=60, size=1)
+    with patch("app.clients.cache.time.monotonic", return_value=time.monotonic() + 61):
+        assert local.get("a") == (False, None)
+    assert len(local) == 0
+    assert local.size == 0
+
+
+class FakePipeline:
+    """Queue commands of the mocked Redis client and run them on execute."""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def __getattr__(self, name):
+        command = getattr(self.redis, name)
+        return lambda *args, **kwargs: self.commands.append(command(*args, **kwargs))
+
+    async def execute(self):
+        commands, self.commands = self.commands, []
+        return [await command for command in commands]
+
+
+@pytest.fixture
+def two_tier_cache_client(cache_client):
+    cache_client.local = LocalCache(max_entries=10, max_bytes=1024)
+    cache_client.redis.publish = AsyncMock()
+    cache_client.redis.pttl = AsyncMock(return_value=-1)
+    cache_client.redis.pipeline = MagicMock(
+        side_effect=lambda transaction=True: FakePipeline(cache_client.redis)
+    )
+    yield cache_client
+
+
+@pytest.mark.asyncio
+async def test_get_serves_repeated_reads_from_local_tier(two_tier_cache_client):
+    two_tier_cache_client.redis.get = AsyncMock(return_value=b'{"foo": 1}')
+    assert await two_tier_cache_client.get("key") == {"foo": 1}
+    assert await two_tier_cache_client.get("key") == {"foo": 1}
+    two_tier_cache_client.redis.get.assert_awaited_once_with("key")
+
+
+@pytest.mark.asyncio
+async def test_local_copy_expires_with_redis_key(two_tier_cache_client):
+    two_tier_cache_client.local_ttl = 60
+    two_tier_cache_client.redis.get = AsyncMock(return_value=b'{"foo": 1}')
+    two_tier_cache_client.redis.pttl = AsyncMock(return_value=2000)
+    assert await two_tier_cache_client.get("key") == {"foo": 1}
+    two_tier_cache_client.redis.pipeline.assert_called_once_with(transaction=False)
+    two_tier_cache_client.redis.pttl.assert_awaited_once_with("key")
+    with patch("app.clients.cache.time.monotonic", return_value=time.monotonic() + 3):
+        assert two_tier_cache_client.local.get("key") == (False, None)
+
+
+@pytest.mark.asyncio
+async def test_get_hash_serves_repeated_reads_from_local_tier(two_tier_cache_client):
+    two_tier_cache_client.redis.hgetall = AsyncMock(return_value={b"hk1": b"10"})
+    assert await two_tier_cache_client.get_hash("key") == {"hk1": 10}
+    assert await two_tier_cache_client.get_hash("key") == {"hk1": 10}
+    two_tier_cache_client.redis.hgetall.assert_awaited_once_with("key")
+
+
+@pytest.mark.asyncio
+async def test_set_updates_local_tier_and_publishes_invalidation(two_tier_cache_client):
+    two_tier_cache_client.redis.setex = AsyncMock()
+    two_tier_cache_client.redis.get = AsyncMock()
+    await two_tier_cache_client.set("key", {"foo": "bar"})
+    assert await two_tier_cache_client.get("key") == {"foo": "bar"}
+    two_tier_cache_client.redis.get.assert_not_awaited()
+    two_tier_cache_client.redis.publish.assert_awaited_once_with(
+        two_tier_cache_client.invalidation_channel,
+        f"{two_tier_cache_client.instance_id}:key",
+    )
+
+
+@pytest.mark.asyncio
+async def test_set_without_local_tier_does_not_publish(cache_client):
+    cache_client.redis.setex = AsyncMock()
+    cache_client.redis.publish = AsyncMock()
+    await cache_client.set("key", 1)
+    cache_client.redis.publish.assert_not_awaited()
+
+
+def test_invalidation_from_other_worker_drops_local_entry(two_tier_cache_client):
+    listener = MagicMock()
+    two_tier_cache_client.add_invalidation_listener(listener)
+    two_tier_cache_client.local.set("prefix:key", 1, ttl=60, size=1)
+    two_tier_cache_client._handle_invalidation(b"other-worker:prefix:key")
+    assert two_tier_cache_client.local.get("prefix:key") == (False, None)
+    listener.assert_called_once_with("prefix:key")
+
+
+def test_own_invalidation_is_ignored(two_tier_cache_client):
+    listener = MagicMock()
+    two_tier_cache_client.add_invalidation_listener(listener)
+    two_tier_cache_client.local.set("key", 1, ttl=60, size=1)
+    two_tier_cache_client._handle_invalidation(f"{two_tier_cache_client.instance_id}:key".encode())
+    assert two_tier_cache_client.local.get("key") == (True, 1)
+    listener.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_msgpack_serializer_round_trips_values(cache_client):
+    cache_client.serializer = MsgpackSerializer()
+    cache_client.redis.setex = AsyncMock()
+    await cache_client.set("key", {"hk1": 10, "hk2": 2.5})
+    payload = cache_client.redis.setex.await_args.args[2]
+    cache_client.redis.get = AsyncMock(return_value=payload)
+    assert await cache_client.get("key") == {"hk1": 10, "hk2": 2.5}
+
+
+def test_get_serializer_rejects_unknown_name():
+    with pytest.raises(ValueError):
+        get_serializer("pickle")
+
+
+@pytest.mark.asyncio
+async def test_get_bytes_returns_raw_value(two_tier_cache_client):
+    two_tier_cache_client.redis.get = AsyncMock(return_value=b"\x00\x01")
+    assert await two_tier_cache_client.get_bytes("key") == b"\x00\x01"
+    assert await two_tier_cache_client.get_bytes("key") == b"\x00\x01"
+    two_tier_cache_client.redis.get.assert_awaited_once_with("key")
@@ -1,6 +1,9 @@
+import json
+import httpx
 import pytest
-from unittest.mock import MagicMock, patch
-from app.clients.chutes import ChutesClient
+from unittest.mock import AsyncMock, MagicMock, patch
+from app.clients.chutes import CHUTES_API_URL, AsyncChutesClient, ChutesClient
+from app.config import settings
 
 
 @pytest.fixture
@@ -43,3 +46,77 @@ def test_get_sentiment_score(chutes_client):
     with patch.object(client, "_chat_completions", return_value="10"):
         score = client.get_sentiment_score(["tweet1", "tweet2"])
         assert score == 10
+
+
+def async_chutes_client(handler) -> AsyncChutesClient:
+    return AsyncChutesClient(
+        api_token="token", client=httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+
+
+@pytest.mark.asyncio
+async def test_async_get_sentiment_score():
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert str(request.url) == CHUTES_API_URL
+        assert request.headers["Authorization"] == "Bearer token"
+        assert "tweet1\ntweet2" in json.loads(request.content)["messages"][0]["content"]
+        return httpx.Response(200, json={"choices": [{"message": {"content": " 42 "}}]})
+
+    client = async_chutes_client(handler)
+    assert await client.get_sentiment_score(["tweet1", "tweet2"]) == 42
+
+
+@pytest.mark.asyncio
+async def test_async_client_retries_transient_failures():
+    responses = iter(
+        [
+            httpx.Response(503),
+            httpx.Response(200, json={"choices": [{"message": {"content": "5"}}]}),
+        ]
+    )
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return next(responses)
+
+    client = async_chutes_client(handler)
+    with patch("app.clients.http.asyncio.sleep", AsyncMock()) as sleep:
+        assert await client.get_sentiment_score(["tweet"]) == 5
+    sleep.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_async_client_gives_up_after_retries():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        raise httpx.ConnectError("refused", request=request)
+
+    client = async_chutes_client(handler)
+    with patch("app.clients.http.asyncio.sleep", AsyncMock()):
+        with pytest.raises(httpx.ConnectError):
+            await client.get_sentiment_score(["tweet"])
+    assert len(calls) == settings.EXTERNAL_API_RETRIES + 1
+
+
+@pytest.mark.asyncio
+async def test_async_client_does_not_retry_client_errors():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(401)
+
+    client = async_chutes_client(handler)
+    with pytest.raises(httpx.HTTPStatusError):
+        await client.get_sentiment_score(["tweet"])
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_async_get_sentiment_score_out_of_range():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"choices": [{"message": {"content": "500"}}]})
+
+    with pytest.raises(ValueError):
+        await async_chutes_client(handler).get_sentiment_score(["tweet"])
@@ -1,6 +1,7 @@
 import pytest
 from unittest.mock import MagicMock, patch
-from app.clients.desearch import DesearchClient
+import httpx
+from app.clients.desearch import DESEARCH_API_URL, AsyncDesearchClient, DesearchClient
 
 
 @pytest.fixture
@@ -22,3 +23,25 @@ def test_search_tweets(desearch_client):
     result = client.search_tweets("query", 2)
     assert result == ["tweet1", "tweet2"]
     mock_desearch.basic_twitter_search.assert_called_once_with(query="query")
+
+
+@pytest.mark.asyncio
+async def test_async_search_tweets():
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/twitter"
+        assert request.url.params["query"] == "query"
+        assert request.url.params["count"] == "2"
+        assert request.headers["Authorization"] == "key"
+        return httpx.Response(200, json=[{"text": "tweet1"}, {"text": "tweet2"}])
+
+    client = AsyncDesearchClient(
+        api_key="key",
+        client=httpx.AsyncClient(
+            base_url=DESEARCH_API_URL,
+            headers={"Authorization": "key"},
+            transport=httpx.MockTransport(handler),
+        ),
+    )
+    assert await client.search_tweets("query", 2) == ["tweet1", "tweet2"]
+    await client.aclose()
+    assert client.client.is_closed
@@ -0,0 +1,219 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from pymongo.errors import BulkWriteError
+from app.clients.mongodb import DUPLICATE_KEY, INDEXES, MongoDBClient
+
+
+def mongo_client(**kwargs) -> MongoDBClient:
+    client = MongoDBClient(**kwargs)
+    client.collection = MagicMock()
+    client.collection.update_one = AsyncMock()
+    client.collection.bulk_write = AsyncMock()
+    client.collection.create_index = AsyncMock(return_value="index")
+    client.get_collection = MagicMock(return_value=client.collection)
+    return client
+
+
+@pytest.mark.asyncio
+async def test_ensure_indexes_creates_unique_task_id():
+    client = mongo_client()
+    assert await client.ensure_indexes() is True
+    calls = client.collection.create_index.await_args_list
+    assert len(calls) == sum(len(indexes) for indexes in INDEXES.values())
+    assert calls[0].args == ([("task_id", 1)],)
+    assert calls[0].kwargs == {"unique": True}
+
+
+@pytest.mark.asyncio
+async def test_ensure_indexes_stops_at_first_failure():
+    client = mongo_client()
+    client.collection.create_index.side_effect = Exception("no server")
+    assert await client.ensure_indexes() is False
+    client.collection.create_index.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_unbuffered_upsert_writes_immediately():
+    client = mongo_client(flush_interval=0)
+    assert await client.upsert_one(
+        "results",
+        {"task_id": "t"},
+        {"status": "pending"},
+        set_on_insert={"created_at": 1},
+        buffered=True,
+    )
+    client.collection.update_one.assert_awaited_once_with(
+        {"task_id": "t"},
+        {"$set": {"status": "pending"}, "$setOnInsert": {"created_at": 1}},
+        upsert=True,
+    )
+
+
+@pytest.mark.asyncio
+async def test_buffered_upserts_are_coalesced_per_document():
+    client = mongo_client(flush_interval=60)
+    await client.upsert_one(
+        "results",
+        {"task_id": "t1"},
+        {"status": "pending"},
+        set_on_insert={"created_at": 1},
+        buffered=True,
+    )
+    await client.upsert_one("results", {"task_id": "t2"}, {"status": "pending"}, buffered=True)
+    await client.upsert_one("results", {"task_id": "t1"}, {"status": "success"}, buffered=True)
+    client.collection.update_one.assert_not_awaited()
+
+    assert await client.flush() == 2
+    (operations,), kwargs = client.collection.bulk_write.await_args
+    assert kwargs == {"ordered": False}
+    assert [op._doc for op in operations] == [
+        {"$set": {"status": "success"}, "$setOnInsert": {"created_at": 1}},
+        {"$set": {"status": "pending"}},
+    ]
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_buffer_flushes_when_full():
+    client = mongo_client(flush_interval=60, max_buffered=2)
+    for task_id in ("t1", "t2"):
+        await client.upsert_one(
+            "results", {"task_id": task_id}, {"status": "pending"}, buffered=True
+        )
+    client.collection.bulk_write.assert_awaited_once()
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_buffer_flushes_after_interval():
+    client = mongo_client(flush_interval=0.01)
+    await client.upsert_one("results", {"task_id": "t"}, {"status": "pending"}, buffered=True)
+    await asyncio.sleep(0.05)
+    client.collection.bulk_write.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_flushes_write_in_order():
+    client = mongo_client(flush_interval=60)
+    writes = []
+
+    async def bulk_write(operations, ordered):
+        await asyncio.sleep(0.01 if not writes else 0)
+        writes.append([op._doc["$set"]["status"] for op in operations])
+
+    client.collection.bulk_write.side_effect = bulk_write
+    await client.upsert_one("results", {"task_id": "t"}, {"status": "pending"}, buffered=True)
+    first = asyncio.create_task(client.flush())
+    await asyncio.sleep(0)
+    await client.upsert_one("results", {"task_id": "t"}, {"status": "queued"}, buffered=True)
+    await asyncio.gather(first, client.flush())
+    assert writes == [["pending"], ["queued"]]
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_failed_bulk_write_is_requeued_under_newer_upserts():
+    client = mongo_client(flush_interval=60)
+    client.collection.bulk_write.side_effect = [Exception("not primary"), None]
+    await client.upsert_one(
+        "results",
+        {"task_id": "t1"},
+        {"status": "pending", "stake_amount": 1},
+        set_on_insert={"created_at": 1},
+        buffered=True,
+    )
+    await client.upsert_one("results", {"task_id": "t2"}, {"status": "pending"}, buffered=True)
+    assert await client.flush() == 0
+    await client.upsert_one("results", {"task_id": "t1"}, {"status": "queued"}, buffered=True)
+    assert await client.flush() == 2
+    (operations,), _ = client.collection.bulk_write.await_args
+    assert [op._doc for op in operations] == [
+        {"$set": {"status": "queued", "stake_amount": 1}, "$setOnInsert": {"created_at": 1}},
+        {"$set": {"status": "pending"}},
+    ]
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_partially_failed_bulk_write_requeues_only_failed_upserts():
+    client = mongo_client(flush_interval=60)
+    client.collection.bulk_write.side_effect = [
+        BulkWriteError({"writeErrors": [{"index": 1, "code": 91, "errmsg": "shutting down"}]}),
+        None,
+    ]
+    for task_id in ("t1", "t2"):
+        await client.upsert_one(
+            "results", {"task_id": task_id}, {"status": "pending"}, buffered=True
+        )
+    assert await client.flush() == 1
+    assert client.is_buffered("results", {"task_id": "t2"})
+    assert not client.is_buffered("results", {"task_id": "t1"})
+    assert await client.flush() == 1
+    (operations,), _ = client.collection.bulk_write.await_args
+    assert [op._filter for op in operations] == [{"task_id": "t2"}]
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_retried_upsert_whose_guard_no_longer_matches_is_dropped():
+    client = mongo_client(flush_interval=60)
+    query = {"task_id": "t", "batch_id": None}
+    # The first write failed after being applied, then a batch claimed the document
+    client.collection.bulk_write.side_effect = [
+        Exception("connection reset"),
+        BulkWriteError({"writeErrors": [{"index": 0, "code": DUPLICATE_KEY, "errmsg": "dup"}]}),
+    ]
+    await client.upsert_one("results", query, {"status": "queued"}, buffered=True)
+    assert await client.flush() == 0
+    assert client.is_buffered("results", query)
+    assert await client.flush() == 0
+    assert not client.is_buffered("results", query)
+    assert client.collection.bulk_write.await_count == 2
+    await client.aclose()
+    assert client.collection.bulk_write.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_aclose_flushes_buffered_upserts():
+    client = mongo_client(flush_interval=60)
+    await client.upsert_one("results", {"task_id": "t"}, {"status": "pending"}, buffered=True)
+    client.client = MagicMock()
+    await client.aclose()
+    client.collection.bulk_write.assert_awaited_once()
+    client.client.close.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_iter_find_streams_in_batches():
+    client = mongo_client()
+    cursor = MagicMock()
+    cursor.batch_size.return_value = cursor
+    cursor.close = AsyncMock()
+
+    async def docs():
+        for i in range(3):
+            yield {"i": i}
+
+    cursor.__aiter__ = lambda self: docs()
+    client.collection.find = MagicMock(return_value=cursor)
+    results = [
+        doc
+        async for doc in client.iter_find(
+            "results", {"netuid": 1}, projection={"i": 1}, sort=[("i", -1)], batch_size=2
+        )
+    ]
+    assert results == [{"i": 0}, {"i": 1}, {"i": 2}]
+    client.collection.find.assert_called_once_with(
+        {"netuid": 1}, {"i": 1}, sort=[("i", -1)], limit=0
+    )
+    cursor.batch_size.assert_called_once_with(2)
+    cursor.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_find_many_logs_read_failures(caplog):
+    client = mongo_client()
+    client.collection.find = MagicMock(side_effect=Exception("not primary"))
+    assert await client.find_many("results", {"netuid": 1}) == []
+    assert "Failed to find documents in results: not primary" in caplog.text
@@ -0,0 +1,53 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+from app.clients.nonce import NONCE_RESYNCS, PENDING_EXTRINSICS, NonceManager
+
+
+@pytest.mark.asyncio
+async def test_nonces_are_read_once_then_allocated_locally():
+    nonces = NonceManager()
+    fetch = AsyncMock(return_value=5)
+    allocated = await asyncio.gather(*(nonces.acquire("acct", fetch) for _ in range(4)))
+    assert sorted(allocated) == [5, 6, 7, 8]
+    fetch.assert_awaited_once()
+    assert nonces.pending("acct") == 4
+    assert PENDING_EXTRINSICS.labels(account="acct")._value.get() == 4
+
+
+@pytest.mark.asyncio
+async def test_release_tracks_queue_depth():
+    nonces = NonceManager()
+    fetch = AsyncMock(return_value=0)
+    first = await nonces.acquire("depth", fetch)
+    await nonces.acquire("depth", fetch)
+    nonces.release("depth", first)
+    assert nonces.pending("depth") == 1
+    assert PENDING_EXTRINSICS.labels(account="depth")._value.get() == 1
+    assert await nonces.acquire("depth", fetch) == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_submission_resyncs_from_chain():
+    nonces = NonceManager()
+    fetch = AsyncMock(side_effect=[3, 3])
+    nonce = await nonces.acquire("resync", fetch)
+    nonces.release("resync", nonce, resync=True)
+    assert await nonces.acquire("resync", fetch) == 3
+    assert fetch.await_count == 2
+    assert NONCE_RESYNCS.labels(account="resync")._value.get() == 1
+
+
+@pytest.mark.asyncio
+async def test_resync_skips_nonces_still_in_flight():
+    nonces = NonceManager()
+    fetch = AsyncMock(return_value=3)
+    lower = await nonces.acquire("in_flight", fetch)
+    higher = await nonces.acquire("in_flight", fetch)
+    assert (lower, higher) == (3, 4)
+    # The lower extrinsic failed while the higher one is not yet in the pool
+    nonces.release("in_flight", lower, resync=True)
+    assert await nonces.acquire("in_flight", AsyncMock(return_value=4)) == 5
+    nonces.release("in_flight", 5, resync=True)
+    # The gap left by the failed extrinsic is filled
+    assert await nonces.acquire("in_flight", AsyncMock(return_value=3)) == 3
@@ -1,17 +1,24 @@
 import pytest
 from unittest.mock import MagicMock, AsyncMock, patch
-from app.clients.wallet import WalletClient
+from app.clients.wallet import WalletClient, wallets
 
 
 @pytest.fixture
-def wallet_client():
+def mock_wallet_cls():
+    wallets.invalidate()
     with patch("app.clients.wallet.Wallet") as mock_wallet_cls:
-        mock_wallet = MagicMock()
-        mock_wallet_cls.return_value = mock_wallet
-        mock_wallet.coldkey_file.exists_on_device.return_value = True
-        client = WalletClient()
-        client.wallet = mock_wallet
-        yield client, mock_wallet
+        yield mock_wallet_cls
+    wallets.invalidate()
+
+
+@pytest.fixture
+def wallet_client(mock_wallet_cls):
+    mock_wallet = MagicMock()
+    mock_wallet_cls.return_value = mock_wallet
+    mock_wallet.coldkey_file.exists_on_device.return_value = True
+    client = WalletClient()
+    client.wallet = mock_wallet
+    yield client, mock_wallet
 
 
 def test_get_wallet(wallet_client):
@@ -25,3 +32,20 @@ async def test_get_balance(wallet_client):
     mock_wallet.get_balance = AsyncMock(return_value=123.45)
     result = await client.get_balance()
     assert result == 123.45
+
+
+def test_wallet_is_loaded_and_unlocked_once(mock_wallet_cls):
+    mock_wallet_cls.return_value.coldkey_file.exists_on_device.return_value = False
+    first, second = WalletClient(), WalletClient()
+    assert first.get_wallet() is second.get_wallet()
+    mock_wallet_cls.assert_called_once()
+    wallet = mock_wallet_cls.return_value
+    wallet.regenerate_coldkey.assert_called_once()
+    wallet.unlock_coldkey.assert_called_once()
+
+
+def test_invalidate_reloads_wallet(mock_wallet_cls):
+    WalletClient()
+    wallets.invalidate()
+    WalletClient()
+    assert mock_wallet_cls.call_count == 2
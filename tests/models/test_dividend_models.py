@@ -1,6 +1,7 @@
-from app.models.dividend import DividendResponse, DividendRequest, ErrorResponse
+from app.models.dividend import DividendResponse, DividendRequest, DividendSnapshot, ErrorResponse
 from pydantic import ValidationError
 import pytest
+import time
 
 
 def test_dividend_response_required_fields():
@@ -15,9 +16,15 @@ def test_dividend_response_required_fields():
 def test_dividend_response_defaults():
     resp = DividendResponse(netuid=1, hotkey="hk", dividend=1.23)
     assert resp.cached is False
+    assert resp.age is None
     assert resp.stake_tx_triggered is False
 
 
+def test_dividend_snapshot_age():
+    snapshot = DividendSnapshot(netuid=1, dividends={"hk": 1}, fetched_at=time.time() - 10)
+    assert 10 <= snapshot.age < 11
+
+
 def test_dividend_response_validation():
     with pytest.raises(ValidationError):
         DividendResponse(netuid=1, hotkey="hk")  # missing dividend
@@ -0,0 +1,38 @@
+import os
+import time
+import pytest
+from bittensor.core.chain_data import decode_account_id
+from app.models.dividend import DividendSnapshot
+from app.services.codec import ENTRY, HEADER, pack_snapshot, unpack_snapshot
+
+
+def make_snapshot(size: int, **kwargs) -> DividendSnapshot:
+    dividends = {decode_account_id(os.urandom(32)): i * 1_000_000 for i in range(size)}
+    return DividendSnapshot(netuid=18, dividends=dividends, fetched_at=time.time(), **kwargs)
+
+
+def test_pack_round_trips_snapshot():
+    snapshot = make_snapshot(256, block=123, block_hash="0x" + os.urandom(32).hex())
+    packed = pack_snapshot(snapshot)
+    assert len(packed) == HEADER.size + 256 * ENTRY.size
+    assert unpack_snapshot(18, packed) == snapshot
+
+
+def test_pack_round_trips_unknown_block():
+    snapshot = make_snapshot(2)
+    unpacked = unpack_snapshot(18, pack_snapshot(snapshot))
+    assert unpacked.block is None
+    assert unpacked.block_hash is None
+
+
+def test_pack_rejects_fractional_dividends():
+    snapshot = make_snapshot(1)
+    snapshot.dividends = {hotkey: 1.5 for hotkey in snapshot.dividends}
+    with pytest.raises(ValueError):
+        pack_snapshot(snapshot)
+
+
+def test_unpack_rejects_truncated_data():
+    packed = pack_snapshot(make_snapshot(3))
+    with pytest.raises(ValueError):
+        unpack_snapshot(18, packed[:-1])
@@ -0,0 +1,419 @@
+import asyncio
+import time
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from app.config import settings
+from app.models.dividend import DividendSnapshot
+from app.services.dividends import (
+    BLOCK_FIELD,
+    BLOCK_HASH_FIELD,
+    BlockMismatch,
+    DividendService,
+    FETCHED_AT_FIELD,
+    UnknownBlock,
+)
+from app.services.pagination import InvalidCursor, encode_cursor
+
+HEAD_HASH = "0x" + "00" * 32
+BLOCK_7_HASH = "0x" + "07" * 32
+
+
+@pytest.fixture
+def dividend_service():
+    mock_bt_client = MagicMock()
+    mock_cache_client = MagicMock()
+    mock_cache_client.build_cache_key.return_value = "snapshot:1"
+    mock_cache_client.get_hash = AsyncMock(return_value=None)
+    mock_cache_client.set_hash = AsyncMock()
+    mock_bt_client.get_dividends_for_subnet = AsyncMock(return_value={"hk1": 10, "hk2": 20})
+    mock_bt_client.get_block_hash = AsyncMock(return_value=HEAD_HASH)
+    mock_bt_client.get_block_number = AsyncMock(return_value=100)
+    yield DividendService(mock_bt_client, mock_cache_client, ttl=60, point_query_hotkeys=0)
+
+
+@pytest.mark.asyncio
+async def test_get_dividend_scans_chain_once_per_subnet(dividend_service):
+    assert await dividend_service.get_dividend(1, "hk1") == (10, False)
+    assert await dividend_service.get_dividend(1, "hk2") == (20, True)
+    dividend_service.bittensor_client.get_dividends_for_subnet.assert_awaited_once_with(
+        1, block_hash=HEAD_HASH
+    )
+    dividend_service.cache_client.get_hash.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_get_dividend_unknown_hotkey_returns_zero(dividend_service):
+    assert await dividend_service.get_dividend(1, "missing") == (0.0, False)
+
+
+@pytest.mark.asyncio
+async def test_refresh_writes_snapshot_hash(dividend_service):
+    snapshot = await dividend_service.refresh(1)
+    key, mapping = dividend_service.cache_client.set_hash.await_args.args
+    assert key == "snapshot:1"
+    assert mapping == {
+        "hk1": 10,
+        "hk2": 20,
+        FETCHED_AT_FIELD: snapshot.fetched_at,
+        BLOCK_FIELD: 100,
+        BLOCK_HASH_FIELD: HEAD_HASH,
+    }
+    assert dividend_service.cache_client.set_hash.await_args.kwargs["ttl"] == 60
+
+
+@pytest.mark.asyncio
+async def test_get_snapshot_reads_redis_snapshot(dividend_service):
+    dividend_service.cache_client.get_hash = AsyncMock(
+        return_value={"hk1": 5, FETCHED_AT_FIELD: time.time()}
+    )
+    snapshot, cached = await dividend_service.get_snapshot(1)
+    assert cached is True
+    assert snapshot.dividends == {"hk1": 5}
+    dividend_service.bittensor_client.get_dividends_for_subnet.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_get_snapshot_ignores_expired_local_copy(dividend_service):
+    dividend_service._snapshots[1] = DividendSnapshot(
+        netuid=1, dividends={"hk1": 1}, fetched_at=time.time() - 120
+    )
+    snapshot, cached = await dividend_service.get_snapshot(1)
+    assert cached is False
+    assert snapshot.dividends == {"hk1": 10, "hk2": 20}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_chain_scan(dividend_service):
+    async def slow_scan(netuid, block_hash=None):
+        await asyncio.sleep(0.01)
+        return {"hk1": 10}
+
+    dividend_service.bittensor_client.get_dividends_for_subnet = AsyncMock(side_effect=slow_scan)
+    results = await asyncio.gather(*(dividend_service.get_dividend(1, "hk1") for _ in range(5)))
+    assert results == [(10, False)] * 5
+    dividend_service.bittensor_client.get_dividends_for_subnet.assert_awaited_once_with(
+        1, block_hash=HEAD_HASH
+    )
+
+
+@pytest.mark.asyncio
+async def test_refresh_records_block(dividend_service):
+    snapshot = await dividend_service.refresh(1, block=99)
+    assert snapshot.block == 99
+    _, mapping = dividend_service.cache_client.set_hash.await_args.args
+    assert mapping[BLOCK_FIELD] == 99
+
+
+@pytest.fixture
+def swr_dividend_service(dividend_service):
+    dividend_service.hard_ttl = 600
+    yield dividend_service
+
+
+@pytest.mark.asyncio
+async def test_stale_snapshot_is_served_and_refreshed_once(swr_dividend_service):
+    swr_dividend_service._snapshots[1] = DividendSnapshot(
+        netuid=1, dividends={"hk1": 1}, fetched_at=time.time() - 120
+    )
+    results = await asyncio.gather(*(swr_dividend_service.get_dividend(1, "hk1") for _ in range(5)))
+    assert results == [(1, True)] * 5
+    await asyncio.gather(*swr_dividend_service._revalidations.values())
+    swr_dividend_service.bittensor_client.get_dividends_for_subnet.assert_awaited_once_with(
+        1, block_hash=HEAD_HASH
+    )
+    assert await swr_dividend_service.get_dividend(1, "hk1") == (10, True)
+
+
+@pytest.mark.asyncio
+async def test_snapshot_past_hard_ttl_blocks_on_chain(swr_dividend_service):
+    swr_dividend_service._snapshots[1] = DividendSnapshot(
+        netuid=1, dividends={"hk1": 1}, fetched_at=time.time() - 900
+    )
+    assert await swr_dividend_service.get_dividend(1, "hk1") == (10, False)
+
+
+@pytest.mark.asyncio
+async def test_snapshot_is_cached_for_hard_ttl(swr_dividend_service):
+    await swr_dividend_service.refresh(1)
+    assert swr_dividend_service.cache_client.set_hash.await_args.kwargs["ttl"] == 600
+
+
+@pytest.mark.asyncio
+async def test_background_refresh_failure_keeps_stale_snapshot(swr_dividend_service):
+    swr_dividend_service.bittensor_client.get_dividends_for_subnet = AsyncMock(
+        side_effect=Exception("chain down")
+    )
+    swr_dividend_service._snapshots[1] = DividendSnapshot(
+        netuid=1, dividends={"hk1": 1}, fetched_at=time.time() - 120
+    )
+    assert await swr_dividend_service.get_dividend(1, "hk1") == (1, True)
+    await asyncio.gather(*swr_dividend_service._revalidations.values())
+    assert swr_dividend_service._snapshots[1].dividends == {"hk1": 1}
+
+
+@pytest.mark.asyncio
+async def test_fixed_policy_hits_issue_no_cache_writes(dividend_service):
+    dividend_service.cache_client.touch = AsyncMock()
+    await dividend_service.get_dividend(1, "hk1")
+    for _ in range(3):
+        await dividend_service.get_dividend(1, "hk2")
+    dividend_service.cache_client.set_hash.assert_awaited_once()
+    dividend_service.cache_client.touch.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_fixed_policy_expires_popular_snapshot(dividend_service):
+    dividend_service._snapshots[1] = DividendSnapshot(
+        netuid=1, dividends={"hk1": 1}, fetched_at=time.time() - 59
+    )
+    assert await dividend_service.get_dividend(1, "hk1") == (1, True)
+    dividend_service._snapshots[1].fetched_at -= 2
+    assert await dividend_service.get_dividend(1, "hk1") == (10, False)
+
+
+@pytest.mark.asyncio
+async def test_sliding_policy_extends_ttl_on_hit(dividend_service):
+    dividend_service.expiry_policy = "sliding"
+    dividend_service.cache_client.touch = AsyncMock()
+    dividend_service._snapshots[1] = DividendSnapshot(
+        netuid=1, dividends={"hk1": 1}, fetched_at=time.time() - 59
+    )
+    assert await dividend_service.get_dividend(1, "hk1") == (1, True)
+    dividend_service.cache_client.touch.assert_awaited_once_with("snapshot:1", ttl=60)
+    dividend_service._snapshots[1].fetched_at -= 30
+    assert await dividend_service.get_dividend(1, "hk1") == (1, True)
+    dividend_service.bittensor_client.get_dividends_for_subnet.assert_not_awaited()
+    dividend_service.cache_client.set_hash.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_invalidation_drops_in_process_snapshot(dividend_service):
+    await dividend_service.get_snapshot(1)
+    listener = dividend_service.cache_client.add_invalidation_listener.call_args.args[0]
+    listener("api:tao_dividends_snapshot:2")
+    assert 1 in dividend_service._snapshots
+    listener("api:tao_dividends_snapshot:1")
+    assert 1 not in dividend_service._snapshots
+
+
+@pytest.mark.asyncio
+async def test_read_cached_snapshot_leaves_cached_data_untouched(dividend_service):
+    data = {"hk1": 5, FETCHED_AT_FIELD: time.time(), BLOCK_FIELD: 7}
+    dividend_service.cache_client.get_hash = AsyncMock(return_value=data)
+    snapshot = await dividend_service._read_cached_snapshot(1)
+    assert snapshot.dividends == {"hk1": 5}
+    assert snapshot.block == 7
+    assert FETCHED_AT_FIELD in data
+
+
+@pytest.mark.asyncio
+async def test_get_snapshots_fans_out_cache_misses_once(dividend_service):
+    dividend_service.bittensor_client.get_dividends_for_subnets = AsyncMock(
+        return_value=({2: {"hk1": 2}, 3: {"hk1": 3}}, {})
+    )
+    await dividend_service.refresh(1)
+    snapshots = await dividend_service.get_snapshots([1, 2, 3, 2])
+    assert list(snapshots) == [1, 2, 3]
+    assert snapshots[1][1] is True
+    assert snapshots[2][0].dividends == {"hk1": 2}
+    assert snapshots[2][1] is False
+    dividend_service.bittensor_client.get_dividends_for_subnets.assert_awaited_once_with(
+        [2, 3], block_hash=HEAD_HASH
+    )
+    assert dividend_service.cache_client.set_hash.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_get_snapshots_returns_errors_per_subnet(dividend_service):
+    error = Exception("chain down")
+    dividend_service.bittensor_client.get_dividends_for_subnets = AsyncMock(
+        return_value=({1: {"hk1": 1}}, {2: error})
+    )
+    snapshots = await dividend_service.get_snapshots([1, 2])
+    assert snapshots[1][0].dividends == {"hk1": 1}
+    assert snapshots[2] is error
+
+
+@pytest.mark.asyncio
+async def test_get_snapshots_coalesces_with_concurrent_single_lookup(dividend_service):
+    release = asyncio.Event()
+
+    async def get_dividends_for_subnet(netuid, block_hash=None):
+        await release.wait()
+        return {"hk1": 1}
+
+    dividend_service.bittensor_client.get_dividends_for_subnet = get_dividends_for_subnet
+    dividend_service.bittensor_client.get_dividends_for_subnets = AsyncMock(
+        return_value=({2: {"hk1": 2}}, {})
+    )
+    single = asyncio.create_task(dividend_service.get_snapshot(1))
+    await asyncio.sleep(0)
+    batch = asyncio.create_task(dividend_service.get_snapshots([1, 2]))
+    await asyncio.sleep(0.01)
+    release.set()
+    await single
+    snapshots = await batch
+    assert snapshots[1][0].dividends == {"hk1": 1}
+    assert snapshots[2][0].dividends == {"hk1": 2}
+
+
+def test_list_dividends_cursor_survives_snapshot_replacement(dividend_service):
+    snapshot = DividendSnapshot(
+        netuid=1, dividends={"hk1": 30, "hk2": 20, "hk3": 10}, fetched_at=time.time()
+    )
+    page, cursor = dividend_service.list_dividends(snapshot, limit=2)
+    assert page == [("hk1", 30), ("hk2", 20)]
+
+    replaced = DividendSnapshot(
+        netuid=1, dividends={"hk1": 30, "hk2": 20, "hk3": 10, "hk4": 15}, fetched_at=time.time() + 1
+    )
+    page, cursor = dividend_service.list_dividends(replaced, limit=2, cursor=cursor)
+    assert page == [("hk4", 15), ("hk3", 10)]
+    assert cursor is None
+
+
+def test_list_dividends_rejects_malformed_cursor(dividend_service):
+    snapshot = DividendSnapshot(netuid=1, dividends={"hk1": 1}, fetched_at=time.time())
+    with pytest.raises(InvalidCursor):
+        dividend_service.list_dividends(snapshot, cursor=encode_cursor({"x": 1}))
+    with pytest.raises(InvalidCursor):
+        dividend_service.list_dividends(snapshot, cursor="%%%")
+
+
+@pytest.mark.asyncio
+async def test_refresh_pins_scan_to_chain_head(dividend_service):
+    snapshot = await dividend_service.refresh(1)
+    assert snapshot.block == 100
+    assert snapshot.block_hash == HEAD_HASH
+    dividend_service.bittensor_client.get_block_hash.assert_awaited_once_with(None)
+    # The head snapshot also answers pinned reads of its block
+    assert await dividend_service.get_block_snapshot(1, block_hash=HEAD_HASH) == (snapshot, True)
+
+
+@pytest.mark.asyncio
+async def test_block_snapshot_is_read_from_redis_without_expiry(dividend_service):
+    dividend_service.cache_client.get_hash = AsyncMock(
+        return_value={"hk1": 5, FETCHED_AT_FIELD: 0, BLOCK_FIELD: 7, BLOCK_HASH_FIELD: BLOCK_7_HASH}
+    )
+    snapshot, cached = await dividend_service.get_block_snapshot(1, block_hash=BLOCK_7_HASH)
+    assert cached is True
+    assert snapshot.dividends == {"hk1": 5}
+    assert snapshot.block == 7
+    dividend_service.bittensor_client.get_dividends_for_subnet.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_block_snapshot_rejects_block_not_matching_hash(dividend_service):
+    dividend_service.cache_client.get_hash = AsyncMock(
+        return_value={"hk1": 5, FETCHED_AT_FIELD: 0, BLOCK_FIELD: 7, BLOCK_HASH_FIELD: BLOCK_7_HASH}
+    )
+    snapshot, _ = await dividend_service.get_block_snapshot(1, block=7, block_hash=BLOCK_7_HASH)
+    assert snapshot.block == 7
+    with pytest.raises(BlockMismatch):
+        await dividend_service.get_block_snapshot(1, block=8, block_hash=BLOCK_7_HASH)
+
+
+@pytest.mark.asyncio
+async def test_block_snapshot_reads_block_number_of_given_hash(dividend_service):
+    with pytest.raises(BlockMismatch):
+        await dividend_service.get_block_snapshot(1, block=99, block_hash=HEAD_HASH)
+    dividend_service.bittensor_client.get_block_number.assert_awaited_once_with(HEAD_HASH)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("block_hash", ["0xhead", "0x" + "zz" * 32, "ab" * 33])
+async def test_block_snapshot_rejects_malformed_hash(dividend_service, block_hash):
+    with pytest.raises(UnknownBlock):
+        await dividend_service.get_block_snapshot(1, block_hash=block_hash)
+    dividend_service.bittensor_client.get_dividends_for_subnet.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_block_snapshot_miss_is_cached_under_block_key(dividend_service):
+    dividend_service.cache_client.build_cache_key.side_effect = lambda *args, prefix: ":".join(
+        [prefix, *map(str, args)]
+    )
+    snapshot, cached = await dividend_service.get_block_snapshot(1, block=7)
+    assert cached is False
+    assert snapshot.block == 7
+    dividend_service.bittensor_client.get_block_hash.assert_awaited_once_with(7)
+    dividend_service.bittensor_client.get_block_number.assert_not_awaited()
+    key = dividend_service.cache_client.set_hash.await_args.args[0]
+    assert key == f"api:tao_dividends_block:1:{HEAD_HASH}"
+
+
+@pytest.mark.asyncio
+async def test_unknown_block_raises(dividend_service):
+    dividend_service.bittensor_client.get_block_hash = AsyncMock(return_value=None)
+    with pytest.raises(UnknownBlock):
+        await dividend_service.get_block_snapshot(1, block=10**9)
+
+
+@pytest.mark.asyncio
+async def test_packed_layout_round_trips_through_cache(dividend_service):
+    hotkey = "5FFApaS75bv5pJHfAp2FVLBj9ZaXuFDjEypsaBNc1wCfe52v"
+    dividend_service.layout = "packed"
+    dividend_service.bittensor_client.get_block_hash = AsyncMock(return_value="0x" + "ab" * 32)
+    dividend_service.cache_client.set_bytes = AsyncMock()
+    dividend_service.bittensor_client.get_dividends_for_subnet = AsyncMock(
+        return_value={hotkey: 42}
+    )
+    snapshot = await dividend_service.refresh(1)
+    key, packed = dividend_service.cache_client.set_bytes.await_args.args
+    dividend_service.cache_client.get_bytes = AsyncMock(return_value=packed)
+    assert await dividend_service._read_cached_snapshot(1) == snapshot
+    dividend_service.cache_client.set_hash.assert_not_awaited()
+
+
+@pytest.fixture
+def point_dividend_service(dividend_service):
+    dividend_service.point_query_hotkeys = 2
+    dividend_service.cache_client.get = AsyncMock(return_value=None)
+    dividend_service.cache_client.set = AsyncMock()
+    dividend_service.bittensor_client.get_dividend = AsyncMock(return_value=7)
+    yield dividend_service
+
+
+@pytest.mark.asyncio
+async def test_cold_subnet_hotkey_is_read_by_point_query(point_dividend_service):
+    snapshot, cached = await point_dividend_service.get_hotkey_snapshot(1, "hk1")
+    assert (snapshot.dividends, cached) == ({"hk1": 7}, False)
+    assert snapshot.block_hash == HEAD_HASH
+    point_dividend_service.bittensor_client.get_dividend.assert_awaited_once_with(
+        1, "hk1", block_hash=HEAD_HASH
+    )
+    point_dividend_service.bittensor_client.get_dividends_for_subnet.assert_not_awaited()
+    key, data = point_dividend_service.cache_client.set.await_args.args
+    assert data == snapshot.model_dump()
+    assert point_dividend_service.cache_client.set.await_args.kwargs == {"ttl": 60}
+
+
+@pytest.mark.asyncio
+async def test_cached_point_query_is_served_from_cache(point_dividend_service):
+    _, _ = await point_dividend_service.get_hotkey_snapshot(1, "hk1")
+    data = point_dividend_service.cache_client.set.await_args.args[1]
+    point_dividend_service.cache_client.get = AsyncMock(return_value=data)
+    assert await point_dividend_service.get_dividend(1, "hk1") == (7, True)
+    point_dividend_service.bittensor_client.get_dividend.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_many_requested_hotkeys_switch_to_subnet_scan(point_dividend_service):
+    assert await point_dividend_service.get_dividend(1, "hk1") == (7, False)
+    assert await point_dividend_service.get_dividend(1, "hk2") == (7, False)
+    assert await point_dividend_service.get_dividend(1, "hk3") == (0.0, False)
+    point_dividend_service.bittensor_client.get_dividends_for_subnet.assert_awaited_once()
+    # The subnet snapshot now answers every hotkey
+    assert await point_dividend_service.get_dividend(1, "hk2") == (20, True)
+    assert point_dividend_service.bittensor_client.get_dividend.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_requested_hotkeys_expire_after_window(point_dividend_service):
+    await point_dividend_service.get_dividend(1, "hk1")
+    await point_dividend_service.get_dividend(1, "hk2")
+    later = time.monotonic() + settings.DIVIDEND_POINT_QUERY_WINDOW + 1
+    with patch("app.services.dividends.time.monotonic", return_value=later):
+        await point_dividend_service.get_dividend(1, "hk3")
+    point_dividend_service.bittensor_client.get_dividends_for_subnet.assert_not_awaited()
+    assert point_dividend_service.bittensor_client.get_dividend.await_count == 3
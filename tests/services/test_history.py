@@ -0,0 +1,118 @@
+import time
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+from app.models.dividend import DividendSnapshot
+from app.services.history import DividendHistory
+
+
+@pytest.fixture
+def history():
+    mock_mongodb_client = MagicMock()
+    mock_mongodb_client.insert_many = AsyncMock(side_effect=lambda collection, docs: len(docs))
+    mock_mongodb_client.aggregate = AsyncMock(return_value=[])
+    yield DividendHistory(mock_mongodb_client, collection="history", interval=60)
+
+
+def make_snapshot(fetched_at: float, block: int) -> DividendSnapshot:
+    return DividendSnapshot(
+        netuid=1, dividends={"hk1": 10, "hk2": 20}, fetched_at=fetched_at, block=block
+    )
+
+
+@pytest.mark.asyncio
+async def test_record_writes_one_measurement_per_hotkey(history):
+    now = time.time()
+    assert await history.record(make_snapshot(now, 100)) == 2
+    collection, documents = history.mongodb_client.insert_many.await_args.args
+    assert collection == "history"
+    assert documents[0] == {
+        "timestamp": datetime.fromtimestamp(now, tz=timezone.utc),
+        "meta": {"netuid": 1, "hotkey": "hk1"},
+        "dividend": 10.0,
+        "block": 100,
+    }
+
+
+@pytest.mark.asyncio
+async def test_record_throttles_per_subnet(history):
+    now = time.time()
+    await history.record(make_snapshot(now, 100))
+    assert await history.record(make_snapshot(now + 30, 110)) == 0
+    assert await history.record(make_snapshot(now + 61, 100)) == 0
+    assert await history.record(make_snapshot(now + 61, 115)) == 2
+    assert history.mongodb_client.insert_many.await_count == 2
+
+
+@pytest.fixture
+def shared_history(history):
+    claimed = set()
+
+    async def set_nx(key, value, nx, px):
+        if key in claimed:
+            return None
+        claimed.add(key)
+        return True
+
+    redis = MagicMock()
+    redis.set = AsyncMock(side_effect=set_nx)
+    redis.delete = AsyncMock(side_effect=lambda key: claimed.discard(key))
+    other = DividendHistory(history.mongodb_client, collection="history", interval=60, redis=redis)
+    history.redis = redis
+    yield history, other
+
+
+@pytest.mark.asyncio
+async def test_record_is_claimed_by_one_process(shared_history):
+    history, other = shared_history
+    now = time.time()
+    assert await history.record(make_snapshot(now, 100)) == 2
+    assert await other.record(make_snapshot(now + 1, 100)) == 0
+    assert await other.record(make_snapshot(now + 5, 101)) == 0
+    assert history.mongodb_client.insert_many.await_count == 1
+    assert history.redis.set.await_args.kwargs["px"] == 60_000
+
+
+@pytest.mark.asyncio
+async def test_failed_record_releases_claim(shared_history):
+    history, other = shared_history
+    now = time.time()
+    history.mongodb_client.insert_many = AsyncMock(return_value=0)
+    assert await history.record(make_snapshot(now, 100)) == 0
+    history.mongodb_client.insert_many = AsyncMock(return_value=2)
+    assert await other.record(make_snapshot(now, 100)) == 2
+
+
+@pytest.mark.asyncio
+async def test_unthrottled_record_is_claimed_per_block(shared_history):
+    history, other = shared_history
+    history.interval = other.interval = 0
+    now = time.time()
+    assert await history.record(make_snapshot(now, 100)) == 2
+    assert await other.record(make_snapshot(now, 100)) == 0
+    assert await other.record(make_snapshot(now + 12, 101)) == 2
+
+
+@pytest.mark.asyncio
+async def test_downsampled_subnet_history_sums_hotkeys_per_snapshot(history):
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    end = datetime(2025, 1, 2, tzinfo=timezone.utc)
+    await history.get_downsampled(1, start, end, unit="hour", bin_size=2)
+    collection, pipeline = history.mongodb_client.aggregate.await_args.args
+    assert pipeline[0] == {"$match": {"meta.netuid": 1, "timestamp": {"$gte": start, "$lt": end}}}
+    assert pipeline[1]["$group"]["dividend"] == {"$sum": "$dividend"}
+    bucket_stage = pipeline[3]["$group"]
+    assert bucket_stage["_id"] == {
+        "$dateTrunc": {"date": "$timestamp", "unit": "hour", "binSize": 2}
+    }
+    assert set(bucket_stage) == {"_id", "min", "max", "avg", "count"}
+
+
+@pytest.mark.asyncio
+async def test_downsampled_hotkey_history_filters_by_hotkey(history):
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    end = datetime(2025, 1, 2, tzinfo=timezone.utc)
+    await history.get_downsampled(1, start, end, unit="day", hotkey="hk1")
+    collection, pipeline = history.mongodb_client.aggregate.await_args.args
+    assert pipeline[0]["$match"]["meta.hotkey"] == "hk1"
+    assert "$dateTrunc" in pipeline[1]["$group"]["_id"]
@@ -0,0 +1,64 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from app.services.refresher import DIVIDEND_SNAPSHOT_STALENESS_BLOCKS, DividendRefresher
+
+
+@pytest.fixture
+def refresher():
+    mock_service = MagicMock()
+    mock_service.refresh_many = AsyncMock(
+        side_effect=lambda netuids, block: {netuid: MagicMock() for netuid in netuids}
+    )
+    mock_service.bittensor_client.get_current_block = AsyncMock(return_value=100)
+    yield DividendRefresher(mock_service, netuids=[1, 2], refresh_blocks=2, poll_interval=0.001)
+
+
+@pytest.mark.asyncio
+async def test_poll_refreshes_all_hot_subnets(refresher):
+    assert await refresher.poll() is True
+    refresher.dividend_service.refresh_many.assert_awaited_once_with([1, 2], block=100)
+    assert refresher.last_refresh_block == 100
+
+
+@pytest.mark.asyncio
+async def test_poll_waits_for_enough_new_blocks(refresher):
+    await refresher.poll()
+    refresher.dividend_service.bittensor_client.get_current_block = AsyncMock(return_value=101)
+    assert await refresher.poll() is False
+    refresher.dividend_service.bittensor_client.get_current_block = AsyncMock(return_value=102)
+    assert await refresher.poll() is True
+    assert refresher.dividend_service.refresh_many.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_poll_tracks_staleness_in_blocks(refresher):
+    await refresher.poll()
+    refresher.dividend_service.refresh_many = AsyncMock(
+        return_value={1: MagicMock(), 2: Exception("fail")}
+    )
+    refresher.dividend_service.bittensor_client.get_current_block = AsyncMock(return_value=102)
+    await refresher.poll()
+    assert DIVIDEND_SNAPSHOT_STALENESS_BLOCKS.labels(netuid=1)._value.get() == 0
+    assert DIVIDEND_SNAPSHOT_STALENESS_BLOCKS.labels(netuid=2)._value.get() == 2
+
+
+@pytest.mark.asyncio
+async def test_start_and_stop(refresher):
+    refresher.start()
+    await asyncio.sleep(0.01)
+    await refresher.stop()
+    assert refresher._task is None
+    refresher.dividend_service.refresh_many.assert_awaited()
+
+
+@pytest.mark.asyncio
+async def test_poll_records_refreshed_snapshots_in_history(refresher):
+    snapshot = MagicMock()
+    refresher.dividend_service.refresh_many = AsyncMock(
+        return_value={1: snapshot, 2: Exception("fail")}
+    )
+    refresher.history = MagicMock()
+    refresher.history.record = AsyncMock()
+    await refresher.poll()
+    refresher.history.record.assert_awaited_once_with(snapshot)
@@ -0,0 +1,89 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from app.clients.cache import CacheClient
+from app.services.sentiment import SCORE_PREFIX, SentimentService, fingerprint_tweets
+
+
+@pytest.fixture
+def cache_client():
+    client = MagicMock()
+    store = {}
+    client.build_cache_key = CacheClient.build_cache_key.__get__(client)
+    client.get = AsyncMock(side_effect=lambda key: store.get(key))
+    client.set = AsyncMock(side_effect=lambda key, data, ttl=None: store.__setitem__(key, data))
+    client.store = store
+    return client
+
+
+@pytest.fixture
+def desearch_client():
+    client = AsyncMock()
+    client.search_tweets.return_value = ["TAO is up", "Subnet 1 ships"]
+    return client
+
+
+@pytest.fixture
+def chutes_client():
+    client = AsyncMock()
+    client.get_sentiment_score.return_value = 42
+    return client
+
+
+@pytest.fixture
+def service(desearch_client, chutes_client, cache_client):
+    return SentimentService(desearch_client, chutes_client, cache_client)
+
+
+def test_fingerprint_ignores_order_case_links_and_duplicates():
+    assert fingerprint_tweets(["TAO  is up https://t.co/x", "Subnet 1 ships"]) == (
+        fingerprint_tweets(["subnet 1 ships", "tao is up", "Subnet 1 ships"])
+    )
+    assert fingerprint_tweets(["tao is up"]) != fingerprint_tweets(["tao is down"])
+
+
+@pytest.mark.asyncio
+async def test_repeated_sentiment_skips_external_calls(service, desearch_client, chutes_client):
+    assert await service.get_sentiment(1) == 42
+    assert await service.get_sentiment(1) == 42
+    desearch_client.search_tweets.assert_awaited_once_with("Bittensor netuid 1", count=10)
+    chutes_client.get_sentiment_score.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_tweets_are_cached_per_netuid(service, desearch_client, cache_client):
+    await service.get_sentiment(1)
+    await service.get_sentiment(2)
+    assert desearch_client.search_tweets.await_count == 2
+    assert cache_client.set.await_args_list[0].kwargs["ttl"] == service.tweets_ttl
+
+
+@pytest.mark.asyncio
+async def test_same_tweet_set_reuses_score(service, desearch_client, chutes_client, cache_client):
+    await service.get_sentiment(1)
+    desearch_client.search_tweets.return_value = ["subnet 1 ships", "TAO is up"]
+    assert await service.get_sentiment(2) == 42
+    chutes_client.get_sentiment_score.assert_awaited_once()
+    key = f"{SCORE_PREFIX}:{fingerprint_tweets(['TAO is up', 'Subnet 1 ships'])}"
+    assert cache_client.store[key] == 42
+
+
+@pytest.mark.asyncio
+async def test_zero_score_is_a_cache_hit(service, chutes_client):
+    chutes_client.get_sentiment_score.return_value = 0
+    assert await service.get_sentiment(1) == 0
+    assert await service.get_sentiment(1) == 0
+    chutes_client.get_sentiment_score.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_external_calls(service, desearch_client, chutes_client):
+    async def search(*args, **kwargs):
+        await asyncio.sleep(0.01)
+        return ["TAO is up"]
+
+    desearch_client.search_tweets.side_effect = search
+    scores = await asyncio.gather(*(service.get_sentiment(1) for _ in range(5)))
+    assert scores == [42] * 5
+    desearch_client.search_tweets.assert_awaited_once()
+    chutes_client.get_sentiment_score.assert_awaited_once()
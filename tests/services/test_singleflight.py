@@ -0,0 +1,90 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from app.services.singleflight import SINGLEFLIGHT_REQUESTS, RedisSingleFlight, SingleFlight
+
+
+def role_count(group: str, role: str) -> float:
+    return SINGLEFLIGHT_REQUESTS.labels(group=group, role=role)._value.get()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_call():
+    singleflight = SingleFlight("test_share")
+    calls = 0
+
+    async def fn():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    results = await asyncio.gather(*(singleflight.do("k", fn) for _ in range(10)))
+    assert results == [1] * 10
+    assert calls == 1
+    assert role_count("test_share", "leader") == 1
+    assert role_count("test_share", "follower") == 9
+
+
+@pytest.mark.asyncio
+async def test_sequential_calls_are_not_coalesced():
+    singleflight = SingleFlight("test_sequential")
+    fn = AsyncMock(return_value=1)
+    await singleflight.do("k", fn)
+    await singleflight.do("k", fn)
+    assert fn.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_exception_is_raised_to_all_callers():
+    singleflight = SingleFlight("test_error")
+
+    async def fn():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("chain down")
+
+    results = await asyncio.gather(
+        *(singleflight.do("k", fn) for _ in range(3)), return_exceptions=True
+    )
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert singleflight._calls == {}
+
+
+@pytest.mark.asyncio
+async def test_redis_singleflight_leader_runs_and_releases_lock():
+    redis = MagicMock()
+    redis.set = AsyncMock(return_value=True)
+    redis.eval = AsyncMock()
+    singleflight = RedisSingleFlight("test_redis_leader", redis)
+    result = await singleflight.do("k", AsyncMock(return_value=5))
+    assert result == 5
+    assert redis.set.await_args.kwargs["nx"] is True
+    redis.eval.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_redis_singleflight_waits_for_remote_leader():
+    redis = MagicMock()
+    redis.set = AsyncMock(return_value=None)
+    redis.eval = AsyncMock()
+    singleflight = RedisSingleFlight("test_redis_follower", redis, poll_interval=0.001)
+    fn = AsyncMock(return_value=1)
+    check = AsyncMock(side_effect=[None, None, 7])
+    result = await singleflight.do("k", fn, check=check)
+    assert result == 7
+    fn.assert_not_awaited()
+    redis.eval.assert_not_awaited()
+    assert role_count("test_redis_follower", "remote_follower") == 1
+
+
+@pytest.mark.asyncio
+async def test_redis_singleflight_rechecks_after_lock_handover():
+    redis = MagicMock()
+    redis.set = AsyncMock(side_effect=[None, True])
+    redis.eval = AsyncMock()
+    singleflight = RedisSingleFlight("test_redis_handover", redis, poll_interval=0.001)
+    fn = AsyncMock(return_value=1)
+    check = AsyncMock(side_effect=[None, 3])
+    assert await singleflight.do("k", fn, check=check) == 3
+    fn.assert_not_awaited()
+    redis.eval.assert_awaited_once()
@@ -0,0 +1,163 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from app.services.stake_batch import StakeBatcher, net_moves
+
+
+def decision(task_id, netuid, hotkey, amount):
+    return {"task_id": task_id, "netuid": netuid, "hotkey": hotkey, "stake_amount": amount}
+
+
+def queue(client, decisions):
+    """Make the claim find `decisions`, and every update match all of them."""
+
+    async def iter_find(collection, query):
+        for decision in decisions:
+            yield decision
+
+    client.iter_find = MagicMock(side_effect=iter_find)
+    client.update_many.return_value = len(decisions)
+
+
+@pytest.fixture
+def mongo_client():
+    client = AsyncMock()
+    queue(
+        client,
+        [
+            decision("t1", 1, "hk1", 1.0),
+            decision("t2", 1, "hk1", -0.4),
+            decision("t3", 2, "hk2", 0.5),
+            decision("t4", 2, "hk2", -0.5),
+        ],
+    )
+    return client
+
+
+def batch_updates(mongo_client):
+    """The update_many calls of a flush after recovering stale decisions."""
+    return mongo_client.update_many.await_args_list[2:]
+
+
+@pytest.fixture
+def bittensor_client():
+    client = AsyncMock()
+    client.submit_stake_batch.return_value = True
+    return client
+
+
+@pytest.fixture
+def batcher(mongo_client, bittensor_client):
+    redis = AsyncMock()
+    redis.set.side_effect = [True, None]
+    return StakeBatcher(mongo_client, bittensor_client, redis, MagicMock(), window=5)
+
+
+def test_net_moves_sums_per_pair_in_rao():
+    net = net_moves([decision("t1", 1, "hk", 1.0), decision("t2", 1, "hk", -0.25)])
+    assert net == {(1, "hk"): 750_000_000}
+
+
+def test_net_moves_cancel_to_exactly_zero():
+    # Summed as floats these leave a 4.44e-16 residue
+    amounts = [0.1 * score for score in (-10, -10, -9, 29)]
+    net = net_moves([decision(f"t{i}", 1, "hk", amount) for i, amount in enumerate(amounts)])
+    assert net == {(1, "hk"): 0}
+
+
+@pytest.mark.asyncio
+async def test_schedule_enqueues_one_flush_per_window(batcher):
+    await batcher.schedule()
+    await batcher.schedule()
+    batcher.enqueue_flush.assert_called_once_with(5)
+
+
+@pytest.mark.asyncio
+async def test_flush_submits_netted_moves(batcher, mongo_client, bittensor_client):
+    batch_id = await batcher.flush("wallet")
+    assert batch_id is not None
+    bittensor_client.submit_stake_batch.assert_awaited_once()
+    wallet, moves = bittensor_client.submit_stake_batch.await_args.args
+    assert wallet == "wallet"
+    assert moves == [(1, "hk1", 600_000_000)]
+    # The claim, the submission mark, then one attribution update per pair
+    claim, mark, *updates = batch_updates(mongo_client)
+    assert claim.args[1] == {"status": "queued", "batch_id": None}
+    assert claim.args[2]["batch_id"] == batch_id
+    assert mark.args[2]["status"] == "submitting"
+    assert [u.args[1] for u in updates] == [
+        {"batch_id": batch_id, "netuid": 1, "hotkey": "hk1"},
+        {"batch_id": batch_id, "netuid": 2, "hotkey": "hk2"},
+    ]
+    assert updates[0].args[2]["status"] == "success"
+    assert updates[0].args[2]["net_stake_amount"] == pytest.approx(0.6)
+    assert updates[1].args[2]["net_stake_amount"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_pairs_are_not_submitted(batcher, mongo_client, bittensor_client):
+    queue(
+        mongo_client,
+        [decision(f"t{i}", 1, "hk1", 0.1 * score) for i, score in enumerate((-10, -10, -9, 29))]
+        + [decision("t9", 2, "hk2", 0.5)],
+    )
+    await batcher.flush("wallet")
+    _, moves = bittensor_client.submit_stake_batch.await_args.args
+    assert moves == [(2, "hk2", 500_000_000)]
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_fails_every_decision(batcher, mongo_client, bittensor_client):
+    bittensor_client.submit_stake_batch.side_effect = Exception("extrinsic rejected")
+    await batcher.flush("wallet")
+    for update in batch_updates(mongo_client)[2:]:
+        assert update.args[2]["status"] == "failed"
+        assert update.args[2]["error"] == "extrinsic rejected"
+
+
+@pytest.mark.asyncio
+async def test_flush_without_queued_decisions_is_a_noop(batcher, mongo_client, bittensor_client):
+    mongo_client.update_many.return_value = 0
+    assert await batcher.flush("wallet") is None
+    mongo_client.iter_find.assert_not_called()
+    bittensor_client.submit_stake_batch.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_failed_read_queues_claimed_decisions_again(batcher, mongo_client, bittensor_client):
+    async def iter_find(collection, query):
+        raise ConnectionError("mongo down")
+        yield
+
+    mongo_client.iter_find = MagicMock(side_effect=iter_find)
+    with pytest.raises(ConnectionError):
+        await batcher.flush("wallet")
+    bittensor_client.submit_stake_batch.assert_not_awaited()
+    claim, requeue = batch_updates(mongo_client)
+    batch_id = claim.args[2]["batch_id"]
+    assert requeue.args[1] == {"batch_id": batch_id, "status": {"$in": ["batching", "submitting"]}}
+    assert requeue.args[2]["status"] == "queued"
+    assert requeue.args[2]["batch_id"] is None
+    # A flush is scheduled to retry them
+    batcher.enqueue_flush.assert_called_once_with(5)
+
+
+@pytest.mark.asyncio
+async def test_unmarked_decisions_are_not_submitted(batcher, mongo_client, bittensor_client):
+    mongo_client.update_many.side_effect = [0, 0, 4, 3, 4]
+    with pytest.raises(Exception, match="Marked 3 of 4"):
+        await batcher.flush("wallet")
+    bittensor_client.submit_stake_batch.assert_not_awaited()
+    assert batch_updates(mongo_client)[-1].args[2]["status"] == "queued"
+
+
+@pytest.mark.asyncio
+async def test_flush_recovers_stale_decisions(batcher, mongo_client):
+    mongo_client.update_many.return_value = 0
+    await batcher.flush("wallet")
+    requeue, fail = mongo_client.update_many.await_args_list[:2]
+    assert requeue.args[1]["status"] == "batching"
+    assert requeue.args[2]["status"] == "queued"
+    assert fail.args[1]["status"] == "submitting"
+    assert fail.args[2]["status"] == "failed"
+    for update in (requeue, fail):
+        assert "$lt" in update.args[1]["updated_at"]
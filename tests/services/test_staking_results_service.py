@@ -0,0 +1,112 @@
+import pytest
+from datetime import datetime
+from unittest.mock import MagicMock
+from bson import ObjectId
+from app.services.pagination import InvalidCursor, encode_cursor
+from app.services.staking_results import SORT, InvalidFields, StakingResults
+
+CREATED_AT = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def result(index: int) -> dict:
+    return {
+        "_id": ObjectId(f"{index:024x}"),
+        "task_id": f"task{index}",
+        "status": "success",
+        "netuid": 1,
+        "hotkey": "hk",
+        "created_at": CREATED_AT,
+    }
+
+
+@pytest.fixture
+def mongodb_client():
+    client = MagicMock()
+    client.docs = [result(i) for i in range(5, 0, -1)]
+
+    def iter_find(collection, query, projection=None, sort=None, limit=None, batch_size=None):
+        async def docs():
+            for doc in client.docs[:limit] if limit else client.docs:
+                yield dict(doc)
+
+        return docs()
+
+    client.iter_find = MagicMock(side_effect=iter_find)
+    return client
+
+
+@pytest.fixture
+def staking_results(mongodb_client):
+    return StakingResults(mongodb_client)
+
+
+def test_build_query_filters_fields_and_range():
+    start, end = datetime(2026, 1, 1), datetime(2026, 1, 2)
+    assert StakingResults.build_query(1, "hk", "failed", start, end) == {
+        "netuid": 1,
+        "hotkey": "hk",
+        "status": "failed",
+        "created_at": {"$gte": start, "$lt": end},
+    }
+    assert StakingResults.build_query() == {}
+
+
+def test_projection_keeps_cursor_keys_and_rejects_unknown_fields():
+    assert StakingResults.build_projection(["status"]) == {"status": 1, "created_at": 1}
+    assert StakingResults.build_projection(None) is None
+    with pytest.raises(InvalidFields):
+        StakingResults.build_projection(["status", "password"])
+
+
+@pytest.mark.asyncio
+async def test_list_returns_page_and_next_cursor(staking_results, mongodb_client):
+    results, next_cursor = await staking_results.list({"netuid": 1}, limit=2)
+    assert [r["task_id"] for r in results] == ["task5", "task4"]
+    assert "_id" not in results[0]
+    assert next_cursor is not None
+    kwargs = mongodb_client.iter_find.call_args.kwargs
+    assert kwargs["sort"] == SORT
+    assert kwargs["limit"] == 3
+
+
+@pytest.mark.asyncio
+async def test_last_page_has_no_cursor(staking_results):
+    results, next_cursor = await staking_results.list({}, limit=10)
+    assert len(results) == 5
+    assert next_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_cursor_resumes_after_last_result(staking_results, mongodb_client):
+    _, next_cursor = await staking_results.list({"netuid": 1}, limit=2)
+    await staking_results.list({"netuid": 1}, limit=2, cursor=next_cursor)
+    query = mongodb_client.iter_find.call_args.args[1]
+    netuid_filter, after = query["$and"]
+    assert netuid_filter == {"netuid": 1}
+    assert after["$or"][1] == {"created_at": CREATED_AT, "_id": {"$lt": result(4)["_id"]}}
+
+
+@pytest.mark.asyncio
+async def test_projection_drops_unrequested_sort_keys(staking_results):
+    results, _ = await staking_results.list({}, limit=1, fields=["status"])
+    assert "created_at" not in results[0]
+
+
+@pytest.mark.asyncio
+async def test_invalid_cursor_is_rejected(staking_results):
+    with pytest.raises(InvalidCursor):
+        await staking_results.list({}, cursor="not-a-cursor")
+    with pytest.raises(InvalidCursor):
+        await staking_results.list({}, cursor=encode_cursor({"created_at": None, "id": "x"}))
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_every_result(staking_results, mongodb_client):
+    results = [r async for r in staking_results.stream({}, fields=["task_id"])]
+    assert [r["task_id"] for r in results] == ["task5", "task4", "task3", "task2", "task1"]
+    assert mongodb_client.iter_find.call_args.kwargs["batch_size"] == 500
+
+
+def test_stream_validates_before_streaming(staking_results):
+    with pytest.raises(InvalidFields):
+        staking_results.stream({}, fields=["password"])
@@ -0,0 +1,102 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from app.services.triggers import STAKING_TRIGGERS, StakingTriggers
+
+
+class FakeRedis:
+    """Just enough of SET NX PX / PTTL / DEL for the trigger keys."""
+
+    def __init__(self):
+        self.keys = {}
+
+    async def set(self, key, value, nx=False, px=None):
+        if nx and key in self.keys:
+            return None
+        self.keys[key] = px
+        return True
+
+    async def pttl(self, key):
+        return self.keys.get(key, -2)
+
+    async def delete(self, key):
+        self.keys.pop(key, None)
+
+
+@pytest.fixture
+def enqueue():
+    return MagicMock()
+
+
+def triggers(enqueue, redis=None, **kwargs) -> StakingTriggers:
+    return StakingTriggers(redis or FakeRedis(), enqueue, window=60, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_repeated_triggers_are_suppressed_in_window(enqueue):
+    gate = triggers(enqueue, mode="suppress")
+    assert await gate.trigger(1, "hotkey") == "accepted"
+    assert await gate.trigger(1, "hotkey") == "suppressed"
+    assert await gate.trigger(1, "hotkey") == "suppressed"
+    enqueue.assert_called_once_with(1, "hotkey", None)
+
+
+@pytest.mark.asyncio
+async def test_windows_are_per_netuid_and_hotkey(enqueue):
+    gate = triggers(enqueue)
+    assert await gate.trigger(1, "hotkey") == "accepted"
+    assert await gate.trigger(2, "hotkey") == "accepted"
+    assert await gate.trigger(1, "other") == "accepted"
+    assert enqueue.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_coalesced_triggers_share_one_trailing_task(enqueue):
+    gate = triggers(enqueue, mode="coalesce")
+    assert await gate.trigger(1, "hotkey") == "accepted"
+    assert await gate.trigger(1, "hotkey") == "merged"
+    assert await gate.trigger(1, "hotkey") == "merged"
+    assert enqueue.call_count == 2
+    # The trailing task runs when the window closes
+    assert enqueue.call_args.args == (1, "hotkey", 60)
+
+
+@pytest.mark.asyncio
+async def test_failed_enqueue_does_not_open_window(enqueue):
+    gate = triggers(enqueue)
+    enqueue.side_effect = [ConnectionError("broker down"), None]
+    assert await gate.trigger(1, "hotkey") is None
+    assert await gate.trigger(1, "hotkey") == "accepted"
+
+
+@pytest.mark.asyncio
+async def test_redis_errors_accept_every_trigger(enqueue):
+    redis = AsyncMock()
+    redis.set.side_effect = ConnectionError("redis down")
+    gate = triggers(enqueue, redis=redis)
+    assert await gate.trigger(1, "hotkey") == "accepted"
+    assert await gate.trigger(1, "hotkey") == "accepted"
+    assert enqueue.call_count == 2
+
+
+def accepted_count() -> float:
+    return STAKING_TRIGGERS.labels(outcome="accepted")._value.get()
+
+
+@pytest.mark.asyncio
+async def test_zero_window_disables_debouncing(enqueue):
+    gate = StakingTriggers(FakeRedis(), enqueue, window=0)
+    accepted = accepted_count()
+    assert await gate.trigger(1, "hotkey") == "accepted"
+    assert await gate.trigger(1, "hotkey") == "accepted"
+    assert enqueue.call_count == 2
+    assert accepted_count() == accepted + 2
+
+
+@pytest.mark.asyncio
+async def test_unknown_remaining_window_delays_trailing_task_by_full_window(enqueue):
+    redis = FakeRedis()
+    redis.pttl = AsyncMock(side_effect=ConnectionError("redis down"))
+    gate = triggers(enqueue, redis=redis, mode="coalesce")
+    assert await gate.trigger(1, "hotkey") == "accepted"
+    assert await gate.trigger(1, "hotkey") == "merged"
+    assert enqueue.call_args.args == (1, "hotkey", 60)